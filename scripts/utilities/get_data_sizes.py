@@ -3,65 +3,26 @@
 Ermittelt die tatsächlichen Datengrößen für die korrekten theoretischen Maxima
 """
 
-import pandas as pd
-import xml.etree.ElementTree as ET
-import os
+import sys
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from src.utils.profiler import profile_datasets, print_profile
+
 def get_actual_data_sizes():
     """Ermittelt die tatsächlichen Datengrößen"""
     
     print("🔍 ERMITTLUNG DER TATSÄCHLICHEN DATENGRÖSSEN")
     print("=" * 60)
     
-    # CSV-Daten (CMD)
-    try:
-        csv_data = pd.read_csv('data/input/cmd_daten.csv', sep=';', low_memory=False)
-        csv_size = len(csv_data)
-        print(f"📊 CMD CSV-Daten: {csv_size:,} Einträge")
-    except Exception as e:
-        print(f"❌ Fehler beim CSV-Einlesen: {e}")
-        csv_size = 0
-    
-    # TecDoc-Daten
-    try:
-        tecdoc_data = pd.read_csv('data/input/200_Article_Table.csv')
-        tecdoc_size = len(tecdoc_data)
-        print(f"📊 TecDoc-Daten: {tecdoc_size:,} Einträge")
-    except Exception as e:
-        print(f"❌ Fehler beim TecDoc-Einlesen: {e}")
-        tecdoc_size = 0
-    
-    # XML-Daten (CMD Platform)
-    xml_total = 0
-    xml_files = 0
-    xml_dir = Path('data/input/cmd_platform_data')
-    
-    if xml_dir.exists():
-        for xml_file in xml_dir.glob('*.xml'):
-            try:
-                tree = ET.parse(xml_file)
-                root = tree.getroot()
-                
-                # Zähle Artikel-Elemente (nicht alle XML-Elemente)
-                articles = 0
-                
-                # Verschiedene mögliche Artikel-Strukturen
-                for tag in ['Article', 'article', 'Product', 'product', 'Item', 'item']:
-                    articles += len(root.findall(f'.//{tag}'))
-                
-                if articles == 0:
-                    # Fallback: Zähle direkte Kinder des Root-Elements
-                    articles = len(list(root))
-                
-                xml_total += articles
-                xml_files += 1
-                print(f"📊 {xml_file.name}: {articles:,} Artikel")
-                
-            except Exception as e:
-                print(f"❌ Fehler bei {xml_file.name}: {e}")
+    # Streaming-Profil: Newline-Scan für CSV, iterparse für XML
+    report = profile_datasets(column_stats='--spalten' in sys.argv)
+    print_profile(report)
     
-    print(f"📊 XML-Daten gesamt: {xml_total:,} Artikel aus {xml_files} Dateien")
+    # Größen je Quelle (Einzelwerte stehen bereits im Profil)
+    csv_size = sum(entry['rows'] for entry in report['cmd_csv'])
+    tecdoc_size = report['tecdoc']['rows'] if report['tecdoc'] else 0
+    xml_total = report['xml']['articles']
     
     # Theoretische Maxima berechnen
     print("\n" + "=" * 60)
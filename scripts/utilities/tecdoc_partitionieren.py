@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+TecDoc-Partitionierung: Schreibt 200_Article_Table.csv einmalig als eine Datei je Marke (brandno)
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from src.utils.partitions import write_brand_partitions
+
+def partition_tecdoc():
+    """Erzeugt die Markenpartitionen für markenbezogene Matching-Läufe"""
+
+    print("🗂️ TECDOC-MARKENPARTITIONEN")
+    print("=" * 60)
+
+    manifest = write_brand_partitions()
+
+    # Größte Partitionen anzeigen
+    largest = sorted(manifest['partitions'].items(), key=lambda item: -item[1]['rows'])[:10]
+    print(f"\n📊 {manifest['rows']:,} Zeilen in {len(manifest['partitions']):,} Marken")
+    for brand, entry in largest:
+        print(f"   🔹 Marke {brand or '(leer)'}: {entry['rows']:,} Zeilen")
+
+    print("\n💡 Verwendung: run_deterministic_matching(None, ..., brands=[...])")
+
+    return manifest
+
+if __name__ == "__main__":
+    partition_tecdoc()
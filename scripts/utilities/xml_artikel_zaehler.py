@@ -3,9 +3,12 @@
 XML-Artikel-Zähler: Ermittelt die exakte Anzahl der Artikel in XML-Dateien
 """
 
-import xml.etree.ElementTree as ET
-import glob
-import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+from src.utils.core import list_xml_files
+from src.utils import profiler
 
 def count_xml_articles():
     """Zählt alle Artikel in den XML-Dateien"""
@@ -13,35 +16,25 @@ def count_xml_articles():
     print("🔍 EXAKTE XML-ARTIKEL ZÄHLUNG")
     print("=" * 60)
     
-    xml_files = glob.glob('data/input/cmd_platform_data/*.xml')
+    xml_files = list_xml_files('data/input/cmd_platform_data')
     total_articles = 0
     
     for xml_file in xml_files:
+        filename = xml_file.name
         try:
-            tree = ET.parse(xml_file)
-            root = tree.getroot()
-            
-            filename = os.path.basename(xml_file)
-            
-            # CMD Platform XML-Struktur analysieren
-            # Das Root-Element ist ArticleMasterData, die direkten Kinder sind die Artikel
-            articles = list(root)
-            article_count = len(articles)
+            # CMD Platform XML-Struktur: Root ArticleMasterData, direkte Kinder = Artikel
+            # Streaming-Zählung per iterparse statt vollständigem Parsen
+            info = profiler.count_xml_articles(xml_file)
+            article_count = info['children']
             total_articles += article_count
             
             print(f"📄 {filename}:")
             print(f"   📦 Artikel: {article_count}")
             
             # Zeige Details des ersten Artikels
-            if articles:
-                first_article = articles[0]
-                # Versuche verschiedene ID-Attribute zu finden
-                article_id = (first_article.get('ArticleNumber') or 
-                             first_article.get('ID') or 
-                             first_article.get('articleNumber') or
-                             'N/A')
-                print(f"   🔹 Erstes Artikel-ID: {article_id}")
-                print(f"   🔹 Artikel-Tag: {first_article.tag.split('}')[-1] if '}' in first_article.tag else first_article.tag}")
+            if article_count:
+                print(f"   🔹 Erstes Artikel-ID: {info['first_article_id'] or 'N/A'}")
+                print(f"   🔹 Artikel-Tag: {info['article_tag']}")
             
             print()
             
@@ -5,11 +5,20 @@ Optimierte, modulare Implementierung aller exakten Matching-Methoden
 """
 
 from typing import List, Dict, Set, Tuple
+import numpy as np
 import pandas as pd
-from collections import defaultdict
 import time
 
-from ..utils.core import clean_str, get_numeric_values, normalize_values, Config
+from ..utils.aho_corasick import first_containing
+from ..utils.arena import StringArena
+from ..utils.core import load_tecdoc_data, Config
+from ..utils.encoding import intersect_ids
+from ..utils.hashing import HashedSet
+from ..utils.lcp import common_prefix_counts
+from ..utils.packing import PackedSet
+from ..utils.normalization import normalize_series
+from ..utils.partitions import select_brands
+from .normalized import NormalizedColumn, as_normalized, prepare_targets
 
 # =============================================================================
 # DETERMINISTISCHE MATCHING-METHODEN
@@ -18,7 +27,33 @@ from ..utils.core import clean_str, get_numeric_values, normalize_values, Config
 class DeterministicMatcher:
     """Zentrale Klasse für deterministische Matching-Algorithmen"""
     
-    def __init__(self):
+    def __init__(self, key_encoding: str = None, distinct_values: bool = None,
+                 length_profile: bool = None, backend: str = None, fused: bool = None):
+        if key_encoding is None:
+            key_encoding = Config.KEY_ENCODING
+        if backend is None:
+            backend = Config.DETERMINISTIC_BACKEND
+        if backend not in ('python', 'numpy'):
+            raise ValueError(f"Unbekanntes Backend: {backend}")
+        # 'numpy': Exakt, Numerisch und Längen über Hash-, int64- und Längen-Arrays
+        self.backend = backend
+        if distinct_values is None:
+            distinct_values = Config.DISTINCT_VALUES
+        if length_profile is None:
+            length_profile = Config.PREFIX_SUFFIX_PROFILE
+        if fused is None:
+            fused = Config.FUSED_KEYS
+        # Schlüssel aller Methoden gemeinsam aus einem Durchlauf je Spalte (derive_keys);
+        # das NumPy-Backend nutzt eigene Array-Varianten statt der String-Mengen
+        self.fused = fused and backend == 'python'
+        # Präfix-/Suffix-Matches zusätzlich für alle Längen (Prefix_L/Suffix_L)
+        self.length_profile = length_profile
+        # Schleifenmethoden je eindeutigem Wert, Treffer mit der Anzahl gewichtet
+        self.distinct_values = distinct_values
+        if key_encoding not in ('strings', 'dictionary', 'packed', 'matrix'):
+            raise ValueError(f"Unbekannte Schlüsselkodierung: {key_encoding}")
+        self.key_encoding = key_encoding
+        
         self.methods = {
             'Exakt': self.exact_match,
             'Substring': self.substring_match,
@@ -28,38 +63,86 @@ class DeterministicMatcher:
             'Längenbasiert': self.length_based_match
         }
     
+    def _set_keys(self, column: NormalizedColumn, variant: str, *args):
+        """Mengen-Variante in der Darstellung von backend bzw. key_encoding"""
+        if self.backend == 'numpy' and variant in ('clean_set', 'normalized_set'):
+            # Sortierte uint64-Hashes, gleiche Hashes werden byteweise geprüft
+            return column.hashed(variant)
+        if self.backend == 'numpy' and variant == 'numeric_set':
+            return column.numeric_array
+        if self.key_encoding == 'packed':
+            # uint64-Codes, seltene nicht packbare Werte als Menge
+            return column.packed(variant, *args)
+        if self.key_encoding == 'matrix' and variant in ('prefixes', 'suffixes'):
+            # Präfixe/Suffixe als ganze Spalten der Zeichenmatrix
+            return column.affix_keys(variant, *args)
+        if self.key_encoding == 'dictionary':
+            # Sortierte int32-IDs aus dem Wörterbuch der Spalte statt String-Mengen
+            return column.encoded(variant, *args)
+        values = getattr(column, variant)
+        return values(*args) if args else values
+    
+    def _common_values(self, tecdoc: NormalizedColumn, target: NormalizedColumn,
+                       variant: str, *args) -> Tuple[int, List]:
+        """Gemeinsame Werte einer Mengen-Variante (Anzahl, bis zu fünf Beispiele)"""
+        target_keys = self._set_keys(target, variant, *args)
+        if isinstance(target_keys, tuple):
+            # Dictionary-Encoding: TecDoc-Werte nur im Wörterbuch des Targets nachschlagen
+            dictionary, target_ids = target_keys
+            common = intersect_ids(tecdoc.lookup_ids(dictionary, variant, *args), target_ids)
+            return len(common), dictionary.decode(common[:5])
+        tecdoc_keys = self._set_keys(tecdoc, variant, *args)
+        
+        if isinstance(tecdoc_keys, HashedSet) != isinstance(target_keys, HashedSet):
+            # Hash-Kollision auf einer Seite: beide Seiten als String-Mengen
+            tecdoc_keys, target_keys = getattr(tecdoc, variant), getattr(target, variant)
+        if isinstance(tecdoc_keys, (PackedSet, HashedSet)):
+            return tecdoc_keys.intersect(target_keys)
+        common = tecdoc_keys & target_keys
+        return len(common), list(common)[:5]
+    
+    def prepare_target(self, column: NormalizedColumn):
+        """Alle Varianten einer Target-Spalte vorab bauen, die die Methoden abfragen"""
+        length = Config.PREFIX_SUFFIX_LENGTH
+        if self.fused:
+            column.derive_keys(length, Config.MIN_STRING_LENGTH)
+        for variant, *args in [('clean_set',), ('numeric_set',), ('normalized_set',),
+                               ('prefixes', length), ('suffixes', length)]:
+            self._set_keys(column, variant, *args)
+        column.weighted_min(Config.MIN_STRING_LENGTH, self.distinct_values)
+        column.prepare_lengths(histogram=self.backend == 'numpy')
+        if self.length_profile:
+            column.sorted_affixes('prefix')
+            column.sorted_affixes('suffix')
+    
     def exact_match(self, tecdoc_values: List, target_values: List) -> Tuple[int, List[str]]:
         """Exaktes String-Matching mit verschiedenen Normalisierungsstrategien"""
         matches = 0
         examples = []
         
         try:
+            tecdoc, target = as_normalized(tecdoc_values), as_normalized(target_values)
+            
             # Strategie 1: Direkte exakte Übereinstimmung
-            tecdoc_clean = set(clean_str(val) for val in tecdoc_values if clean_str(val))
-            target_clean = set(clean_str(val) for val in target_values if clean_str(val))
-            direct_matches = tecdoc_clean & target_clean
+            direct_count, direct_matches = self._common_values(tecdoc, target, 'clean_set')
             
-            if direct_matches:
-                matches += len(direct_matches)
-                examples.extend([f"Direkt: '{m}'" for m in list(direct_matches)[:2]])
+            if direct_count:
+                matches += direct_count
+                examples.extend([f"Direkt: '{m}'" for m in direct_matches[:2]])
             
             # Strategie 2: Numerische Normalisierung
-            tecdoc_numeric = get_numeric_values(tecdoc_values)
-            target_numeric = get_numeric_values(target_values)
-            numeric_matches = tecdoc_numeric & target_numeric
+            numeric_count, numeric_matches = self._common_values(tecdoc, target, 'numeric_set')
             
-            if numeric_matches:
-                matches += len(numeric_matches)
-                examples.extend([f"Numerisch: {m}" for m in list(numeric_matches)[:2]])
+            if numeric_count:
+                matches += numeric_count
+                examples.extend([f"Numerisch: {m}" for m in numeric_matches[:2]])
             
             # Strategie 3: Ohne Punkte/Bindestriche
-            tecdoc_normalized = normalize_values(tecdoc_values)
-            target_normalized = normalize_values(target_values)
-            normalized_matches = tecdoc_normalized & target_normalized
+            normalized_count, normalized_matches = self._common_values(tecdoc, target, 'normalized_set')
             
-            if normalized_matches:
-                matches += len(normalized_matches)
-                examples.extend([f"Normalisiert: '{m}'" for m in list(normalized_matches)[:2]])
+            if normalized_count:
+                matches += normalized_count
+                examples.extend([f"Normalisiert: '{m}'" for m in normalized_matches[:2]])
             
         except Exception as e:
             print(f"⚠️ Fehler bei exact_match: {e}")
@@ -73,17 +156,22 @@ class DeterministicMatcher:
         
         try:
             # Bereite Daten vor
-            tecdoc_clean = [clean_str(val) for val in tecdoc_values if clean_str(val) and len(clean_str(val)) >= Config.MIN_STRING_LENGTH]
-            target_clean = [clean_str(val) for val in target_values if clean_str(val) and len(clean_str(val)) >= Config.MIN_STRING_LENGTH]
+            tecdoc_clean, tecdoc_counts = as_normalized(tecdoc_values).weighted_min(
+                Config.MIN_STRING_LENGTH, self.distinct_values)
+            target_clean, _ = as_normalized(target_values).weighted_min(
+                Config.MIN_STRING_LENGTH, self.distinct_values)
             
-            # Finde Substring-Matches
-            for tec_val in tecdoc_clean:
-                for target_val in target_clean:
-                    if tec_val in target_val and tec_val != target_val:  # Substring, aber nicht identisch
-                        matches += 1
-                        if len(examples) < 5:
-                            examples.append(f"'{tec_val}' ↔ '{target_val}'")
-                        break  # Ein Match pro TecDoc-Wert
+            # Ein Aho-Corasick-Durchlauf je Target-Wert statt TecDoc × Target Vergleiche;
+            # je TecDoc-Wert das erste Target, das ihn echt enthält (nicht identisch)
+            first_target = first_containing(tecdoc_clean, target_clean)
+            
+            # Ein Match pro TecDoc-Wert
+            for tec_val, count in zip(tecdoc_clean, tecdoc_counts):
+                target_pos = first_target.get(tec_val)
+                if target_pos is not None:
+                    matches += count
+                    if len(examples) < 5:
+                        examples.append(f"'{tec_val}' ↔ '{target_clean[target_pos]}'")
             
         except Exception as e:
             print(f"⚠️ Fehler bei substring_match: {e}")
@@ -100,24 +188,10 @@ class DeterministicMatcher:
         examples = []
         
         try:
-            # Bereite Präfixe vor
-            tecdoc_prefixes = set()
-            target_prefixes = set()
-            
-            for val in tecdoc_values:
-                clean_val = clean_str(val)
-                if len(clean_val) >= length:
-                    tecdoc_prefixes.add(clean_val[:length])
-            
-            for val in target_values:
-                clean_val = clean_str(val)
-                if len(clean_val) >= length:
-                    target_prefixes.add(clean_val[:length])
-            
             # Finde gemeinsame Präfixe
-            common_prefixes = tecdoc_prefixes & target_prefixes
-            matches = len(common_prefixes)
-            examples = list(common_prefixes)[:5]
+            matches, examples = self._common_values(as_normalized(tecdoc_values),
+                                                    as_normalized(target_values),
+                                                    'prefixes', length)
             
         except Exception as e:
             print(f"⚠️ Fehler bei prefix_match: {e}")
@@ -134,42 +208,53 @@ class DeterministicMatcher:
         examples = []
         
         try:
-            # Bereite Suffixe vor
-            tecdoc_suffixes = set()
-            target_suffixes = set()
-            
-            for val in tecdoc_values:
-                clean_val = clean_str(val)
-                if len(clean_val) >= length:
-                    tecdoc_suffixes.add(clean_val[-length:])
-            
-            for val in target_values:
-                clean_val = clean_str(val)
-                if len(clean_val) >= length:
-                    target_suffixes.add(clean_val[-length:])
-            
             # Finde gemeinsame Suffixe
-            common_suffixes = tecdoc_suffixes & target_suffixes
-            matches = len(common_suffixes)
-            examples = list(common_suffixes)[:5]
+            matches, examples = self._common_values(as_normalized(tecdoc_values),
+                                                    as_normalized(target_values),
+                                                    'suffixes', length)
             
         except Exception as e:
             print(f"⚠️ Fehler bei suffix_match: {e}")
         
         return matches, examples
     
+    def affix_length_profile(self, tecdoc_values: List, target_values: List, kind: str = 'prefix',
+                             lengths: List[int] = None) -> Dict[int, Tuple[int, List[str]]]:
+        """
+        Präfix- bzw. Suffix-Matching für mehrere Längen in einem Durchlauf
+        
+        Sortierte eindeutige Werte (für Suffixe rückwärts gelesen) beider
+        Seiten werden zusammengeführt; aus den LCPs benachbarter Werte folgt
+        je Länge die Anzahl gemeinsamer Präfixe/Suffixe (wie prefix_match
+        bzw. suffix_match mit dieser Länge).
+        
+        Args:
+            kind: 'prefix' oder 'suffix'
+            lengths: Längen (None = MIN_STRING_LENGTH..PREFIX_SUFFIX_MAX_LENGTH)
+        
+        Returns:
+            Dict Länge → (Matches, Beispiele)
+        """
+        if lengths is None:
+            lengths = range(Config.MIN_STRING_LENGTH, Config.PREFIX_SUFFIX_MAX_LENGTH + 1)
+        
+        counts = common_prefix_counts(as_normalized(tecdoc_values).sorted_affixes(kind),
+                                      as_normalized(target_values).sorted_affixes(kind), lengths)
+        if kind == 'suffix':
+            counts = {length: (matches, [example[::-1] for example in examples])
+                      for length, (matches, examples) in counts.items()}
+        return counts
+    
     def numeric_exact_match(self, tecdoc_values: List, target_values: List) -> Tuple[int, List[str]]:
         """Exaktes numerisches Matching"""
         matches = 0
         examples = []
         
         try:
-            tecdoc_numeric = get_numeric_values(tecdoc_values)
-            target_numeric = get_numeric_values(target_values)
-            
-            common_numbers = tecdoc_numeric & target_numeric
-            matches = len(common_numbers)
-            examples = [str(num) for num in list(common_numbers)[:5]]
+            matches, common_numbers = self._common_values(as_normalized(tecdoc_values),
+                                                          as_normalized(target_values),
+                                                          'numeric_set')
+            examples = [str(num) for num in common_numbers]
             
         except Exception as e:
             print(f"⚠️ Fehler bei numeric_exact_match: {e}")
@@ -182,35 +267,51 @@ class DeterministicMatcher:
         examples = []
         
         try:
-            # Gruppiere nach Längen
-            tecdoc_lengths = defaultdict(list)
-            target_lengths = defaultdict(list)
-            
-            for val in tecdoc_values:
-                clean_val = clean_str(val)
-                if clean_val:
-                    tecdoc_lengths[len(clean_val)].append(clean_val)
-            
-            for val in target_values:
-                clean_val = clean_str(val)
-                if clean_val:
-                    target_lengths[len(clean_val)].append(clean_val)
-            
-            # Finde gemeinsame Längen
-            for length in tecdoc_lengths:
-                if length in target_lengths:
-                    matches += min(len(tecdoc_lengths[length]), len(target_lengths[length]))
-                    if len(examples) < 5:
-                        examples.append(str(length))
+            if self.backend == 'numpy':
+                matches, examples = self._length_histogram_match(as_normalized(tecdoc_values),
+                                                                 as_normalized(target_values))
+            else:
+                # Anzahl Werte je Länge
+                tecdoc_lengths = as_normalized(tecdoc_values).length_counts
+                target_lengths = as_normalized(target_values).length_counts
+                
+                # Finde gemeinsame Längen
+                for length in tecdoc_lengths:
+                    if length in target_lengths:
+                        matches += min(tecdoc_lengths[length], target_lengths[length])
+                        if len(examples) < 5:
+                            examples.append(str(length))
             
         except Exception as e:
             print(f"⚠️ Fehler bei length_based_match: {e}")
         
         return matches, examples
     
+    def _length_histogram_match(self, tecdoc: NormalizedColumn,
+                                target: NormalizedColumn) -> Tuple[int, List[str]]:
+        """length_based_match über bincount-Histogramme (gleiches Ergebnis und gleiche Beispiele)"""
+        tecdoc_counts, tecdoc_first = tecdoc.length_histogram
+        target_counts, _ = target.length_histogram
+        size = min(len(tecdoc_counts), len(target_counts))
+        common = np.minimum(tecdoc_counts[:size], target_counts[:size])
+        
+        # Beispiele in Reihenfolge des ersten Auftretens im TecDoc-Chunk
+        lengths = np.flatnonzero(common)
+        lengths = lengths[np.argsort(tecdoc_first[lengths], kind='stable')]
+        return int(common.sum()), [str(length) for length in lengths[:5].tolist()]
+    
     def run_all_methods(self, tecdoc_values: List, target_values: List) -> Dict[str, Tuple[int, List[str]]]:
-        """Führe alle deterministischen Methoden aus"""
+        """Führe alle deterministischen Methoden aus (Normalisierung einmal für alle Methoden)"""
         results = {}
+        tecdoc_values, target_values = as_normalized(tecdoc_values), as_normalized(target_values)
+        
+        if self.fused:
+            # Ein Zähl-Durchlauf je Seite statt eigener Schleifen je Methode
+            for column in (tecdoc_values, target_values):
+                try:
+                    column.derive_keys(Config.PREFIX_SUFFIX_LENGTH, Config.MIN_STRING_LENGTH)
+                except Exception as e:
+                    print(f"⚠️ Fehler bei derive_keys: {e}")
         
         for method_name, method_func in self.methods.items():
             try:
@@ -220,6 +321,16 @@ class DeterministicMatcher:
                 print(f"⚠️ Fehler bei {method_name}: {e}")
                 results[method_name] = (0, [])
         
+        if self.length_profile:
+            # Prefix_3, Prefix_4, ..., Suffix_3, ... aus je einem LCP-Durchlauf
+            for method_name, kind in (('Prefix', 'prefix'), ('Suffix', 'suffix')):
+                try:
+                    profile = self.affix_length_profile(tecdoc_values, target_values, kind)
+                    for length, (matches, examples) in profile.items():
+                        results[f'{method_name}_{length}'] = (matches, examples)
+                except Exception as e:
+                    print(f"⚠️ Fehler bei {method_name}-Längenprofil: {e}")
+        
         return results
 
 # =============================================================================
@@ -230,16 +341,25 @@ def run_deterministic_matching(tecdoc_data: pd.DataFrame,
                               target_data: pd.DataFrame,
                               target_columns: List[str],
                               tecdoc_columns: List[str] = None,
-                              sample_mode: bool = True) -> pd.DataFrame:
+                              sample_mode: bool = True,
+                              brands: List = None,
+                              pipeline: bool = None,
+                              scope: str = None) -> pd.DataFrame:
     """
     Führe deterministische Matching-Analyse durch
     
     Args:
-        tecdoc_data: TecDoc DataFrame
+        tecdoc_data: TecDoc DataFrame (None = über load_tecdoc_data laden)
         target_data: Target DataFrame (CMD CSV oder XML-Dict)
         target_columns: Zu matchende Spalten/Tags
         tecdoc_columns: TecDoc-Spalten (None = alle)
         sample_mode: Reduzierte Analyse
+        brands: Nur diese Marken (brandno) matchen; beim Laden werden nur
+            ihre Markenpartitionen gelesen (None = alle)
+        pipeline: Überlappende Pipeline aus Laden, Vorbereiten und Matchen
+            (None = Config.MATCH_PIPELINE)
+        scope: 'chunk' (Ergebnisse je Chunk) oder 'global' (ein Hash-Join über
+            alle Chunks mit eindeutigen Gesamttreffern, None = Config.MATCH_SCOPE)
     
     Returns:
         DataFrame mit Matching-Ergebnissen
@@ -252,7 +372,40 @@ def run_deterministic_matching(tecdoc_data: pd.DataFrame,
     
     # TecDoc-Spalten bestimmen
     if tecdoc_columns is None:
-        tecdoc_columns = ['artno', 'brandno', 'batchsize1', 'batchsize2']
+        tecdoc_columns = list(Config.TECDOC_COLUMNS)
+    
+    if pipeline is None:
+        pipeline = Config.MATCH_PIPELINE
+    if scope is None:
+        scope = Config.MATCH_SCOPE
+    if scope not in ('chunk', 'global'):
+        raise ValueError(f"Unbekannter Matching-Umfang: {scope}")
+    
+    if brands is not None and tecdoc_data is not None:
+        tecdoc_data = select_brands(tecdoc_data, brands)
+        print(f"🗂️ {len(tecdoc_data):,} TecDoc-Zeilen aus {len(brands)} Marken")
+    
+    if scope == 'global':
+        # Target-Index einmal bauen, alle Chunks als Probes (Mengen-Methoden)
+        from .global_join import run_global_matching
+        print("📊 XML-Daten erkannt" if isinstance(target_data, dict) else "📊 CSV-Daten erkannt")
+        return run_global_matching(target_data, target_columns, tecdoc_columns,
+                                   tecdoc_data, sample_mode,
+                                   max_chunks=Config.SAMPLE_CHUNKS if sample_mode else None,
+                                   brands=brands, label="Chunk")
+    
+    if pipeline:
+        # TecDoc-Chunks werden gelesen bzw. geteilt, während vorherige gematcht werden
+        from .pipeline import run_matching_pipeline
+        print("📊 XML-Daten erkannt" if isinstance(target_data, dict) else "📊 CSV-Daten erkannt")
+        return run_matching_pipeline(matcher, target_data, target_columns, tecdoc_columns,
+                                     tecdoc_data, sample_mode,
+                                     max_chunks=Config.SAMPLE_CHUNKS if sample_mode else None,
+                                     brands=brands, label="Chunk")
+    
+    if tecdoc_data is None:
+        tecdoc_data = load_tecdoc_data(sample_mode=sample_mode, columns=tecdoc_columns,
+                                       brands=brands)
     
     # XML-Daten behandeln
     if isinstance(target_data, dict):
@@ -272,6 +425,9 @@ def _run_csv_matching(tecdoc_data: pd.DataFrame, cmd_data: pd.DataFrame,
     results = []
     chunk_size = Config.CHUNK_SIZE
     
+    # Target-Spalten einmal vorbereiten, jeder Chunk fragt sie nur noch ab
+    targets = prepare_targets(matcher, cmd_data, cmd_columns)
+    
     # Processiere TecDoc chunkweise
     total_chunks = len(tecdoc_data) // chunk_size + 1
     if sample_mode:
@@ -288,16 +444,13 @@ def _run_csv_matching(tecdoc_data: pd.DataFrame, cmd_data: pd.DataFrame,
             if tecdoc_col not in tecdoc_chunk.columns:
                 continue
                 
-            tecdoc_values = tecdoc_chunk[tecdoc_col].dropna().tolist()
+            tecdoc_values = NormalizedColumn(StringArena.from_series(tecdoc_chunk[tecdoc_col]), tecdoc_col)
             if not tecdoc_values:
                 continue
             
             for cmd_col in cmd_columns:
-                if cmd_col not in cmd_data.columns:
-                    continue
-                    
-                cmd_values = cmd_data[cmd_col].dropna().tolist()
-                if not cmd_values:
+                cmd_values = targets.get(cmd_col)
+                if cmd_values is None:
                     continue
                 
                 # Alle Matching-Methoden ausführen
@@ -323,6 +476,9 @@ def _run_xml_matching(tecdoc_data: pd.DataFrame, xml_data: Dict,
     results = []
     chunk_size = Config.CHUNK_SIZE
     
+    # XML-Tags einmal vorbereiten, jeder Chunk fragt sie nur noch ab
+    targets = prepare_targets(matcher, xml_data, xml_tags)
+    
     # Processiere TecDoc chunkweise
     total_chunks = len(tecdoc_data) // chunk_size + 1
     if sample_mode:
@@ -339,13 +495,13 @@ def _run_xml_matching(tecdoc_data: pd.DataFrame, xml_data: Dict,
             if tecdoc_col not in tecdoc_chunk.columns:
                 continue
                 
-            tecdoc_values = tecdoc_chunk[tecdoc_col].dropna().tolist()
+            tecdoc_values = NormalizedColumn(StringArena.from_series(tecdoc_chunk[tecdoc_col]), tecdoc_col)
             if not tecdoc_values:
                 continue
             
             for xml_tag in xml_tags:
-                xml_values = xml_data.get(xml_tag, [])
-                if not xml_values:
+                xml_values = targets.get(xml_tag)
+                if xml_values is None:
                     continue
                 
                 # Alle Matching-Methoden ausführen
@@ -363,3 +519,68 @@ def _run_xml_matching(tecdoc_data: pd.DataFrame, xml_data: Dict,
                     })
     
     return pd.DataFrame(results)
+
+# =============================================================================
+# ARTIKEL-JOIN (XML-ARTIKELTABELLE)
+# =============================================================================
+
+def join_xml_articles(tecdoc_data: pd.DataFrame, records: pd.DataFrame,
+                      on: Dict[str, str] = None,
+                      block_on: Dict[str, str] = None,
+                      normalize: bool = False) -> pd.DataFrame:
+    """
+    Indizierter Join von TecDoc-Zeilen auf XML-Artikel (extract_xml_records)
+    
+    Statt TecDoc-Werte mit allen Werten eines Tags zu vergleichen, wird je
+    Schlüsselpaar ein Hash-Join gebildet. Optionale Blocking-Schlüssel
+    (z.B. Marke oder Kategorie) müssen zusätzlich übereinstimmen.
+    
+    Args:
+        tecdoc_data: TecDoc DataFrame
+        records: XML-Artikeltabelle
+        on: {TecDoc-Spalte: XML-Tag} (Default {'artno': 'SupplierPtNo'})
+        block_on: Zusätzliche Schlüssel {TecDoc-Spalte: XML-Tag}
+        normalize: Schlüssel ohne Punkte/Bindestriche/Leerzeichen vergleichen
+    
+    Returns:
+        DataFrame mit einer Zeile je Treffer (TecDoc-Zeile ↔ Artikel)
+    """
+    if on is None:
+        on = {'artno': 'SupplierPtNo'}
+    block_on = block_on or {}
+    profile = 'punct' if normalize else 'clean'
+    
+    def keys(series: pd.Series) -> pd.Series:
+        return normalize_series(series, profile)
+    
+    block_left = {f"_block_{i}": keys(tecdoc_data[col])
+                  for i, col in enumerate(block_on) if col in tecdoc_data.columns}
+    block_right = {f"_block_{i}": keys(records[tag])
+                   for i, tag in enumerate(block_on.values()) if tag in records.columns}
+    block_keys = sorted(set(block_left) & set(block_right))
+    
+    joined = []
+    for tecdoc_col, xml_tag in on.items():
+        if tecdoc_col not in tecdoc_data.columns or xml_tag not in records.columns:
+            continue
+        
+        left = pd.DataFrame({'TecDoc_Index': tecdoc_data.index, '_key': keys(tecdoc_data[tecdoc_col]),
+                             **{k: block_left[k] for k in block_keys}})
+        right = pd.DataFrame({'article_id': records['article_id'],
+                              'source_file': records['source_file'],
+                              '_key': keys(records[xml_tag]),
+                              **{k: block_right[k] for k in block_keys}})
+        left = left[left['_key'] != '']
+        right = right[right['_key'] != '']
+        
+        matches = left.merge(right, on=['_key'] + block_keys, how='inner')
+        matches.insert(1, 'TecDoc_Spalte', tecdoc_col)
+        matches.insert(2, 'XML_Tag', xml_tag)
+        joined.append(matches.rename(columns={'_key': 'Schluessel'}).drop(columns=block_keys))
+        print(f"🔗 {tecdoc_col} ↔ {xml_tag}: {len(matches):,} Artikel-Treffer")
+    
+    if not joined:
+        return pd.DataFrame(columns=['TecDoc_Index', 'TecDoc_Spalte', 'XML_Tag',
+                                     'Schluessel', 'article_id', 'source_file'])
+    
+    return pd.concat(joined, ignore_index=True)
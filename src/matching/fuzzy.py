@@ -15,7 +15,10 @@ except ImportError:
     JELLYFISH_AVAILABLE = False
     print("⚠️ Jellyfish nicht verfügbar. Jaro-Winkler wird übersprungen.")
 
-from ..utils.core import clean_str, get_numeric_values, Config
+from ..utils.arena import StringArena
+from ..utils.core import load_tecdoc_data, Config
+from ..utils.partitions import select_brands
+from .normalized import NormalizedColumn, as_normalized, prepare_targets
 
 # =============================================================================
 # FUZZY MATCHING-METHODEN
@@ -24,8 +27,12 @@ from ..utils.core import clean_str, get_numeric_values, Config
 class FuzzyMatcher:
     """Zentrale Klasse für Fuzzy/Probabilistische Matching-Algorithmen"""
     
-    def __init__(self, similarity_threshold: float = None):
+    def __init__(self, similarity_threshold: float = None, distinct_values: bool = None):
         self.threshold = similarity_threshold or Config.SIMILARITY_THRESHOLD
+        if distinct_values is None:
+            distinct_values = Config.DISTINCT_VALUES
+        # Vergleiche je eindeutigem Wert, Treffer mit der Anzahl gewichtet
+        self.distinct_values = distinct_values
         
         self.methods = {
             'Levenshtein': self.levenshtein_match,
@@ -38,6 +45,27 @@ class FuzzyMatcher:
         if JELLYFISH_AVAILABLE:
             self.methods['Jaro_Winkler'] = self.jaro_winkler_match
     
+    def prepare_target(self, column: NormalizedColumn):
+        """Alle Varianten einer Target-Spalte vorab bauen, die die Methoden abfragen"""
+        column.sorted_lengths(Config.MIN_STRING_LENGTH, self.distinct_values)
+        column.weighted_min(Config.FUZZY_SUBSTRING_MIN_LENGTH, self.distinct_values)
+        column.weighted_floats(self.distinct_values)
+        column.prepare_lengths()
+    
+    def _length_bounds(self, length: int) -> Tuple[int, int]:
+        """
+        Target-Längen, bei denen ratio() die Schwelle erreichen kann
+        
+        ratio() = 2·M / (len_a + len_b) mit M ≤ min(len_a, len_b); Targets
+        außerhalb der Grenzen können nie ≥ threshold sein.
+        """
+        if self.threshold <= 0:
+            return 0, np.iinfo(np.int64).max
+        if self.threshold >= 2:
+            return 1, 0
+        return (int(np.floor(length * self.threshold / (2 - self.threshold))),
+                int(np.ceil(length * (2 - self.threshold) / self.threshold)))
+    
     def levenshtein_match(self, tecdoc_values: List, target_values: List) -> Tuple[int, List[str]]:
         """Levenshtein-basiertes Fuzzy Matching"""
         matches = 0
@@ -45,24 +73,26 @@ class FuzzyMatcher:
         
         try:
             # Bereite Daten vor
-            tecdoc_clean = [clean_str(val) for val in tecdoc_values 
-                           if clean_str(val) and len(clean_str(val)) >= Config.MIN_STRING_LENGTH]
-            target_clean = [clean_str(val) for val in target_values 
-                           if clean_str(val) and len(clean_str(val)) >= Config.MIN_STRING_LENGTH]
+            tecdoc_clean, tecdoc_counts = as_normalized(tecdoc_values).weighted_min(
+                Config.MIN_STRING_LENGTH, self.distinct_values)
+            target = as_normalized(target_values)
             
             # Berechne Ähnlichkeiten
-            for tec_val in tecdoc_clean:
+            for tec_val, count in zip(tecdoc_clean, tecdoc_counts):
                 best_similarity = 0
                 best_match = None
                 
-                for target_val in target_clean:
+                # Nur Targets aus passenden Längen-Buckets (Reihenfolge bleibt erhalten)
+                low, high = self._length_bounds(len(tec_val))
+                for target_val in target.length_range(low, high, Config.MIN_STRING_LENGTH,
+                                                      self.distinct_values):
                     similarity = SequenceMatcher(None, tec_val, target_val).ratio()
                     if similarity > best_similarity and similarity >= self.threshold:
                         best_similarity = similarity
                         best_match = target_val
                 
                 if best_match:
-                    matches += 1
+                    matches += count
                     if len(examples) < 5:
                         examples.append(f"'{tec_val}' ↔ '{best_match}' ({best_similarity:.2f})")
             
@@ -81,13 +111,13 @@ class FuzzyMatcher:
         
         try:
             # Bereite Daten vor
-            tecdoc_clean = [clean_str(val) for val in tecdoc_values 
-                           if clean_str(val) and len(clean_str(val)) >= Config.MIN_STRING_LENGTH]
-            target_clean = [clean_str(val) for val in target_values 
-                           if clean_str(val) and len(clean_str(val)) >= Config.MIN_STRING_LENGTH]
+            tecdoc_clean, tecdoc_counts = as_normalized(tecdoc_values).weighted_min(
+                Config.MIN_STRING_LENGTH, self.distinct_values)
+            target_clean, _ = as_normalized(target_values).weighted_min(
+                Config.MIN_STRING_LENGTH, self.distinct_values)
             
             # Berechne Jaro-Winkler Ähnlichkeiten
-            for tec_val in tecdoc_clean:
+            for tec_val, count in zip(tecdoc_clean, tecdoc_counts):
                 best_similarity = 0
                 best_match = None
                 
@@ -98,7 +128,7 @@ class FuzzyMatcher:
                         best_match = target_val
                 
                 if best_match:
-                    matches += 1
+                    matches += count
                     if len(examples) < 5:
                         examples.append(f"'{tec_val}' ↔ '{best_match}' ({best_similarity:.2f})")
             
@@ -115,27 +145,11 @@ class FuzzyMatcher:
         
         try:
             # Extrahiere numerische Werte
-            tecdoc_numeric = []
-            target_numeric = []
-            
-            for val in tecdoc_values:
-                try:
-                    num_val = float(clean_str(val))
-                    if not np.isnan(num_val):
-                        tecdoc_numeric.append(num_val)
-                except:
-                    continue
-            
-            for val in target_values:
-                try:
-                    num_val = float(clean_str(val))
-                    if not np.isnan(num_val):
-                        target_numeric.append(num_val)
-                except:
-                    continue
+            tecdoc_numeric, tecdoc_counts = as_normalized(tecdoc_values).weighted_floats(self.distinct_values)
+            target_numeric, _ = as_normalized(target_values).weighted_floats(self.distinct_values)
             
             # Finde Matches mit Toleranz
-            for tec_num in tecdoc_numeric:
+            for tec_num, count in zip(tecdoc_numeric, tecdoc_counts):
                 for target_num in target_numeric:
                     if tec_num == 0 or target_num == 0:
                         continue
@@ -144,7 +158,7 @@ class FuzzyMatcher:
                     diff_percent = abs((tec_num - target_num) / tec_num) * 100
                     
                     if diff_percent <= tolerance_percent:
-                        matches += 1
+                        matches += count
                         if len(examples) < 5:
                             examples.append(f"{tec_num} ↔ {target_num} ({diff_percent:.1f}%)")
                         break  # Ein Match pro TecDoc-Wert
@@ -155,20 +169,22 @@ class FuzzyMatcher:
         return matches, examples
     
     def fuzzy_substring_match(self, tecdoc_values: List, target_values: List,
-                            min_length: int = 4) -> Tuple[int, List[str]]:
+                            min_length: int = None) -> Tuple[int, List[str]]:
         """Fuzzy Substring-Matching"""
+        if min_length is None:
+            min_length = Config.FUZZY_SUBSTRING_MIN_LENGTH
+        
         matches = 0
         examples = []
         
         try:
             # Bereite Daten vor
-            tecdoc_clean = [clean_str(val) for val in tecdoc_values 
-                           if clean_str(val) and len(clean_str(val)) >= min_length]
-            target_clean = [clean_str(val) for val in target_values 
-                           if clean_str(val) and len(clean_str(val)) >= min_length]
+            tecdoc_clean, tecdoc_counts = as_normalized(tecdoc_values).weighted_min(
+                min_length, self.distinct_values)
+            target_clean, _ = as_normalized(target_values).weighted_min(min_length, self.distinct_values)
             
             # Finde Fuzzy-Substrings
-            for tec_val in tecdoc_clean:
+            for tec_val, count in zip(tecdoc_clean, tecdoc_counts):
                 best_similarity = 0
                 best_match = None
                 
@@ -183,7 +199,7 @@ class FuzzyMatcher:
                                 best_match = f"{tec_val} in {target_val}"
                 
                 if best_match:
-                    matches += 1
+                    matches += count
                     if len(examples) < 5:
                         examples.append(f"{best_match} ({best_similarity:.2f})")
             
@@ -199,28 +215,16 @@ class FuzzyMatcher:
         examples = []
         
         try:
-            # Gruppiere nach ähnlichen Längen
-            from collections import defaultdict
-            
-            tecdoc_by_length = defaultdict(list)
-            target_by_length = defaultdict(list)
-            
-            for val in tecdoc_values:
-                clean_val = clean_str(val)
-                if clean_val:
-                    tecdoc_by_length[len(clean_val)].append(clean_val)
-            
-            for val in target_values:
-                clean_val = clean_str(val)
-                if clean_val:
-                    target_by_length[len(clean_val)].append(clean_val)
+            # Anzahl Werte je Länge
+            tecdoc_by_length = as_normalized(tecdoc_values).length_counts
+            target_by_length = as_normalized(target_values).length_counts
             
             # Finde Matches mit Längen-Toleranz
-            for tec_length, tec_vals in tecdoc_by_length.items():
+            for tec_length, tec_count in tecdoc_by_length.items():
                 for target_length in range(max(1, tec_length - max_diff), 
                                          tec_length + max_diff + 1):
                     if target_length in target_by_length:
-                        potential_matches = min(len(tec_vals), len(target_by_length[target_length]))
+                        potential_matches = min(tec_count, target_by_length[target_length])
                         matches += potential_matches
                         
                         if len(examples) < 5 and potential_matches > 0:
@@ -232,8 +236,9 @@ class FuzzyMatcher:
         return matches, examples
     
     def run_all_methods(self, tecdoc_values: List, target_values: List) -> Dict[str, Tuple[int, List[str]]]:
-        """Führe alle Fuzzy-Methoden aus"""
+        """Führe alle Fuzzy-Methoden aus (Normalisierung einmal für alle Methoden)"""
         results = {}
+        tecdoc_values, target_values = as_normalized(tecdoc_values), as_normalized(target_values)
         
         for method_name, method_func in self.methods.items():
             try:
@@ -254,17 +259,23 @@ def run_fuzzy_matching(tecdoc_data: pd.DataFrame,
                       target_columns: List[str],
                       tecdoc_columns: List[str] = None,
                       similarity_threshold: float = None,
-                      sample_mode: bool = True) -> pd.DataFrame:
+                      sample_mode: bool = True,
+                      brands: List = None,
+                      pipeline: bool = None) -> pd.DataFrame:
     """
     Führe Fuzzy-Matching-Analyse durch
     
     Args:
-        tecdoc_data: TecDoc DataFrame
+        tecdoc_data: TecDoc DataFrame (None = über load_tecdoc_data laden)
         target_data: Target DataFrame (CMD CSV oder XML-Dict)
         target_columns: Zu matchende Spalten/Tags
         tecdoc_columns: TecDoc-Spalten (None = alle)
         similarity_threshold: Ähnlichkeitsschwelle
         sample_mode: Reduzierte Analyse
+        brands: Nur diese Marken (brandno) matchen; beim Laden werden nur
+            ihre Markenpartitionen gelesen (None = alle)
+        pipeline: Überlappende Pipeline aus Laden, Vorbereiten und Matchen
+            (None = Config.MATCH_PIPELINE)
     
     Returns:
         DataFrame mit Fuzzy-Matching-Ergebnissen
@@ -279,6 +290,26 @@ def run_fuzzy_matching(tecdoc_data: pd.DataFrame,
     if tecdoc_columns is None:
         tecdoc_columns = ['artno', 'brandno']  # Reduziert für Fuzzy
     
+    if pipeline is None:
+        pipeline = Config.MATCH_PIPELINE
+    
+    if brands is not None and tecdoc_data is not None:
+        tecdoc_data = select_brands(tecdoc_data, brands)
+        print(f"🗂️ {len(tecdoc_data):,} TecDoc-Zeilen aus {len(brands)} Marken")
+    
+    if pipeline:
+        # TecDoc-Chunks werden gelesen bzw. geteilt, während vorherige gematcht werden
+        from .pipeline import run_matching_pipeline
+        print("📊 XML-Daten erkannt" if isinstance(target_data, dict) else "📊 CSV-Daten erkannt")
+        return run_matching_pipeline(matcher, target_data, target_columns, tecdoc_columns,
+                                     tecdoc_data, sample_mode,
+                                     max_chunks=2 if sample_mode else None,
+                                     brands=brands, label="Fuzzy Chunk")
+    
+    if tecdoc_data is None:
+        tecdoc_data = load_tecdoc_data(sample_mode=sample_mode, columns=tecdoc_columns,
+                                       brands=brands)
+    
     # XML-Daten behandeln
     if isinstance(target_data, dict):
         print("📊 XML-Daten erkannt")
@@ -297,6 +328,9 @@ def _run_csv_fuzzy_matching(tecdoc_data: pd.DataFrame, cmd_data: pd.DataFrame,
     results = []
     chunk_size = Config.CHUNK_SIZE
     
+    # Target-Spalten einmal vorbereiten, jeder Chunk fragt sie nur noch ab
+    targets = prepare_targets(matcher, cmd_data, cmd_columns)
+    
     # Reduzierte Chunk-Anzahl für Fuzzy (rechenintensiv)
     max_chunks = 2 if sample_mode else len(tecdoc_data) // chunk_size + 1
     
@@ -311,16 +345,13 @@ def _run_csv_fuzzy_matching(tecdoc_data: pd.DataFrame, cmd_data: pd.DataFrame,
             if tecdoc_col not in tecdoc_chunk.columns:
                 continue
                 
-            tecdoc_values = tecdoc_chunk[tecdoc_col].dropna().tolist()
+            tecdoc_values = NormalizedColumn(StringArena.from_series(tecdoc_chunk[tecdoc_col]), tecdoc_col)
             if not tecdoc_values:
                 continue
             
             for cmd_col in cmd_columns:
-                if cmd_col not in cmd_data.columns:
-                    continue
-                    
-                cmd_values = cmd_data[cmd_col].dropna().tolist()
-                if not cmd_values:
+                cmd_values = targets.get(cmd_col)
+                if cmd_values is None:
                     continue
                 
                 # Alle Fuzzy-Methoden ausführen
@@ -346,6 +377,9 @@ def _run_xml_fuzzy_matching(tecdoc_data: pd.DataFrame, xml_data: Dict,
     results = []
     chunk_size = Config.CHUNK_SIZE
     
+    # XML-Tags einmal vorbereiten, jeder Chunk fragt sie nur noch ab
+    targets = prepare_targets(matcher, xml_data, xml_tags)
+    
     # Reduzierte Chunk-Anzahl für Fuzzy
     max_chunks = 2 if sample_mode else len(tecdoc_data) // chunk_size + 1
     
@@ -360,13 +394,13 @@ def _run_xml_fuzzy_matching(tecdoc_data: pd.DataFrame, xml_data: Dict,
             if tecdoc_col not in tecdoc_chunk.columns:
                 continue
                 
-            tecdoc_values = tecdoc_chunk[tecdoc_col].dropna().tolist()
+            tecdoc_values = NormalizedColumn(StringArena.from_series(tecdoc_chunk[tecdoc_col]), tecdoc_col)
             if not tecdoc_values:
                 continue
             
             for xml_tag in xml_tags:
-                xml_values = xml_data.get(xml_tag, [])
-                if not xml_values:
+                xml_values = targets.get(xml_tag)
+                if xml_values is None:
                     continue
                 
                 # Alle Fuzzy-Methoden ausführen
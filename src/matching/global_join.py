@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Globaler Hash-Join über alle TecDoc-Chunks
+Ein Hash-Index je Target-Spalte und Schlüsselvariante, die Chunks werden als Probes durchgeschickt
+"""
+
+from collections import Counter
+from typing import Dict, Hashable, Iterable, List, Set, Tuple, Union
+import numpy as np
+import pandas as pd
+
+from ..utils.arena import StringArena
+from ..utils.core import Config
+from .normalized import NormalizedColumn, target_values
+from .pipeline import tecdoc_chunk_source
+
+# =============================================================================
+# TARGET-INDEX
+# =============================================================================
+
+class TargetIndex:
+    """
+    Hash-Index Schlüssel → Position über den eindeutigen Schlüsseln einer Target-Variante
+
+    Je TecDoc-Spalte gehört dazu eine Treffer-Bitmap (ein bool je
+    Target-Schlüssel). Jeder Chunk setzt die Bits der Schlüssel, die er
+    trifft; die Anzahl gesetzter Bits ist damit die Zahl der global
+    gemeinsamen Schlüssel, ohne Doppelzählung über Chunks hinweg.
+    """
+
+    def __init__(self, keys: Iterable[Hashable]):
+        self.keys = list(keys)
+        self.positions = {key: position for position, key in enumerate(self.keys)}
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def bitmap(self) -> np.ndarray:
+        """Leere Treffer-Bitmap"""
+        return np.zeros(len(self.keys), dtype=bool)
+
+    def probe(self, keys: Set[Hashable], bitmap: np.ndarray):
+        """Bits aller Target-Schlüssel setzen, die in keys vorkommen"""
+        common = self.positions.keys() & keys
+        if common:
+            bitmap[[self.positions[key] for key in common]] = True
+
+# =============================================================================
+# GLOBALES MATCHING
+# =============================================================================
+
+def _method_variants() -> Dict[str, List[Tuple[str, tuple]]]:
+    """Schlüsselvarianten je Methode (wie in DeterministicMatcher)"""
+    length = Config.PREFIX_SUFFIX_LENGTH
+    return {
+        'Exakt': [('clean_set', ()), ('numeric_set', ()), ('normalized_set', ())],
+        'Prefix': [('prefixes', (length,))],
+        'Suffix': [('suffixes', (length,))],
+        'Numerisch_Exakt': [('numeric_set', ())],
+    }
+
+def _keys(column: NormalizedColumn, variant: str, args: tuple) -> Set[Hashable]:
+    keys = getattr(column, variant)
+    return keys(*args) if args else keys
+
+def run_global_matching(target_data: Union[pd.DataFrame, Dict], target_columns: List[str],
+                        tecdoc_columns: List[str], tecdoc_data: pd.DataFrame = None,
+                        sample_mode: bool = True, max_chunks: int = None,
+                        brands: List = None, label: str = "Chunk") -> pd.DataFrame:
+    """
+    Deterministisches Matching als globaler Hash-Join statt je Chunk
+
+    Die Target-Schlüssel (bereinigt, numerisch, normalisiert, Präfixe,
+    Suffixe) werden einmal indiziert; jeder TecDoc-Chunk wird nur noch
+    dagegen geprüft. Die Treffer-Bitmaps ergeben je Spaltenpaar die exakte
+    Anzahl eindeutiger gemeinsamer Werte über die ganze TecDoc-Tabelle
+    (wie run_all_methods auf einem einzigen Chunk). Substring und
+    Längenbasiert sind keine Mengenschnitte und entfallen hier; die
+    Indizes sind Python-Mengen, Config.KEY_ENCODING und
+    Config.DETERMINISTIC_BACKEND gelten hier nicht. Beides wird beim Start
+    gemeldet.
+
+    Args:
+        target_data: CMD CSV DataFrame oder XML-Dict {tag: werte}
+        target_columns: Zu matchende Spalten/Tags
+        tecdoc_columns: TecDoc-Spalten
+        tecdoc_data: TecDoc DataFrame (None = Datei streamen)
+        sample_mode: Reduzierte Analyse (nur beim Streamen relevant)
+        max_chunks: Höchstens N Chunks (None = alle)
+        brands: Markenfilter für das Laden (nur mit tecdoc_data=None)
+        label: Präfix der Fortschrittsausgabe
+
+    Returns:
+        DataFrame mit einer Zeile je TecDoc-Spalte, Target und Methode
+    """
+    target_label = 'XML_Tag' if isinstance(target_data, dict) else 'CMD_Spalte'
+    source = 'CMD' if target_label == 'CMD_Spalte' else 'XML'
+    methods = _method_variants()
+    print("⚠️ Globaler Join: Substring und Längenbasiert werden nicht berechnet "
+          "(nur mit MATCH_SCOPE='chunk')")
+    if Config.KEY_ENCODING != 'strings' or Config.DETERMINISTIC_BACKEND != 'python':
+        print(f"⚠️ Globaler Join nutzt eigene Hash-Indizes: KEY_ENCODING='{Config.KEY_ENCODING}' "
+              f"und DETERMINISTIC_BACKEND='{Config.DETERMINISTIC_BACKEND}' werden ignoriert")
+    variants = list(dict.fromkeys(variant for method in methods.values() for variant in method))
+
+    # Ein Index je Target-Spalte und Schlüsselvariante
+    targets = {name: NormalizedColumn(values, name).derive_keys()
+               for name, values in target_values(target_data, target_columns).items()}
+    indexes = {(name, variant, args): TargetIndex(_keys(column, variant, args))
+               for name, column in targets.items() for variant, args in variants}
+
+    bitmaps = {}
+    tecdoc_counts = Counter()
+    chunks, total_chunks = tecdoc_chunk_source(tecdoc_data, sample_mode, tecdoc_columns,
+                                               max_chunks, brands)
+    for chunk_num, chunk in enumerate(chunks, start=1):
+        print(f"🔄 {label} {chunk_num}/{total_chunks or '?'}: {len(chunk)} Zeilen")
+
+        for tecdoc_col in tecdoc_columns:
+            if tecdoc_col not in chunk.columns:
+                continue
+            column = NormalizedColumn(StringArena.from_series(chunk[tecdoc_col]), tecdoc_col)
+            if not len(column):
+                continue
+            # Alle Probe-Schlüssel des Chunks aus einem Durchlauf
+            column.derive_keys()
+            tecdoc_counts[tecdoc_col] += len(column)
+
+            for (name, variant, args), index in indexes.items():
+                key = (tecdoc_col, name, variant, args)
+                if key not in bitmaps:
+                    bitmaps[key] = index.bitmap()
+                index.probe(_keys(column, variant, args), bitmaps[key])
+
+    results = []
+    for tecdoc_col in tecdoc_columns:
+        if tecdoc_col not in tecdoc_counts:
+            continue
+        for target_name in target_columns:
+            if target_name not in targets:
+                continue
+            for method_name, method_variants in methods.items():
+                matches = sum(int(bitmaps[(tecdoc_col, target_name, variant, args)].sum())
+                              for variant, args in method_variants)
+                results.append({
+                    'TecDoc_Spalte': tecdoc_col,
+                    target_label: target_name,
+                    'Methode': method_name,
+                    'Matches': matches,
+                    'TecDoc_Anzahl': tecdoc_counts[tecdoc_col],
+                    f'{source}_Anzahl': len(targets[target_name])
+                })
+
+    return pd.DataFrame(results)
@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Normalisierte Spalten für das Matching
+Jede Variante (bereinigt, numerisch, ohne Satzzeichen, ...) wird je Spalte einmal berechnet und von allen Methoden geteilt
+"""
+
+from collections import Counter
+from typing import Dict, Hashable, List, Set, Tuple, Union
+import numpy as np
+import pandas as pd
+
+from ..utils.arena import StringArena
+from ..utils.char_matrix import CharMatrix
+from ..utils.core import Config
+from ..utils.encoding import ValueDictionary
+from ..utils.hashing import HashCollision, HashedSet
+from ..utils.packing import MAX_PACKED_LENGTH, PackedSet, prefix_codes, suffix_codes, unpack_integers
+from ..utils.normalization import (clean_series, get_profile, normalized_arena, normalized_value_set,
+                                   numeric_value_array, numeric_value_set)
+
+# =============================================================================
+# NORMALISIERTE SPALTE
+# =============================================================================
+
+class NormalizedColumn:
+    """
+    Werte einer Spalte mit verzögert berechneten, gemerkten Varianten
+
+    Die Varianten entsprechen exakt dem, was die Matching-Methoden bisher
+    je Aufruf selbst berechnet haben (clean_str, normalize_values,
+    get_numeric_values), werden aber nur einmal je Spalte erzeugt.
+    """
+
+    def __init__(self, values: Union[List, StringArena], name: str = None):
+        self.values = values
+        self.name = name
+        self._variants = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def prepare(self) -> 'NormalizedColumn':
+        """Basisvariante (clean) vorab berechnen, z.B. im Vorbereitungs-Thread"""
+        self._ensure_clean()
+        return self
+
+    def prepare_lengths(self, histogram: bool = False) -> 'NormalizedColumn':
+        """Längenverteilung vorab berechnen (histogram=True: length_histogram für das NumPy-Backend)"""
+        if histogram:
+            self._ensure_length_histogram()
+        else:
+            self._ensure_length_counts()
+        return self
+
+    def _variant(self, key: Hashable, compute):
+        if key not in self._variants:
+            self._variants[key] = compute()
+        return self._variants[key]
+
+    def _ensure_clean(self) -> List[str]:
+        return self._variant('clean', lambda: clean_series(self.values).tolist())
+
+    @property
+    def clean(self) -> List[str]:
+        """clean_str je Wert (gleiche Reihenfolge, '' für leere Werte)"""
+        return self._ensure_clean()
+
+    def clean_min(self, min_length: int = None) -> List[str]:
+        """Bereinigte, nicht leere Werte ab min_length Zeichen (Reihenfolge und Duplikate bleiben)"""
+        if min_length is None:
+            min_length = Config.MIN_STRING_LENGTH
+        return self._variant(('clean_min', min_length),
+                             lambda: [val for val in self.clean if val and len(val) >= min_length])
+
+    def weighted_min(self, min_length: int = None,
+                     distinct: bool = True) -> Tuple[List[str], List[int]]:
+        """
+        Bereinigte Werte ab min_length Zeichen mit ihrer Vielfachheit
+
+        distinct=True: eindeutige Werte (Reihenfolge des ersten Auftretens)
+        mit ihrer Anzahl, sonst alle Werte mit Anzahl 1 (wie clean_min).
+        """
+        if min_length is None:
+            min_length = Config.MIN_STRING_LENGTH
+        if not distinct:
+            values = self.clean_min(min_length)
+            return values, [1] * len(values)
+        return self._variant(('weighted_min', min_length),
+                             lambda: _weighted(self.clean_min(min_length)))
+
+    def derive_keys(self, prefix_length: int = None, min_length: int = None) -> 'NormalizedColumn':
+        """
+        Schlüssel aller deterministischen Methoden aus einem Durchlauf über clean
+
+        clean wird einmal zu eindeutigen Werten mit Anzahl gezählt; Mengen,
+        Zahlen, Präfixe/Suffixe, Längen und weighted_min entstehen danach nur
+        aus den eindeutigen Werten. normalized_set folgt ebenfalls aus clean,
+        solange die Profile 'clean' und 'punct' nur Zeichen entfernen (dann
+        ist 'punct' gleich clean_str ohne remove_chars). Bereits berechnete
+        Varianten bleiben unverändert.
+        """
+        if prefix_length is None:
+            prefix_length = Config.PREFIX_SUFFIX_LENGTH
+        if min_length is None:
+            min_length = Config.MIN_STRING_LENGTH
+        if ('derive_keys', prefix_length, min_length) in self._variants:
+            return self
+        self._variants[('derive_keys', prefix_length, min_length)] = True
+
+        counts = Counter(self.clean)
+        counts.pop('', None)
+        distinct = list(counts)
+
+        lengths = {}
+        numbers = set()
+        for val, count in counts.items():
+            lengths[len(val)] = lengths.get(len(val), 0) + count
+            if val.isdigit():
+                try:
+                    numbers.add(int(val))
+                except ValueError:
+                    continue
+        long_enough = [val for val in distinct if len(val) >= min_length]
+
+        keys = {
+            'clean_set': set(distinct),
+            'numeric_set': numbers,
+            ('prefixes', prefix_length): {val[:prefix_length] for val in distinct if len(val) >= prefix_length},
+            ('suffixes', prefix_length): {val[-prefix_length:] for val in distinct if len(val) >= prefix_length},
+            'length_counts': lengths,
+            ('weighted_min', min_length): (long_enough, [counts[val] for val in long_enough]),
+        }
+
+        clean_profile, punct_profile = get_profile('clean'), get_profile('punct')
+        if not any(profile.get(option) for profile in (clean_profile, punct_profile)
+                   for option in ('nfkc', 'fold_umlauts')) and not clean_profile.get('remove_chars'):
+            remove_chars = punct_profile.get('remove_chars', '')
+            normalized = set()
+            for val in distinct:
+                for char in remove_chars:
+                    val = val.replace(char, '')
+                val = val.strip()
+                if len(val) >= Config.MIN_STRING_LENGTH:
+                    normalized.add(val)
+            keys['normalized_set'] = normalized
+
+        for key, value in keys.items():
+            self._variants.setdefault(key, value)
+        return self
+
+    @property
+    def clean_set(self) -> Set[str]:
+        """Eindeutige bereinigte, nicht leere Werte"""
+        return self._variant('clean_set', lambda: set(val for val in self.clean if val))
+
+    @property
+    def normalized_set(self) -> Set[str]:
+        """Wie normalize_values (ohne Punkte/Bindestriche/Leerzeichen)"""
+        return self._variant('normalized_set', lambda: normalized_value_set(self.values))
+
+    @property
+    def numeric_set(self) -> Set[int]:
+        """Wie get_numeric_values"""
+        return self._variant('numeric_set', lambda: numeric_value_set(self.values))
+
+    @property
+    def floats(self) -> List[float]:
+        """float(clean_str(wert)) für alle als Zahl lesbaren Werte (ohne NaN)"""
+        def compute():
+            numbers = []
+            for val in self.clean:
+                try:
+                    num_val = float(val)
+                except ValueError:
+                    continue
+                if not np.isnan(num_val):
+                    numbers.append(num_val)
+            return numbers
+        return self._variant('floats', compute)
+
+    def sorted_lengths(self, min_length: int = None,
+                       distinct: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+        """(Positionen in weighted_min nach Länge sortiert, zugehörige Längen) für Längen-Buckets"""
+        if min_length is None:
+            min_length = Config.MIN_STRING_LENGTH
+
+        def compute():
+            values, _ = self.weighted_min(min_length, distinct)
+            lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+            order = np.argsort(lengths, kind='stable')
+            return order, lengths[order]
+        return self._variant(('sorted_lengths', min_length, distinct), compute)
+
+    def length_range(self, low: int, high: int, min_length: int = None,
+                     distinct: bool = True) -> List[str]:
+        """Werte aus weighted_min mit low <= Länge <= high, in ursprünglicher Reihenfolge"""
+        if min_length is None:
+            min_length = Config.MIN_STRING_LENGTH
+
+        def compute():
+            values, _ = self.weighted_min(min_length, distinct)
+            order, lengths = self.sorted_lengths(min_length, distinct)
+            bucket = order[np.searchsorted(lengths, low, 'left'):np.searchsorted(lengths, high, 'right')]
+            return [values[pos] for pos in np.sort(bucket).tolist()]
+        return self._variant(('length_range', low, high, min_length, distinct), compute)
+
+    def weighted_floats(self, distinct: bool = True) -> Tuple[List[float], List[int]]:
+        """floats mit Vielfachheit (distinct wie bei weighted_min)"""
+        if not distinct:
+            return self.floats, [1] * len(self.floats)
+        return self._variant('weighted_floats', lambda: _weighted(self.floats))
+
+    def prefixes(self, length: int) -> Set[str]:
+        """Präfixe der Länge length aller ausreichend langen bereinigten Werte"""
+        return self._variant(('prefixes', length),
+                             lambda: set(val[:length] for val in self.clean if len(val) >= length))
+
+    def suffixes(self, length: int) -> Set[str]:
+        """Suffixe der Länge length aller ausreichend langen bereinigten Werte"""
+        return self._variant(('suffixes', length),
+                             lambda: set(val[-length:] for val in self.clean if len(val) >= length))
+
+    def sorted_affixes(self, kind: str) -> List[str]:
+        """Eindeutige bereinigte Werte sortiert, für kind='suffix' rückwärts gelesen (LCP-Profile)"""
+        def compute():
+            if kind == 'prefix':
+                return sorted(self.clean_set)
+            return sorted(val[::-1] for val in self.clean_set)
+        return self._variant(('sorted_affixes', kind), compute)
+
+    def encoded(self, variant: str, *args) -> Tuple[ValueDictionary, np.ndarray]:
+        """Eigenes Wörterbuch und sortierte IDs einer Mengen-Variante, z.B. encoded('prefixes', 5)"""
+        def compute():
+            values = getattr(self, variant)
+            values = values(*args) if args else values
+            # Die String-Menge wird nur für die IDs gebraucht (Werte liegen im Wörterbuch)
+            self._variants.pop((variant,) + args if args else variant, None)
+            dictionary = ValueDictionary()
+            return dictionary, dictionary.encode_set(values)
+        return self._variant(('encoded', variant) + args, compute)
+
+    def lookup_ids(self, dictionary: ValueDictionary, variant: str, *args) -> np.ndarray:
+        """Sortierte IDs der Werte einer Mengen-Variante, die das Wörterbuch einer anderen Spalte kennt"""
+        values = getattr(self, variant)
+        return dictionary.lookup_set(values(*args) if args else values)
+
+    @property
+    def char_matrix(self) -> CharMatrix:
+        """Bereinigte Werte als Zeichenmatrix mit Längenvektor"""
+        return self._variant('char_matrix', lambda: CharMatrix(self.clean))
+
+    def affix_keys(self, variant: str, length: int) -> PackedSet:
+        """Präfixe ('prefixes') bzw. Suffixe ('suffixes') als Byte-Schlüssel aus der Zeichenmatrix"""
+        kind = 'prefix' if variant == 'prefixes' else 'suffix'
+        return self._variant(('affix_keys', variant, length),
+                             lambda: self.char_matrix.affix_keys(kind, length))
+
+    def packed(self, variant: str, *args) -> PackedSet:
+        """Mengen-Variante als PackedSet (uint64-Codes plus Restmenge), z.B. packed('prefixes', 5)"""
+        def compute():
+            if variant == 'numeric_set':
+                return PackedSet.from_integers(self.numeric_set)
+            if variant == 'normalized_set':
+                return PackedSet.from_strings(self.normalized_set)
+            if variant == 'clean_set':
+                packed = PackedSet.from_strings(self.clean)
+                packed.rest.discard('')
+                return packed
+            length, = args
+            if not 1 <= length <= MAX_PACKED_LENGTH:
+                return PackedSet.from_strings(getattr(self, variant)(length))
+            # Präfixe/Suffixe gepackter Werte per Ganzzahl-Division, Rest als Strings
+            base = self.packed('clean_set')
+            affix_codes = prefix_codes if variant == 'prefixes' else suffix_codes
+            cut = (lambda val: val[:length]) if variant == 'prefixes' else (lambda val: val[-length:])
+            return PackedSet.from_strings([cut(val) for val in base.rest if len(val) >= length],
+                                          extra_codes=affix_codes(base.codes, length))
+        return self._variant(('packed', variant) + args, compute)
+
+    def _ensure_length_counts(self) -> Dict[int, int]:
+        return self._variant('length_counts',
+                             lambda: dict(Counter(len(val) for val in self.clean if val)))
+
+    @property
+    def length_counts(self) -> Dict[int, int]:
+        """Anzahl nicht leerer bereinigter Werte je Länge (Reihenfolge des ersten Auftretens)"""
+        return self._ensure_length_counts()
+
+    # -------------------------------------------------------------------------
+    # Array-Varianten (NumPy-Backend)
+    # -------------------------------------------------------------------------
+
+    def hashed(self, variant: str) -> Union[HashedSet, Set[str]]:
+        """clean_set bzw. normalized_set als HashedSet (bei einer Hash-Kollision die String-Menge)"""
+        def compute():
+            if variant == 'clean_set':
+                arena = normalized_arena(self.values, 'clean')
+            else:
+                arena = normalized_arena(self.values, 'punct', Config.MIN_STRING_LENGTH)
+            try:
+                return HashedSet.from_arena(arena)
+            except HashCollision:
+                return getattr(self, variant)
+        return self._variant(('hashed', variant), compute)
+
+    @property
+    def numeric_array(self) -> PackedSet:
+        """numeric_set als sortiertes int64-Array (Zahlen über int64 als Restmenge)"""
+        return self._variant('numeric_array',
+                             lambda: PackedSet(*numeric_value_array(self.values), decode=unpack_integers))
+
+    def _ensure_length_histogram(self) -> Tuple[np.ndarray, np.ndarray]:
+        def compute():
+            lengths = np.fromiter(map(len, self.clean), dtype=np.int64, count=len(self.clean))
+            positions = np.flatnonzero(lengths)
+            lengths = lengths[positions]
+            counts = np.bincount(lengths)
+            first = np.full(len(counts), len(self.clean), dtype=np.int64)
+            np.minimum.at(first, lengths, positions)
+            return counts, first
+        return self._variant('length_histogram', compute)
+
+    @property
+    def length_histogram(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(Anzahl nicht leerer bereinigter Werte je Länge, Position des ersten Werts je Länge)"""
+        return self._ensure_length_histogram()
+
+def _weighted(values: List) -> Tuple[List, List[int]]:
+    """Eindeutige Werte in Reihenfolge des ersten Auftretens und ihre Anzahl"""
+    counts = Counter(values)
+    return list(counts), list(counts.values())
+
+def as_normalized(values: Union[List, StringArena, NormalizedColumn]) -> NormalizedColumn:
+    """Liste oder StringArena in eine NormalizedColumn einpacken (bestehende werden durchgereicht)"""
+    if isinstance(values, NormalizedColumn):
+        return values
+    return NormalizedColumn(values)
+
+# =============================================================================
+# VORBEREITETE TARGETS
+# =============================================================================
+
+class PreparedTarget(NormalizedColumn):
+    """
+    Statische Target-Spalte eines Matching-Laufs
+
+    Alle Varianten, die ein Matcher abfragt (Mengen, numerische Werte,
+    Präfixe/Suffixe, Längen-Buckets, ...), werden einmal vorab über
+    matcher.prepare_target gebaut; jeder TecDoc-Chunk fragt sie danach nur ab.
+    """
+
+    def __init__(self, values: Union[List, StringArena], name: str = None, matcher=None):
+        super().__init__(values, name)
+        if matcher is not None and len(values):
+            matcher.prepare_target(self)
+
+def target_values(target_data: Union[pd.DataFrame, Dict],
+                  target_columns: List[str]) -> Dict[str, Union[List, StringArena]]:
+    """Werte je Target-Spalte (CMD, als StringArena) bzw. je XML-Tag, leere entfallen"""
+    if isinstance(target_data, dict):
+        values = {tag: target_data.get(tag, []) for tag in target_columns}
+    else:
+        values = {col: StringArena.from_series(target_data[col])
+                  for col in target_columns if col in target_data.columns}
+    return {name: column for name, column in values.items() if len(column)}
+
+def prepare_targets(matcher, target_data: Union[pd.DataFrame, Dict],
+                    target_columns: List[str]) -> Dict[str, PreparedTarget]:
+    """PreparedTarget je Target-Spalte bzw. XML-Tag (in Reihenfolge von target_columns)"""
+    return {name: PreparedTarget(values, name, matcher)
+            for name, values in target_values(target_data, target_columns).items()}
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Überlappende Matching-Pipeline
+Laden, Vorbereiten und Matchen der TecDoc-Chunks laufen gleichzeitig, verbunden über begrenzte Queues
+"""
+
+import multiprocessing
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
+import pandas as pd
+
+from ..utils.arena import StringArena
+from ..utils.core import Config, iter_tecdoc_chunks, load_tecdoc_data
+from .normalized import NormalizedColumn, PreparedTarget, target_values
+
+_DONE = object()
+
+# =============================================================================
+# CHUNK-QUELLEN
+# =============================================================================
+
+def _frame_chunks(tecdoc_data: pd.DataFrame, chunk_size: int,
+                  max_chunks: int = None) -> Tuple[Iterator[pd.DataFrame], int]:
+    """Chunks eines geladenen DataFrames (gleiche Aufteilung wie die iloc-Schleifen)"""
+    total_chunks = len(tecdoc_data) // chunk_size + 1
+    if max_chunks is not None:
+        total_chunks = min(total_chunks, max_chunks)
+
+    chunks = (tecdoc_data.iloc[i * chunk_size:min((i + 1) * chunk_size, len(tecdoc_data))]
+              for i in range(total_chunks))
+    return chunks, total_chunks
+
+def tecdoc_chunk_source(tecdoc_data: pd.DataFrame = None, sample_mode: bool = True,
+                        columns: List[str] = None, max_chunks: int = None,
+                        brands: List = None) -> Tuple[Iterator[pd.DataFrame], int]:
+    """
+    Chunk-Quelle für die Pipeline
+
+    Ein übergebener DataFrame wird in Chunks geteilt. Ohne DataFrame wird
+    die TecDoc-Datei gestreamt; Markenfilter und zufällige bzw. geschichtete
+    Stichproben benötigen dagegen das vorherige Laden über load_tecdoc_data.
+
+    Returns:
+        (Iterator über Chunks, Anzahl Chunks oder None falls unbekannt)
+    """
+    chunk_size = Config.CHUNK_SIZE
+
+    if tecdoc_data is None:
+        if brands is None and not (sample_mode and Config.SAMPLE_STRATEGY != 'head'):
+            chunks = iter_tecdoc_chunks(chunk_size, sample_mode, columns, max_chunks=max_chunks)
+            return chunks, None
+        tecdoc_data = load_tecdoc_data(sample_mode=sample_mode, columns=columns, brands=brands)
+
+    return _frame_chunks(tecdoc_data, chunk_size, max_chunks)
+
+# =============================================================================
+# STUFEN
+# =============================================================================
+
+def _put(out_queue: queue.Queue, item, stop: threading.Event):
+    """Blockierendes put, das bei einem Abbruch der Pipeline aufgibt"""
+    while not stop.is_set():
+        try:
+            out_queue.put(item, timeout=0.1)
+            return
+        except queue.Full:
+            continue
+
+def _stage(work, in_items, out_queue: queue.Queue, stop: threading.Event):
+    """Thread-Stufe: wendet work auf jedes Element an und reicht es weiter"""
+    try:
+        for item in in_items:
+            if stop.is_set():
+                break
+            _put(out_queue, work(item), stop)
+    except Exception as e:
+        _put(out_queue, e, stop)
+    finally:
+        _put(out_queue, _DONE, stop)
+
+def _drain(in_queue: queue.Queue, stop: threading.Event) -> Iterator:
+    """Elemente einer Queue bis zum Ende-Marker (Fehler werden weitergereicht)"""
+    while True:
+        try:
+            item = in_queue.get(timeout=0.1)
+        except queue.Empty:
+            if stop.is_set():
+                return
+            continue
+        if item is _DONE:
+            return
+        if isinstance(item, Exception):
+            raise item
+        yield item
+
+def _prepare_chunk(item: Tuple[int, pd.DataFrame], tecdoc_columns: List[str],
+                   shared: bool = False) -> Tuple[int, int, Dict[str, NormalizedColumn]]:
+    """
+    Werte je TecDoc-Spalte eines Chunks (ohne fehlende Werte) als StringArena
+
+    Mit shared=True liegen die Arenen in Shared Memory für die Prozess-Worker,
+    sonst wird die Basisvariante bereits hier normalisiert.
+    """
+    chunk_num, chunk = item
+    values = {}
+    for tecdoc_col in tecdoc_columns:
+        if tecdoc_col not in chunk.columns:
+            continue
+        tecdoc_values = StringArena.from_series(chunk[tecdoc_col])
+        if not len(tecdoc_values):
+            continue
+        if shared:
+            values[tecdoc_col] = NormalizedColumn(tecdoc_values.share(), tecdoc_col)
+        else:
+            # Basisvariante bereits hier, parallel zum Matchen des Vorgänger-Chunks
+            values[tecdoc_col] = NormalizedColumn(tecdoc_values, tecdoc_col).prepare()
+    return chunk_num, len(chunk), values
+
+def _share(values: Union[List, StringArena]) -> StringArena:
+    """Werte als StringArena in Shared Memory"""
+    arena = values if isinstance(values, StringArena) else StringArena.from_values(values)
+    return arena.share()
+
+def _unlink(columns: Iterable[NormalizedColumn]):
+    """Shared Memory geteilter Arenen freigeben"""
+    for column in columns:
+        if isinstance(column.values, StringArena):
+            column.values.unlink()
+
+def _match_chunk(matcher, chunk_num: int, chunk_values: Dict[str, NormalizedColumn],
+                 targets: List[Tuple[str, NormalizedColumn]], target_label: str) -> List[Dict]:
+    """Ergebniszeilen eines Chunks (Spalten wie in _run_csv_matching/_run_xml_matching)"""
+    source = 'CMD' if target_label == 'CMD_Spalte' else 'XML'
+    rows = []
+
+    for tecdoc_col, tecdoc_values in chunk_values.items():
+        for target_name, target_values in targets:
+            method_results = matcher.run_all_methods(tecdoc_values, target_values)
+
+            for method_name, (matches, examples) in method_results.items():
+                rows.append({
+                    'Chunk': chunk_num,
+                    'TecDoc_Spalte': tecdoc_col,
+                    target_label: target_name,
+                    'Methode': method_name,
+                    'Matches': matches,
+                    'TecDoc_Anzahl': len(tecdoc_values),
+                    f'{source}_Anzahl': len(target_values)
+                })
+
+    return rows
+
+# Prozess-Pool: Matcher und Target-Werte werden einmal je Worker übertragen
+_worker_state = {}
+
+def _init_worker(matcher, targets: List[Tuple[str, NormalizedColumn]], target_label: str):
+    # Target-Indizes einmal je Worker aus den geteilten Arenen bauen
+    for _, column in targets:
+        matcher.prepare_target(column)
+    _worker_state.update(matcher=matcher, targets=targets, target_label=target_label)
+
+def _match_chunk_worker(chunk_num: int, chunk_values: Dict[str, NormalizedColumn]) -> List[Dict]:
+    return _match_chunk(_worker_state['matcher'], chunk_num, chunk_values,
+                        _worker_state['targets'], _worker_state['target_label'])
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+def run_matching_pipeline(matcher, target_data: Union[pd.DataFrame, Dict],
+                          target_columns: List[str], tecdoc_columns: List[str],
+                          tecdoc_data: pd.DataFrame = None,
+                          sample_mode: bool = True,
+                          max_chunks: int = None,
+                          brands: List = None,
+                          queue_size: int = None,
+                          workers: int = None,
+                          label: str = "Chunk") -> pd.DataFrame:
+    """
+    Matching mit überlappendem Laden, Vorbereiten und Matchen
+
+    Ein Lese-Thread liefert TecDoc-Chunks, ein zweiter Thread bereitet die
+    Werte je Spalte vor, der Aufrufer (bzw. ein Prozess-Pool) matcht. Die
+    Queues zwischen den Stufen sind begrenzt, daher liegen höchstens
+    queue_size Chunks je Stufe im Speicher; ein langsamer Matcher bremst das
+    Lesen. Das Ergebnis entspricht _run_csv_matching bzw. _run_xml_matching
+    (gleiche Zeilen, gleiche Reihenfolge).
+
+    Args:
+        matcher: DeterministicMatcher oder FuzzyMatcher
+        target_data: CMD CSV DataFrame oder XML-Dict {tag: werte}
+        target_columns: Zu matchende Spalten/Tags
+        tecdoc_columns: TecDoc-Spalten
+        tecdoc_data: TecDoc DataFrame (None = Datei streamen)
+        sample_mode: Reduzierte Analyse (nur beim Streamen relevant)
+        max_chunks: Höchstens N Chunks matchen (None = alle)
+        brands: Markenfilter für das Laden (nur mit tecdoc_data=None)
+        queue_size: Kapazität je Queue (None = Config.PIPELINE_QUEUE_SIZE)
+        workers: Match-Prozesse (None = Config.MATCH_WORKERS, 1 = im Aufrufer)
+        label: Präfix der Fortschrittsausgabe
+
+    Returns:
+        DataFrame mit Matching-Ergebnissen
+    """
+    if queue_size is None:
+        queue_size = Config.PIPELINE_QUEUE_SIZE
+    if workers is None:
+        workers = Config.MATCH_WORKERS
+
+    # Target-Indizes einmal vorbereiten statt je Chunk
+    target_label = 'XML_Tag' if isinstance(target_data, dict) else 'CMD_Spalte'
+    values = target_values(target_data, target_columns)
+    if workers > 1:
+        # Prozess-Worker lesen die Arenen aus Shared Memory und bauen die Indizes selbst
+        prepared_targets = {name: PreparedTarget(_share(column), name) for name, column in values.items()}
+    else:
+        prepared_targets = {name: PreparedTarget(column, name, matcher) for name, column in values.items()}
+    targets = [(name, prepared_targets[name]) for name in target_columns if name in prepared_targets]
+
+    chunks, total_chunks = tecdoc_chunk_source(tecdoc_data, sample_mode, tecdoc_columns,
+                                               max_chunks, brands)
+
+    stop = threading.Event()
+    loaded = queue.Queue(maxsize=queue_size)
+    prepared = queue.Queue(maxsize=queue_size)
+    threads = [
+        threading.Thread(target=_stage, daemon=True,
+                         args=(lambda item: item, enumerate(chunks, start=1), loaded, stop)),
+        threading.Thread(target=_stage, daemon=True,
+                         args=(lambda item: _prepare_chunk(item, tecdoc_columns, workers > 1),
+                               _drain(loaded, stop), prepared, stop))
+    ]
+    for thread in threads:
+        thread.start()
+
+    results = []
+    try:
+        if workers <= 1:
+            for chunk_num, n_rows, chunk_values in _drain(prepared, stop):
+                print(f"🔄 {label} {chunk_num}/{total_chunks or '?'}: {n_rows} Zeilen")
+                results.extend(_match_chunk(matcher, chunk_num, chunk_values, targets, target_label))
+        else:
+            # Kein fork: Lese- und Vorbereitungs-Thread laufen bereits und könnten
+            # beim Fork Locks halten, an denen die Worker hängen bleiben
+            start_method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(matcher, targets, target_label),
+                                     mp_context=multiprocessing.get_context(start_method)) as executor:
+                # Höchstens workers + queue_size Chunks gleichzeitig in Arbeit,
+                # Ergebnisse in Chunk-Reihenfolge
+                pending = deque()
+                try:
+                    for chunk_num, n_rows, chunk_values in _drain(prepared, stop):
+                        print(f"🔄 {label} {chunk_num}/{total_chunks or '?'}: {n_rows} Zeilen")
+                        pending.append((executor.submit(_match_chunk_worker, chunk_num, chunk_values),
+                                        chunk_values))
+                        if len(pending) >= workers + queue_size:
+                            future, done_values = pending.popleft()
+                            results.extend(future.result())
+                            _unlink(done_values.values())
+                    while pending:
+                        future, done_values = pending.popleft()
+                        results.extend(future.result())
+                        _unlink(done_values.values())
+                finally:
+                    for future, pending_values in pending:
+                        future.cancel()
+                        _unlink(pending_values.values())
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        if workers > 1:
+            _unlink(prepared_targets.values())
+            # Bereits vorbereitete, nicht mehr gematchte Chunks
+            while not prepared.empty():
+                item = prepared.get_nowait()
+                if isinstance(item, tuple):
+                    _unlink(item[2].values())
+
+    return pd.DataFrame(results)
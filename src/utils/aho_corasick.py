@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Aho-Corasick-Automat für Substring-Matching
+Findet alle Muster (TecDoc-Werte) in einem Durchlauf über jeden Text (Target-Wert)
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# =============================================================================
+# AUTOMAT
+# =============================================================================
+
+class AhoCorasick:
+    """
+    Aho-Corasick-Automat über einer Musterliste (reines Python)
+
+    Zustände bilden einen Trie der Muster; Fehler-Links zeigen auf den
+    längsten echten Suffix, der ebenfalls ein Trie-Präfix ist, Ausgabe-Links
+    auf den nächsten solchen Suffix, an dem ein Muster endet. Ein Text wird
+    so in O(Textlänge + Treffer) nach allen Mustern durchsucht.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = list(dict.fromkeys(pattern for pattern in patterns if pattern))
+        self._goto = [{}]
+        self._terminal = [-1]  # Musterindex, der in diesem Zustand endet
+
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = self._goto[state][char] = len(self._goto)
+                    self._goto.append({})
+                    self._terminal.append(-1)
+                state = next_state
+            self._terminal[state] = index
+
+        # Fehler- und Ausgabe-Links in Breitensuche (kürzere Präfixe zuerst)
+        self._fail = [0] * len(self._goto)
+        self._output = [0] * len(self._goto)
+        states = deque(self._goto[0].values())
+        while states:
+            state = states.popleft()
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail = self._goto[fail].get(char, 0)
+                self._fail[next_state] = fail
+                self._output[next_state] = fail if self._terminal[fail] >= 0 else self._output[fail]
+                states.append(next_state)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def iter(self, text: str) -> Iterator[Tuple[int, int]]:
+        """(Endposition, Musterindex) aller Vorkommen im Text"""
+        goto, fail, terminal, output = self._goto, self._fail, self._terminal, self._output
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            match = state if terminal[state] >= 0 else output[state]
+            while match:
+                yield position, terminal[match]
+                match = output[match]
+
+# =============================================================================
+# SUBSTRING-SUCHE
+# =============================================================================
+
+def first_containing(patterns: Iterable[str], texts: List[str]) -> Dict[str, int]:
+    """
+    Index des ersten Texts, der ein Muster echt enthält, je Muster
+
+    Echt heißt: das Muster kommt im Text vor und ist nicht mit ihm
+    identisch (entspricht pattern in text and pattern != text). Jeder
+    Text wird einmal durch einen Automaten über allen Mustern geschickt,
+    die Suche endet, sobald jedes Muster einen Text gefunden hat.
+
+    Returns:
+        Dict Muster → Textindex (Muster ohne Treffer fehlen)
+    """
+    patterns = list(dict.fromkeys(patterns))
+    found = {}
+    if '' in patterns:
+        # Leeres Muster steckt in jedem nicht leeren Text
+        first = next((index for index, text in enumerate(texts) if text), None)
+        if first is not None:
+            found[''] = first
+    patterns = [pattern for pattern in patterns if pattern]
+    if not patterns:
+        return found
+
+    if AHOCORASICK_AVAILABLE:
+        automaton = ahocorasick.Automaton()
+        for pattern in patterns:
+            automaton.add_word(pattern, pattern)
+        automaton.make_automaton()
+        scan = lambda text: (pattern for _, pattern in automaton.iter(text))
+    else:
+        automaton = AhoCorasick(patterns)
+        scan = lambda text: (automaton.patterns[index] for _, index in automaton.iter(text))
+
+    total = len(patterns) + len(found)
+    shortest = min(map(len, patterns))
+    for index, text in enumerate(texts):
+        # Echt enthalten kann nur ein längerer Text
+        if len(text) <= shortest:
+            continue
+        for pattern in scan(text):
+            if pattern not in found and len(pattern) < len(text):
+                found[pattern] = index
+        if len(found) == total:
+            break
+    return found
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+String-Arena für Wertelisten der Matcher
+Alle Werte einer Spalte in einem zusammenhängenden UTF-8-Puffer mit Offset-Array (Arrow-Layout)
+"""
+
+from typing import Iterable, Iterator, List, Tuple
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# =============================================================================
+# STRING-ARENA
+# =============================================================================
+
+class StringArena:
+    """
+    Unveränderliche Folge von Strings in einem UTF-8-Puffer
+
+    Wert i liegt in data[offsets[i]:offsets[i + 1]]. Aus Arrow-String-Arrays
+    (auch den Arrow-Spalten von pandas) werden Puffer und Offsets ohne Kopie
+    übernommen. Die Arena enthält nur vorhandene Werte (wie dropna().tolist())
+    als Text; die Matcher wandeln ohnehin jeden Wert zuerst mit str() um.
+    """
+
+    def __init__(self, data: np.ndarray, offsets: np.ndarray):
+        self.data = data
+        self.offsets = offsets
+        self._segments = None
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, index: int) -> str:
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return bytes(self.data[start:end]).decode('utf-8')
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.tolist())
+
+    @property
+    def nbytes(self) -> int:
+        return self.data.nbytes + self.offsets.nbytes
+
+    # -------------------------------------------------------------------------
+    # Erzeugen
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def from_values(cls, values: Iterable) -> 'StringArena':
+        """Arena aus beliebigen Werten (fehlende Werte werden übersprungen, Rest per str())"""
+        encoded = [str(value).encode('utf-8')
+                   for value in values if not _is_missing(value)]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum(np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded)), out=offsets[1:])
+        return cls(np.frombuffer(b''.join(encoded), dtype=np.uint8), offsets)
+
+    @classmethod
+    def from_arrow(cls, array) -> 'StringArena':
+        """
+        Arena aus einem Arrow-(Large-)String-Array ohne Kopie der Puffer
+
+        Null-Einträge werden vorher entfernt (dabei wird kopiert);
+        ChunkedArrays mit mehreren Chunks werden zusammengefügt.
+        """
+        if isinstance(array, pa.ChunkedArray):
+            array = array.combine_chunks() if array.num_chunks != 1 else array.chunk(0)
+        if array.null_count:
+            array = array.drop_null()
+
+        offset_type = np.int64 if pa.types.is_large_string(array.type) else np.int32
+        _, offsets_buffer, data_buffer = array.buffers()
+        offsets = np.frombuffer(offsets_buffer, dtype=offset_type,
+                                count=len(array) + 1, offset=array.offset * np.dtype(offset_type).itemsize)
+        data = (np.frombuffer(data_buffer, dtype=np.uint8) if data_buffer is not None
+                else np.zeros(0, dtype=np.uint8))
+        if len(offsets) and offsets[0]:
+            # Ausschnitte (z.B. iloc-Chunks) auf Offset 0 verschieben: die Puffer
+            # bleiben Sichten, nur die Offsets werden kopiert. Arrow-Kernels
+            # liefern für from_buffers-Arrays mit Start-Offset ungültige Ergebnisse.
+            start = offsets[0]
+            data, offsets = data[start:offsets[-1]], offsets - start
+        return cls(data, offsets)
+
+    @classmethod
+    def from_series(cls, series: pd.Series) -> 'StringArena':
+        """
+        Arena der vorhandenen Werte einer Spalte (entspricht dropna().tolist())
+
+        Arrow-gestützte String-Spalten werden ohne Kopie übernommen, alle
+        anderen Spalten (Zahlen, Kategorien, object) per str() kodiert.
+        """
+        if PYARROW_AVAILABLE and isinstance(series.dtype, pd.StringDtype) and series.dtype.storage == 'pyarrow':
+            array = series.array.__arrow_array__()
+            if pa.types.is_string(array.type) or pa.types.is_large_string(array.type):
+                return cls.from_arrow(array)
+        return cls.from_values(series.dropna().tolist())
+
+    # -------------------------------------------------------------------------
+    # Lesen
+    # -------------------------------------------------------------------------
+
+    def to_arrow(self) -> 'pa.Array':
+        """Arrow-String-Array auf denselben Puffern (ohne Kopie)"""
+        string_type = pa.large_string() if self.offsets.dtype == np.int64 else pa.string()
+        return pa.Array.from_buffers(string_type, len(self),
+                                     [None, pa.py_buffer(self.offsets), pa.py_buffer(self.data)])
+
+    def tolist(self) -> List[str]:
+        """Alle Werte als Python-Strings"""
+        if PYARROW_AVAILABLE:
+            return self.to_arrow().to_pylist()
+        return [self[i] for i in range(len(self))]
+
+    # -------------------------------------------------------------------------
+    # Shared Memory
+    # -------------------------------------------------------------------------
+
+    def share(self) -> 'StringArena':
+        """
+        Kopie der Arena in Shared Memory
+
+        Beim Pickeln (z.B. an Prozess-Worker) werden nur die Segmentnamen
+        übertragen, die Worker lesen denselben Speicher. Der Ersteller gibt
+        die Segmente mit unlink() frei.
+        """
+        from multiprocessing import shared_memory
+
+        start = int(self.offsets[0])
+        arrays = [self.data[start:int(self.offsets[-1])], self.offsets - self.offsets.dtype.type(start)]
+        segments, views = [], []
+        for array in arrays:
+            segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)
+            view[:] = array
+            segments.append(segment)
+            views.append(view)
+
+        arena = StringArena(*views)
+        arena._segments = segments
+        return arena
+
+    def close(self):
+        """Shared-Memory-Segmente dieses Prozesses schließen"""
+        if self._segments:
+            self.data = self.offsets = None
+            for segment in self._segments:
+                try:
+                    segment.close()
+                except BufferError:
+                    # Noch referenzierte Sichten (z.B. Arrow-Arrays) schließen beim Aufräumen
+                    pass
+            self._segments = None
+
+    def unlink(self):
+        """Shared-Memory-Segmente freigeben (nur im erzeugenden Prozess)"""
+        segments = self._segments
+        self.close()
+        for segment in segments or []:
+            segment.unlink()
+
+    def __getstate__(self):
+        if self._segments is None:
+            return {'data': self.data, 'offsets': self.offsets}
+        return {'shared': [(segment.name, array.dtype.str, array.shape)
+                           for segment, array in zip(self._segments, (self.data, self.offsets))]}
+
+    def __setstate__(self, state):
+        if 'shared' not in state:
+            self.data, self.offsets, self._segments = state['data'], state['offsets'], None
+            return
+        self.data, self.offsets, self._segments = _attach(state['shared'])
+
+def _attach(handles: List[Tuple[str, str, tuple]]) -> Tuple[np.ndarray, np.ndarray, list]:
+    """Segmente einer geteilten Arena öffnen"""
+    from multiprocessing import shared_memory
+
+    segments, views = [], []
+    for name, dtype, shape in handles:
+        segment = shared_memory.SharedMemory(name=name)
+        segments.append(segment)
+        views.append(np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf))
+    return views[0], views[1], segments
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and value != value) or value is pd.NA
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+pyarrow-basierter CSV-Reader
+Multithreaded Parsing mit einstellbarer Blockgröße und Streaming in Batches
+"""
+
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Union
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+try:
+    from pandas._libs.parsers import STR_NA_VALUES
+except ImportError:
+    STR_NA_VALUES = {'', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan',
+                     '1.#IND', '1.#QNAN', '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None',
+                     'n/a', 'nan', 'null'}
+
+from .core import Config, is_compressed, open_input
+
+# =============================================================================
+# OPTIONEN
+# =============================================================================
+
+def _arrow_type(dtype) -> 'pa.DataType':
+    """Arrow-Typ zu einer pandas-dtype-Angabe (str/object werden String)"""
+    if dtype in (str, object, 'str', 'object', 'string'):
+        return pa.string()
+    return pa.from_numpy_dtype(np.dtype(dtype))
+
+def _arrow_options(read_options: Dict = None, block_size: int = None,
+                   string_columns: List[str] = None):
+    """
+    Übersetze pandas-Optionen (usecols/dtype) in pyarrow-Optionen
+
+    Fehlende Werte wie bei pandas: leere Felder und die Standard-NA-Werte
+    von read_csv werden auch in String-Spalten zu null. string_columns
+    werden ohne Typinferenz als String gelesen, Spalten aus dtype mit dem
+    angegebenen Typ.
+    """
+    read_options = read_options or {}
+    if block_size is None:
+        block_size = Config.ARROW_BLOCK_SIZE
+
+    convert_kwargs = {'null_values': sorted(STR_NA_VALUES),
+                      'strings_can_be_null': True,
+                      'quoted_strings_can_be_null': True}
+    if 'usecols' in read_options:
+        convert_kwargs['include_columns'] = list(read_options['usecols'])
+    column_types = {col: pa.string() for col in string_columns or []}
+    column_types.update({col: _arrow_type(dtype)
+                         for col, dtype in (read_options.get('dtype') or {}).items()})
+    if column_types:
+        convert_kwargs['column_types'] = column_types
+
+    return (pa_csv.ReadOptions(block_size=block_size, use_threads=True),
+            pa_csv.ConvertOptions(**convert_kwargs))
+
+def _stream_columns(file_path: Union[str, Path], read_options: Dict) -> List[str]:
+    """Projizierte Spalten für das Streaming (alle als String gelesen)"""
+    if 'usecols' in read_options:
+        return list(read_options['usecols'])
+    return list(pd.read_csv(file_path, nrows=0).columns)
+
+def _infer_types(table: 'pa.Table', fixed: Iterable[str] = ()) -> 'pa.Table':
+    """
+    Typen einer als String gelesenen Tabelle nachträglich bestimmen
+
+    Je Spalte int64, sonst double, sonst bool, sonst String - über alle
+    Zeilen wie bei read_csv, nicht nur über den ersten Block.
+    """
+    fixed = set(fixed)
+    columns = []
+    for name, column in zip(table.column_names, table.columns):
+        if name not in fixed:
+            for target in (pa.int64(), pa.float64(), pa.bool_()):
+                try:
+                    column = pc.cast(column, target)
+                    break
+                except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                    continue
+        columns.append(column)
+    return pa.table(columns, names=table.column_names)
+
+def _to_pandas(table: 'pa.Table') -> pd.DataFrame:
+    """
+    DataFrame mit den Typen von read_csv
+
+    Komplett leere Spalten werden float64, bool-Spalten mit Lücken object
+    mit NaN (Arrow liefert hier object bzw. None).
+    """
+    for index, field in enumerate(table.schema):
+        if pa.types.is_null(field.type):
+            table = table.set_column(index, field.name, table.column(index).cast(pa.float64()))
+    data = table.to_pandas()
+    for field in table.schema:
+        if pa.types.is_boolean(field.type) and table.column(field.name).null_count:
+            data[field.name] = data[field.name].where(data[field.name].notna(), np.nan)
+    return data
+
+# =============================================================================
+# READER
+# =============================================================================
+
+def _open_source(file_path: Union[str, Path]):
+    """Pfad für Rohdateien (natives I/O), dekomprimierender Stream für .gz/.zst/.xz/.bz2"""
+    if is_compressed(file_path):
+        return open_input(file_path)
+    return nullcontext(str(file_path))
+
+def iter_csv_batches(file_path: Union[str, Path], read_options: Dict = None,
+                     block_size: int = None) -> Iterator[pd.DataFrame]:
+    """
+    Lese eine CSV-Datei als Folge von DataFrames (ein Record-Batch je Block)
+
+    Alle Spalten werden als String gelesen: der Streaming-Reader legt die
+    Typen sonst nach dem ersten Block fest und bricht bei einem späteren
+    abweichenden Wert ab.
+    """
+    read_options = read_options or {}
+    arrow_read, arrow_convert = _arrow_options(read_options, block_size,
+                                               _stream_columns(file_path, read_options))
+    with _open_source(file_path) as source:
+        reader = pa_csv.open_csv(source, read_options=arrow_read,
+                                 convert_options=arrow_convert)
+        for batch in reader:
+            yield batch.to_pandas()
+
+def iter_csv_chunks(file_path: Union[str, Path], read_options: Dict = None,
+                    chunk_size: int = 100000, nrows: int = None,
+                    block_size: int = None) -> Iterator[pd.DataFrame]:
+    """
+    Lese eine CSV-Datei in DataFrames zu chunk_size Zeilen
+
+    Gegenstück zu pd.read_csv(chunksize=...): die Blöcke werden als String
+    gelesen, zu Chunks zusammengefasst und deren Typen je Chunk bestimmt.
+    """
+    read_options = read_options or {}
+    fixed = read_options.get('dtype') or ()
+    arrow_read, arrow_convert = _arrow_options(read_options, block_size,
+                                               _stream_columns(file_path, read_options))
+    with _open_source(file_path) as source:
+        reader = pa_csv.open_csv(source, read_options=arrow_read,
+                                 convert_options=arrow_convert)
+        batches = []
+        buffered = 0
+        remaining = nrows
+        for batch in reader:
+            batches.append(batch)
+            buffered += batch.num_rows
+            while buffered >= chunk_size and (remaining is None or remaining > 0):
+                table = pa.Table.from_batches(batches, schema=reader.schema)
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                yield _to_pandas(_infer_types(table.slice(0, size), fixed))
+                rest = table.slice(size)
+                batches = rest.to_batches()
+                buffered = rest.num_rows
+                if remaining is not None:
+                    remaining -= size
+            if remaining is not None and remaining <= 0:
+                return
+
+        if buffered and (remaining is None or remaining > 0):
+            table = pa.Table.from_batches(batches, schema=reader.schema)
+            size = buffered if remaining is None else min(buffered, remaining)
+            yield _to_pandas(_infer_types(table.slice(0, size), fixed))
+
+def read_csv_arrow(file_path: Union[str, Path], read_options: Dict = None,
+                   nrows: int = None, block_size: int = None) -> pd.DataFrame:
+    """
+    Lese eine CSV-Datei mit dem multithreaded pyarrow-Reader
+
+    Fehlende Werte und Typen entsprechen pd.read_csv mit denselben
+    Optionen. Mit nrows werden die Blöcke als Strings gestreamt und die
+    Typen danach über alle gelesenen Zeilen bestimmt.
+
+    Args:
+        file_path: CSV-Datei
+        read_options: pandas-Optionen aus csv_read_options (usecols/dtype)
+        nrows: Nur die ersten N Zeilen (Streaming, bricht nach N Zeilen ab)
+        block_size: Blockgröße in Bytes (None = Config.ARROW_BLOCK_SIZE)
+
+    Returns:
+        DataFrame
+    """
+    read_options = read_options or {}
+
+    if nrows is None:
+        arrow_read, arrow_convert = _arrow_options(read_options, block_size)
+        with _open_source(file_path) as source:
+            table = pa_csv.read_csv(source, read_options=arrow_read,
+                                    convert_options=arrow_convert)
+        return _to_pandas(table)
+
+    arrow_read, arrow_convert = _arrow_options(read_options, block_size,
+                                               _stream_columns(file_path, read_options))
+    with _open_source(file_path) as source:
+        reader = pa_csv.open_csv(source, read_options=arrow_read,
+                                 convert_options=arrow_convert)
+        batches = []
+        rows = 0
+        for batch in reader:
+            batches.append(batch)
+            rows += batch.num_rows
+            if rows >= nrows:
+                break
+
+    table = pa.Table.from_batches(batches, schema=reader.schema).slice(0, nrows)
+    return _to_pandas(_infer_types(table, read_options.get('dtype') or ()))
@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Spaltenbasierter Eingabe-Cache für TecDoc- und CMD-Quelldaten
+Speichert geparste Eingaben einmalig als Arrow IPC (Feather) und lädt sie memory-mapped
+(String-Spalten bleiben Sichten auf die gemappte Datei)
+"""
+
+import os
+import hashlib
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from .core import Config
+
+# =============================================================================
+# FINGERPRINTS
+# =============================================================================
+
+def file_fingerprint(file_path: Union[str, Path],
+                     sample_bytes: int = None) -> str:
+    """
+    Schneller Fingerprint einer Datei aus Größe, mtime und Inhaltsstichproben
+
+    Gelesen werden nur Anfang, Mitte und Ende der Datei, damit der
+    Fingerprint auch bei mehreren GB in Millisekunden berechnet ist.
+    """
+    if sample_bytes is None:
+        sample_bytes = Config.CACHE_FINGERPRINT_BYTES
+
+    file_path = Path(file_path)
+    stat = file_path.stat()
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+    with open(file_path, 'rb') as f:
+        for offset in (0, max(0, stat.st_size // 2 - sample_bytes // 2),
+                       max(0, stat.st_size - sample_bytes)):
+            f.seek(offset)
+            digest.update(f.read(sample_bytes))
+
+    return digest.hexdigest()
+
+def sources_fingerprint(sources: List[Union[str, Path]]) -> str:
+    """Kombinierter Fingerprint mehrerer Quelldateien (Reihenfolge-unabhängig)"""
+    digest = hashlib.blake2b(digest_size=16)
+    for source in sorted(str(s) for s in sources):
+        digest.update(Path(source).name.encode())
+        digest.update(file_fingerprint(source).encode())
+    return digest.hexdigest()
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+class InputCache:
+    """
+    Verwaltet Cache-Einträge im Arrow-IPC-Format
+
+    Dateiname: <name>-<variante>-<quellen>.arrow. Die Variante beschreibt die
+    Ladeparameter (z.B. Sample-Modus), der Quellen-Hash Größe, mtime und Inhalt
+    der Quelldateien. Einträge derselben Variante mit abweichendem Quellen-Hash
+    sind veraltet und werden entfernt; je Name bleiben höchstens max_variants
+    Einträge (zuletzt benutzte zuerst), insgesamt höchstens max_bytes.
+    """
+
+    SUFFIX = ".arrow"
+
+    def __init__(self, cache_dir: Union[str, Path] = None, max_bytes: int = None,
+                 max_variants: int = None):
+        self.cache_dir = Path(cache_dir) if cache_dir else Config.CACHE_DIR
+        self.max_bytes = max_bytes if max_bytes is not None else Config.CACHE_MAX_BYTES
+        self.max_variants = max_variants if max_variants is not None else Config.CACHE_MAX_VARIANTS
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.blake2b(text.encode(), digest_size=8).hexdigest()
+
+    def entry_path(self, name: str, sources: List[Union[str, Path]], variant: str) -> Path:
+        """Pfad des Cache-Eintrags für Quelle + Variante"""
+        return self.cache_dir / (f"{name}-{self._hash(variant)}-"
+                                 f"{sources_fingerprint(sources)}{self.SUFFIX}")
+
+    def load(self, entry: Path) -> Optional[pd.DataFrame]:
+        """
+        Lade Eintrag memory-mapped (None bei Cache-Miss)
+
+        Die Arrow-Puffer verweisen auf die gemappte Datei und halten die
+        Abbildung auch nach dem Schließen des Handles am Leben. String-Spalten
+        werden ohne Kopie als Arrow-gestützte str-Spalten übernommen (pandas
+        >= 3), Zahlen- und Kategorie-Spalten kopiert, damit der DataFrame
+        beschreibbar bleibt (gemappte Puffer sind schreibgeschützt).
+        """
+        if not entry.exists():
+            return None
+
+        try:
+            with pa.memory_map(str(entry), 'r') as source:
+                table = pa.ipc.open_file(source).read_all()
+                data = table.to_pandas()
+        except Exception as e:
+            print(f"⚠️ Defekter Cache-Eintrag {entry.name}: {e}")
+            entry.unlink(missing_ok=True)
+            return None
+
+        # Zugriffszeit für LRU-Verdrängung aktualisieren
+        os.utime(entry)
+        return data
+
+    def store(self, entry: Path, data: pd.DataFrame) -> bool:
+        """Schreibe Eintrag atomar und verdränge veraltete Einträge"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry.with_suffix(".tmp")
+
+        try:
+            # Unkomprimiert, damit die Spalten direkt gemappt werden können
+            feather.write_feather(data.reset_index(drop=True), str(tmp_path),
+                                  compression='uncompressed')
+            os.replace(tmp_path, entry)
+        except Exception as e:
+            # z.B. gemischte Typen in Objekt-Spalten, die Arrow ablehnt
+            print(f"⚠️ Cache-Eintrag nicht geschrieben ({entry.name}): {e}")
+            tmp_path.unlink(missing_ok=True)
+            return False
+
+        self.evict_stale(entry)
+        self.enforce_variant_limit(entry)
+        self.enforce_limit(keep=entry)
+        return True
+
+    def _entries(self, name: str) -> List[Path]:
+        """Alle Einträge eines Namens (über alle Varianten)"""
+        return [path for path in self.cache_dir.glob(f"{name}-*{self.SUFFIX}")
+                if path.name.rsplit("-", 2)[0] == name]
+
+    def evict_stale(self, entry: Path):
+        """Entferne Einträge derselben Variante mit veraltetem Quellen-Hash"""
+        name_variant = entry.name.rsplit("-", 1)[0]
+        for path in self.cache_dir.glob(f"{name_variant}-*{self.SUFFIX}"):
+            if path != entry:
+                print(f"🧹 Veralteter Cache-Eintrag entfernt: {path.name}")
+                path.unlink(missing_ok=True)
+
+    def enforce_variant_limit(self, entry: Path):
+        """
+        Behalte je Name nur die max_variants zuletzt benutzten Einträge
+
+        Varianten alter Spalten-/Typ-Einstellungen werden sonst nie wieder
+        gelesen und nur vom Gesamtlimit erfasst.
+        """
+        name = entry.name.rsplit("-", 2)[0]
+        entries = sorted((path for path in self._entries(name) if path != entry),
+                         key=lambda p: p.stat().st_mtime, reverse=True)
+        for path in entries[max(self.max_variants - 1, 0):]:
+            print(f"🧹 Alte Cache-Variante entfernt: {path.name}")
+            path.unlink(missing_ok=True)
+
+    def enforce_limit(self, keep: Path = None):
+        """Verdränge die am längsten unbenutzten Einträge oberhalb von max_bytes"""
+        entries = sorted(self.cache_dir.glob(f"*{self.SUFFIX}"),
+                         key=lambda p: p.stat().st_mtime)
+        total = sum(p.stat().st_size for p in entries)
+
+        for path in entries:
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            total -= path.stat().st_size
+            print(f"🧹 Cache-Limit: {path.name} verdrängt")
+            path.unlink(missing_ok=True)
+
+    def clear(self):
+        """Entferne alle Cache-Einträge"""
+        for path in self.cache_dir.glob(f"*{self.SUFFIX}"):
+            path.unlink(missing_ok=True)
+
+def cached_frame(name: str, sources: List[Union[str, Path]], variant: str,
+                 loader: Callable[[], pd.DataFrame],
+                 use_cache: bool = None) -> pd.DataFrame:
+    """
+    Lade DataFrame aus dem Cache oder über loader() und lege ihn dann ab
+
+    Args:
+        name: Name der Quelle (z.B. 'tecdoc')
+        sources: Quelldateien, aus denen der Schlüssel gebildet wird
+        variant: Beschreibung der Ladeparameter
+        loader: Parst die Quelldateien bei einem Cache-Miss
+        use_cache: Cache verwenden (None = Config.USE_CACHE)
+
+    Returns:
+        Geladener DataFrame
+    """
+    if use_cache is None:
+        use_cache = Config.USE_CACHE
+
+    if not use_cache or not PYARROW_AVAILABLE:
+        return loader()
+
+    data = cached_entry(name, sources, variant)
+    if data is not None:
+        return data
+
+    cache = InputCache()
+    entry = cache.entry_path(name, sources, variant)
+    data = loader()
+    if cache.store(entry, data):
+        print(f"💾 Cache-Eintrag geschrieben: {entry.name}")
+
+    return data
+
+def cached_entry(name: str, sources: List[Union[str, Path]], variant: str,
+                 use_cache: bool = None) -> Optional[pd.DataFrame]:
+    """Vorhandenen Cache-Eintrag laden, ohne bei einem Miss zu parsen (sonst None)"""
+    if use_cache is None:
+        use_cache = Config.USE_CACHE
+
+    if not use_cache or not PYARROW_AVAILABLE:
+        return None
+
+    cache = InputCache()
+    entry = cache.entry_path(name, sources, variant)
+    data = cache.load(entry)
+    if data is not None:
+        print(f"⚡ Cache-Treffer: {entry.name} ({len(data):,} Zeilen)")
+    return data
+
+def xml_values_to_frame(xml_data: Dict[str, List]) -> pd.DataFrame:
+    """Wandle XML-Werte {tag: werte} in eine zweispaltige Tabelle um"""
+    tags = [tag for tag, values in xml_data.items() for _ in values]
+    values = [value for values in xml_data.values() for value in values]
+    return pd.DataFrame({'tag': pd.Categorical(tags, categories=list(xml_data)),
+                         'value': pd.Series(values, dtype=object)})
+
+def frame_to_xml_values(frame: pd.DataFrame) -> Dict[str, List]:
+    """Gegenstück zu xml_values_to_frame (Tag-Reihenfolge bleibt erhalten)"""
+    xml_data = {tag: [] for tag in frame['tag'].cat.categories}
+    for tag, group in frame.groupby('tag', observed=True, sort=False):
+        xml_data[tag] = group['value'].tolist()
+    return xml_data
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Zeichenmatrix für kurze Werte fester Maximalbreite
+Eine normalisierte Spalte als NumPy-Matrix (Zeile = Wert, Spalte = Zeichenposition) mit Längenvektor
+"""
+
+from functools import partial
+from typing import Iterable, List, Tuple
+import numpy as np
+
+from .core import Config
+from .packing import PackedSet, sorted_unique
+
+KEY_WIDTH = 8  # Zeichen je uint64-Schlüssel (ein Byte je Zeichen)
+
+# =============================================================================
+# ZEICHENMATRIX
+# =============================================================================
+
+class CharMatrix:
+    """
+    Werte als (n, breite)-Matrix der Code Points plus Längenvektor
+
+    Die Matrix ist uint8, wenn alle Zeichen Latin-1 sind, sonst uint32.
+    Werte, die länger als max_width sind, werden abgeschnitten gespeichert;
+    Operationen, die über die Breite hinausgehen, nutzen für diese Zeilen
+    die Originalwerte.
+    """
+
+    def __init__(self, values: Iterable[str], max_width: int = None):
+        if max_width is None:
+            max_width = Config.CHAR_MATRIX_MAX_WIDTH
+        self.values = values if isinstance(values, list) else list(values)
+        self.lengths = np.fromiter(map(len, self.values), dtype=np.int64, count=len(self.values))
+        self.width = int(min(self.lengths.max(initial=0), max_width))
+
+        if self.width == 0:
+            self.matrix = np.zeros((len(self.values), 0), dtype=np.uint8)
+        else:
+            points = np.array(self.values, dtype=f'U{self.width}').view(np.uint32)
+            points = points.reshape(len(self.values), self.width)
+            self.matrix = points.astype(np.uint8) if points.max(initial=0) < 256 else points
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def truncated(self) -> np.ndarray:
+        """Maske der Zeilen, die breiter als die Matrix sind"""
+        return self.lengths > self.width
+
+    def prefix_block(self, length: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(Zeilen, Matrix der Präfixe) aller Werte mit mindestens length Zeichen"""
+        rows = np.flatnonzero(self.lengths >= length)
+        if length > self.width:
+            return rows, np.zeros((len(rows), 0), dtype=self.matrix.dtype)
+        return rows, self.matrix[rows, :length]
+
+    def suffix_block(self, length: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(Zeilen, Matrix der Suffixe) aller vollständig gespeicherten Werte mit mindestens length Zeichen"""
+        rows = np.flatnonzero((self.lengths >= length) & ~self.truncated)
+        if length > self.width:
+            return rows, np.zeros((len(rows), 0), dtype=self.matrix.dtype)
+        columns = self.lengths[rows, None] - length + np.arange(length)
+        return rows, np.take_along_axis(self.matrix[rows], columns, axis=1)
+
+    def affix_keys(self, kind: str, length: int) -> PackedSet:
+        """
+        Präfixe oder Suffixe der Länge length als PackedSet
+
+        Bis KEY_WIDTH Latin-1-Zeichen werden als uint64 (ein Byte je
+        Zeichen) verglichen, alle übrigen Präfixe/Suffixe als Strings.
+        """
+        decode = partial(unpack_latin1, length=length)
+        if not 1 <= length <= min(KEY_WIDTH, self.width):
+            affixes = [value[:length] if kind == 'prefix' else value[-length:]
+                       for value in self.values if len(value) >= length]
+            return PackedSet(np.zeros(0, dtype=np.uint64), set(affixes), decode=decode)
+
+        rows, block = self.prefix_block(length) if kind == 'prefix' else self.suffix_block(length)
+        if block.dtype == np.uint8:
+            latin1 = np.ones(len(rows), dtype=bool)
+        else:
+            latin1 = (block < 256).all(axis=1)
+
+        keys = np.zeros((int(latin1.sum()), KEY_WIDTH), dtype=np.uint8)
+        keys[:, :length] = block[latin1]
+        codes = keys.view('>u8').ravel().astype(np.uint64)
+
+        # Zeilen ohne Schlüssel: Nicht-Latin-1 und (bei Suffixen) abgeschnittene Werte
+        rows = rows[~latin1]
+        if kind == 'suffix':
+            rows = np.concatenate([rows, np.flatnonzero(self.truncated & (self.lengths >= length))])
+        affixes = [self.values[row][:length] if kind == 'prefix' else self.values[row][-length:]
+                   for row in rows.tolist()]
+        extra = [affix for affix in affixes if _is_latin1(affix)]
+        if extra:
+            codes = np.concatenate([codes, latin1_keys(extra, length)])
+
+        return PackedSet(sorted_unique(codes), {affix for affix in affixes if not _is_latin1(affix)},
+                         decode=decode)
+
+# =============================================================================
+# SCHLÜSSEL
+# =============================================================================
+
+def _is_latin1(value: str) -> bool:
+    return all(ord(char) < 256 for char in value)
+
+def latin1_keys(values: List[str], length: int) -> np.ndarray:
+    """uint64-Schlüssel für Latin-1-Strings der Länge length (≤ KEY_WIDTH)"""
+    keys = np.zeros((len(values), KEY_WIDTH), dtype=np.uint8)
+    keys[:, :length] = np.frombuffer(''.join(values).encode('latin-1'),
+                                     dtype=np.uint8).reshape(len(values), length)
+    return keys.view('>u8').ravel().astype(np.uint64)
+
+def unpack_latin1(codes: Iterable[int], length: int) -> List[str]:
+    """Strings zu uint64-Schlüsseln der Länge length"""
+    return [int(code).to_bytes(KEY_WIDTH, 'big')[:length].decode('latin-1') for code in codes]
@@ -8,7 +8,7 @@ import os
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import List, Dict, Set, Tuple, Optional, Union
+from typing import Iterator, List, Dict, Set, Tuple, Optional, Union
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -32,20 +32,101 @@ class Config:
     TECDOC_FILE = "200_Article_Table.csv"
     CHUNK_SIZE = 10000
     SAMPLE_CHUNKS = 5  # Für Test-Modus
+    TECDOC_COLUMNS = ['artno', 'brandno', 'batchsize1', 'batchsize2']
+    SAMPLE_STRATEGY = "head"  # head (erste Chunks) | random | stratified (nach brandno)
+    SAMPLE_STRATIFY_COLUMN = "brandno"
+    SAMPLE_SEED = 42
     
     # CMD Daten
     CMD_CSV_FILES = ["cmd_daten.csv"]
     CMD_XML_DIR = "cmd_platform_data"
+    XML_TARGET_TAGS = [
+        'SupplierPtNo', 'TradeNo', 'ArticleDescription_DE', 'ArticleDescription_EN',
+        'Brand', 'MinOrderQuantity', 'MaxOrderQuantity', 'GrossWeight', 'Volume', 'CategoryID'
+    ]
+    XML_ARTICLE_ID_ATTRIBUTES = ['ArticleNumber', 'ID', 'id', 'articleNumber']
+    XML_ARTICLE_TAGS = ['Article', 'article', 'Product', 'product', 'Item', 'item']  # Artikelzählung
+    XML_PARSER = "auto"  # auto | lxml | etree
+    XML_WORKERS = 1  # Prozesse für die XML-Extraktion (0 = alle CPU-Kerne)
+    XML_SHARD_MIN_BYTES = 256 * 1024 ** 2  # Ab dieser Größe: Byte-Range-Sharding
+    
+    # Komprimierte Eingaben (Streaming-Dekompression)
+    COMPRESSION_SUFFIXES = ['.gz', '.zst', '.xz', '.bz2']
+    
+    # Kompakte Datentypen beim Laden
+    COMPACT_DTYPES = True
+    # Artikelnummern/Kennungen: immer als String lesen (führende Nullen bleiben erhalten)
+    STRING_ID_COLUMNS = ['artno', 'article_number', 'tec_doc_article_number',
+                         'manufacturer_number', 'ean']
+    
+    # CSV-Reader
+    CSV_ENGINE = "c"  # c (pandas) | pyarrow (multithreaded)
+    ARROW_BLOCK_SIZE = 16 * 1024 ** 2
+    CSV_LOAD_WORKERS = 4  # Parallel geladene CMD CSV-Dateien
+    
+    # Markenpartitionen (TecDoc je brandno)
+    PARTITION_COLUMN = "brandno"
+    TECDOC_PARTITION_DIR = DATA_DIR / "partitions" / "tecdoc"
+    PARTITION_CHUNK_SIZE = 500000
+    
+    # Datenprofil
+    PROFILE_MAX_LENGTH = 64  # Letzter Bucket der Längenverteilung
+    
+    # Eingabe-Cache (Arrow IPC, benötigt pyarrow)
+    CACHE_DIR = DATA_DIR / "cache"
+    USE_CACHE = True
+    CACHE_MAX_BYTES = 20 * 1024 ** 3
+    CACHE_MAX_VARIANTS = 4  # Einträge je Quelle (tecdoc, cmd_csv, ...) über alle Varianten
+    CACHE_FINGERPRINT_BYTES = 64 * 1024
+    
+    # Matching-Pipeline (überlappendes Laden/Vorbereiten/Matchen)
+    MATCH_PIPELINE = False  # Opt-in: beim Streamen Typen je Chunk (siehe iter_tecdoc_chunks)
+    PIPELINE_QUEUE_SIZE = 2  # Chunks je Queue (begrenzt den Speicher)
+    MATCH_WORKERS = 1  # Match-Prozesse (1 = im Hauptprozess)
+    # 'chunk': Ergebnisse je TecDoc-Chunk; 'global': ein Hash-Index je Target-Spalte, alle
+    # Chunks als Probes, eindeutige Gesamttreffer der Mengen-Methoden (src/matching/global_join.py;
+    # ohne Substring/Längenbasiert, KEY_ENCODING und DETERMINISTIC_BACKEND gelten dort nicht)
+    MATCH_SCOPE = 'chunk'
+    
+    # Normalisierungsprofile für die spaltenweise Normalisierung (src/utils/normalization.py)
+    NORMALIZATION_PROFILE = "punct"
+    NORMALIZATION_PROFILES = {
+        'clean': {'remove_chars': '', 'nfkc': False, 'fold_umlauts': False},  # wie clean_str
+        'punct': {'remove_chars': '.- ', 'nfkc': False, 'fold_umlauts': False},  # wie normalize_str
+        'unicode': {'remove_chars': '.- ', 'nfkc': True, 'fold_umlauts': True}
+    }
+    
+    # Schlüsselkodierung der deterministischen Mengenvergleiche:
+    # 'strings' (String-Mengen), 'dictionary' (int32-IDs aus einem Wörterbuch je Target-Spalte,
+    # TecDoc-Chunks schlagen nur nach; spart Speicher, das Kodieren kostet aber Zeit) oder 'packed' (Basis-37-Codes in
+    # uint64 für Werte bis 12 Zeichen aus 0-9/A-Z, Rest als String-Menge) oder 'matrix'
+    # (Präfixe/Suffixe als Spalten einer Zeichenmatrix, src/utils/char_matrix.py)
+    KEY_ENCODING = 'strings'
+    # Backend für Exakt, Numerisch_Exakt und Längenbasiert: 'python' (Mengen/Dicts) oder
+    # 'numpy' (uint64-Hashes, int64-Zahlen und bincount-Längenhistogramme als Arrays)
+    DETERMINISTIC_BACKEND = 'python'
+    CHAR_MATRIX_MAX_WIDTH = 32  # Breite der Zeichenmatrix (längere Werte werden abgeschnitten)
+    
+    # Schlüssel aller deterministischen Methoden in einem Durchlauf je Spalte ableiten
+    FUSED_KEYS = True
+    
+    # Substring-/Fuzzy-Schleifen je eindeutigem Wert, Treffer mit der Vielfachheit gewichtet
+    DISTINCT_VALUES = True
     
     # Matching Parameter
     MIN_STRING_LENGTH = 3
     PREFIX_SUFFIX_LENGTH = 5
+    # Zusätzlich Prefix_L/Suffix_L-Ergebnisse für L = MIN_STRING_LENGTH..PREFIX_SUFFIX_MAX_LENGTH
+    # (ein LCP-Durchlauf je Spaltenpaar, zum Abstimmen von PREFIX_SUFFIX_LENGTH)
+    PREFIX_SUFFIX_PROFILE = False
+    PREFIX_SUFFIX_MAX_LENGTH = 12
     SIMILARITY_THRESHOLD = 0.8
+    FUZZY_SUBSTRING_MIN_LENGTH = 4
     
     @classmethod
     def ensure_directories(cls):
         """Stelle sicher, dass alle Verzeichnisse existieren"""
-        for dir_path in [cls.DATA_DIR, cls.INPUT_DIR, cls.OUTPUT_DIR, 
+        for dir_path in [cls.DATA_DIR, cls.INPUT_DIR, cls.OUTPUT_DIR, cls.CACHE_DIR,
                         cls.RESULTS_DIR, cls.TABLES_DIR, cls.VIS_DIR]:
             dir_path.mkdir(parents=True, exist_ok=True)
 
@@ -53,39 +134,325 @@ class Config:
 # DATEN-UTILITIES
 # =============================================================================
 
+def is_compressed(file_path: Union[str, Path]) -> bool:
+    """Prüfe anhand der Endung, ob eine Eingabedatei komprimiert ist"""
+    return Path(file_path).suffix in Config.COMPRESSION_SUFFIXES
+
+def open_input(file_path: Union[str, Path]):
+    """
+    Öffne eine Eingabedatei binär, komprimierte Dateien mit Streaming-Dekompression
+    
+    Unterstützt gzip, xz und bz2 (Standardbibliothek) sowie zstd (zstandard).
+    Die Streams erlauben Vorwärts-Seeks, aber keinen wahlfreien Zugriff.
+    """
+    suffix = Path(file_path).suffix
+    
+    if suffix == '.gz':
+        import gzip
+        return gzip.open(file_path, 'rb')
+    if suffix == '.xz':
+        import lzma
+        return lzma.open(file_path, 'rb')
+    if suffix == '.bz2':
+        import bz2
+        return bz2.open(file_path, 'rb')
+    if suffix == '.zst':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError(f"zstandard nicht verfügbar für {file_path}")
+        return zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), closefd=True)
+    
+    return open(file_path, 'rb')
+
+def resolve_input_file(filename: str) -> Optional[Path]:
+    """Finde eine Eingabedatei (roh oder komprimiert) in INPUT_DIR oder PROJECT_ROOT"""
+    for base_dir in [Config.INPUT_DIR, Config.PROJECT_ROOT]:
+        for suffix in [''] + Config.COMPRESSION_SUFFIXES:
+            file_path = base_dir / f"{filename}{suffix}"
+            if file_path.exists():
+                return file_path
+    return None
+
+def list_xml_files(xml_dir: Union[str, Path]) -> List[Path]:
+    """Alle (ggf. komprimierten) XML-Dateien eines Verzeichnisses, sortiert"""
+    patterns = ["*.xml"] + [f"*.xml{suffix}" for suffix in Config.COMPRESSION_SUFFIXES]
+    return sorted(path for pattern in patterns for path in Path(xml_dir).glob(pattern))
+
 def clean_str(value) -> str:
     """Reinige und normalisiere String-Werte"""
     if pd.isna(value):
         return ""
     return str(value).strip().upper()
 
+def csv_read_options(file_path: Path, columns: List[str] = None,
+                     compact_dtypes: bool = None) -> Dict:
+    """
+    Projektion (usecols) und Datentypen für den CSV-Reader
+    
+    Nicht vorhandene Spalten werden ignoriert. Kennungsspalten aus
+    Config.STRING_ID_COLUMNS werden als String gelesen, statt sie erst
+    numerisch zu inferieren.
+    """
+    if compact_dtypes is None:
+        compact_dtypes = Config.COMPACT_DTYPES
+    
+    options = {}
+    header = pd.read_csv(file_path, nrows=0).columns
+    selected = list(header)
+    
+    if columns is not None:
+        wanted = set(columns)
+        selected = [col for col in header if col in wanted]
+        options['usecols'] = selected
+    
+    if compact_dtypes:
+        options['dtype'] = {col: str for col in selected if col in Config.STRING_ID_COLUMNS}
+    
+    return options
+
+def compact_frame_dtypes(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Verkleinere Datentypen verlustfrei
+    
+    Kennungsspalten werden zu Kategorien, Integer-Spalten auf den kleinsten
+    passenden Typ reduziert. Float-Spalten (z.B. Ganzzahlen mit Lücken)
+    bleiben unverändert, damit sich ihre String-Darstellung nicht ändert.
+    """
+    for col in data.columns:
+        series = data[col]
+        if col in Config.STRING_ID_COLUMNS:
+            data[col] = series.astype('category')
+        elif isinstance(series.dtype, np.dtype) and np.issubdtype(series.dtype, np.integer):
+            data[col] = pd.to_numeric(series, downcast='integer')
+    return data
+
+def resolve_csv_engine(engine: str = None) -> str:
+    """Bestimme den CSV-Reader (Fallback auf pandas ohne pyarrow)"""
+    from .arrow_csv import PYARROW_AVAILABLE
+    
+    if engine is None:
+        engine = Config.CSV_ENGINE
+    
+    if engine == 'pyarrow' and not PYARROW_AVAILABLE:
+        print("⚠️ pyarrow nicht verfügbar. Verwende pandas CSV-Reader.")
+        engine = 'c'
+    
+    return engine
+
+def read_csv_frame(file_path: Path, read_options: Dict = None,
+                   engine: str = 'c') -> pd.DataFrame:
+    """Lese eine komplette CSV-Datei mit dem gewählten Reader"""
+    read_options = read_options or {}
+    
+    if engine == 'pyarrow':
+        from .arrow_csv import read_csv_arrow
+        return read_csv_arrow(file_path, read_options)
+    
+    return pd.read_csv(file_path, **read_options)
+
 def load_tecdoc_data(chunk_size: int = Config.CHUNK_SIZE, 
-                    sample_mode: bool = True) -> pd.DataFrame:
+                    sample_mode: bool = True,
+                    use_cache: bool = None,
+                    columns: List[str] = None,
+                    compact_dtypes: bool = None,
+                    engine: str = None,
+                    sample_strategy: str = None,
+                    brands: List = None) -> pd.DataFrame:
     """
     Lade TecDoc-Daten chunkweise
     
     Args:
         chunk_size: Größe der Chunks
         sample_mode: Nur erste N Chunks laden
+        use_cache: Spaltenbasierten Eingabe-Cache verwenden (None = Config.USE_CACHE)
+        columns: Benötigte Spalten (None = alle)
+        compact_dtypes: Kompakte Datentypen (None = Config.COMPACT_DTYPES)
+        engine: CSV-Reader 'c' oder 'pyarrow' (None = Config.CSV_ENGINE)
+        sample_strategy: 'head', 'random' oder 'stratified' (None = Config.SAMPLE_STRATEGY)
+        brands: Nur diese Marken (brandno) laden, aus den Markenpartitionen
+            falls vorhanden (None = alle)
     
     Returns:
         DataFrame mit TecDoc-Daten
     """
-    file_path = Config.INPUT_DIR / Config.TECDOC_FILE
+    from .cache import cached_frame
     
-    if not file_path.exists():
-        # Fallback zum alten Standort
-        file_path = Config.PROJECT_ROOT / Config.TECDOC_FILE
+    # INPUT_DIR, Fallback zum alten Standort; auch .gz/.zst/.xz/.bz2
+    file_path = resolve_input_file(Config.TECDOC_FILE)
     
-    if not file_path.exists():
+    if file_path is None:
         raise FileNotFoundError(f"TecDoc-Datei nicht gefunden: {Config.TECDOC_FILE}")
     
     print(f"📂 Lade TecDoc-Daten: {file_path}")
     
-    if sample_mode:
+    if compact_dtypes is None:
+        compact_dtypes = Config.COMPACT_DTYPES
+    read_options = csv_read_options(file_path, columns, compact_dtypes)
+    engine = resolve_csv_engine(engine)
+    
+    if brands is not None:
+        return _load_tecdoc_brands(file_path, brands, chunk_size, sample_mode,
+                                   read_options, compact_dtypes, engine, use_cache)
+    
+    if sample_strategy is None:
+        sample_strategy = Config.SAMPLE_STRATEGY
+    
+    variant = _tecdoc_variant(chunk_size, sample_mode, read_options, compact_dtypes, engine,
+                              sample_strategy)
+    if sample_mode and sample_strategy != 'head':
+        loader = lambda: _sample_tecdoc_file(file_path, chunk_size * Config.SAMPLE_CHUNKS,
+                                             sample_strategy, read_options, compact_dtypes)
+    else:
+        loader = lambda: _read_tecdoc_file(file_path, chunk_size, sample_mode,
+                                           read_options, compact_dtypes, engine)
+    
+    return cached_frame('tecdoc', [file_path], variant, loader, use_cache)
+
+def _tecdoc_variant(chunk_size: int, sample_mode: bool, read_options: Dict,
+                    compact_dtypes: bool, engine: str, sample_strategy: str = 'head') -> str:
+    """Cache-Variante von load_tecdoc_data (mit Strategie 'head' auch für iter_tecdoc_chunks)"""
+    if not sample_mode:
+        variant = "full"
+    elif sample_strategy == 'head':
+        variant = f"sample:{Config.SAMPLE_CHUNKS}x{chunk_size}"
+    else:
+        variant = (f"sample:{sample_strategy}:{Config.SAMPLE_CHUNKS}x{chunk_size}"
+                   f":seed={Config.SAMPLE_SEED}")
+    return variant + f"|cols:{read_options.get('usecols', '*')}|compact:{compact_dtypes}|engine:{engine}"
+
+def _load_tecdoc_brands(file_path: Path, brands: List, chunk_size: int, sample_mode: bool,
+                        read_options: Dict, compact_dtypes: bool, engine: str,
+                        use_cache: bool = None) -> pd.DataFrame:
+    """
+    TecDoc-Zeilen ausgewählter Marken
+    
+    Mit aktuellen Markenpartitionen werden nur deren Dateien gelesen (im
+    Sample-Modus nur bis N Zeilen erreicht sind), sonst wird die
+    Originaldatei beim Lesen gefiltert. Beide Wege liefern die Marken in
+    Reihenfolge von brands und die Zeilen je Marke in Dateireihenfolge.
+    """
+    from .cache import cached_frame
+    from .partitions import brand_keys, partition_dtypes, partition_files
+    
+    keys = brand_keys(brands)
+    files = partition_files(file_path, keys)
+    max_rows = chunk_size * Config.SAMPLE_CHUNKS if sample_mode else None
+    
+    if files is None:
+        print("⚠️ Keine aktuellen Markenpartitionen - filtere TecDoc-Datei "
+              "(scripts/utilities/tecdoc_partitionieren.py)")
+        sources = [file_path]
+        loader = lambda: _scan_tecdoc_brands(file_path, keys, chunk_size, read_options,
+                                             compact_dtypes, max_rows)
+    else:
+        print(f"🗂️ Lese {len(files)} Markenpartitionen")
+        sources = files or [file_path]
+        partition_options = {**read_options,
+                             'dtype': {**partition_dtypes(), **read_options.get('dtype', {})}}
+        loader = lambda: _read_tecdoc_partitions(file_path, files, partition_options,
+                                                 compact_dtypes, engine, max_rows)
+    
+    variant = (f"brands:{','.join(keys)}|rows:{max_rows or 'all'}|partitioned:{files is not None}"
+               f"|cols:{read_options.get('usecols', '*')}|compact:{compact_dtypes}|engine:{engine}")
+    data = cached_frame('tecdoc_brands', sources, variant, loader, use_cache)
+    print(f"📊 {len(data):,} Zeilen aus {len(keys)} Marken geladen")
+    
+    return data
+
+def _read_tecdoc_partitions(file_path: Path, files: List[Path], read_options: Dict,
+                            compact_dtypes: bool, engine: str,
+                            max_rows: int = None) -> pd.DataFrame:
+    """Lese Markenpartitionen nacheinander (Abbruch nach max_rows Zeilen)"""
+    frames = []
+    rows = 0
+    
+    for partition_file in files:
+        if max_rows is not None and rows >= max_rows:
+            break
+        frame = read_csv_frame(partition_file, read_options, engine)
+        frames.append(frame)
+        rows += len(frame)
+    
+    if not frames:
+        frames = [pd.read_csv(file_path, nrows=0, **read_options)]
+    
+    data = pd.concat(frames, ignore_index=True)
+    if max_rows is not None:
+        data = data.iloc[:max_rows]
+    
+    if compact_dtypes:
+        data = compact_frame_dtypes(data)
+    
+    return data
+
+def _scan_tecdoc_brands(file_path: Path, keys: List[str], chunk_size: int,
+                        read_options: Dict, compact_dtypes: bool,
+                        max_rows: int = None) -> pd.DataFrame:
+    """Filtere die TecDoc-Datei chunkweise auf die gewählten Marken (ohne Partitionen)"""
+    from .partitions import select_brands
+    
+    # Partitionsspalte wird zum Filtern immer gelesen
+    options = dict(read_options)
+    extra_column = 'usecols' in options and Config.PARTITION_COLUMN not in options['usecols']
+    if extra_column:
+        options['usecols'] = list(options['usecols']) + [Config.PARTITION_COLUMN]
+    
+    frames = [select_brands(chunk, keys)
+              for chunk in pd.read_csv(file_path, chunksize=chunk_size, **options)]
+    data = select_brands(pd.concat(frames, ignore_index=True), keys)
+    
+    if extra_column:
+        data = data.drop(columns=[Config.PARTITION_COLUMN])
+    if max_rows is not None:
+        data = data.iloc[:max_rows]
+    
+    if compact_dtypes:
+        data = compact_frame_dtypes(data)
+    
+    return data
+
+def _sample_tecdoc_file(file_path: Path, n_rows: int, strategy: str,
+                        read_options: Dict = None, compact_dtypes: bool = False) -> pd.DataFrame:
+    """
+    Zufällige oder geschichtete Stichprobe über den Byte-Offset-Zeilenindex
+    
+    Die Zeilen werden in Dateireihenfolge gelesen und anschließend gemischt,
+    damit auch die ersten Chunks der Stichprobe (z.B. im Fuzzy-Matching)
+    nicht zum Dateianfang hin verzerrt sind.
+    """
+    from .line_index import CsvLineIndex
+    
+    stratify_column = Config.SAMPLE_STRATIFY_COLUMN if strategy == 'stratified' else None
+    index = CsvLineIndex.load_or_build(file_path, stratify_column)
+    rows = index.sample_rows(n_rows, strategy, Config.SAMPLE_SEED)
+    
+    data = index.read_rows(file_path, rows, read_options)
+    order = np.random.default_rng(Config.SAMPLE_SEED).permutation(len(data))
+    data = data.iloc[order].reset_index(drop=True)
+    print(f"📊 Sample-Modus ({strategy}): {len(data):,} von {len(index):,} Zeilen geladen")
+    
+    if compact_dtypes:
+        data = compact_frame_dtypes(data)
+    
+    return data
+
+def _read_tecdoc_file(file_path: Path, chunk_size: int, sample_mode: bool,
+                      read_options: Dict = None, compact_dtypes: bool = False,
+                      engine: str = 'c') -> pd.DataFrame:
+    """Parse die TecDoc-CSV (ohne Cache)"""
+    read_options = read_options or {}
+    
+    if sample_mode and engine == 'pyarrow':
+        # Streaming in Record-Batches, Abbruch nach N Chunks
+        from .arrow_csv import read_csv_arrow
+        data = read_csv_arrow(file_path, read_options, nrows=chunk_size * Config.SAMPLE_CHUNKS)
+        n_chunks = -(-len(data) // chunk_size)
+        print(f"📊 Sample-Modus: {len(data):,} Zeilen aus {n_chunks} Chunks geladen")
+    elif sample_mode:
         # Nur erste Chunks für Tests
         chunks = []
-        for i, chunk in enumerate(pd.read_csv(file_path, chunksize=chunk_size)):
+        for i, chunk in enumerate(pd.read_csv(file_path, chunksize=chunk_size, **read_options)):
             chunks.append(chunk)
             if i >= Config.SAMPLE_CHUNKS - 1:
                 break
@@ -93,42 +460,166 @@ def load_tecdoc_data(chunk_size: int = Config.CHUNK_SIZE,
         print(f"📊 Sample-Modus: {len(data):,} Zeilen aus {len(chunks)} Chunks geladen")
     else:
         # Vollständige Datei
-        data = pd.read_csv(file_path)
+        data = read_csv_frame(file_path, read_options, engine)
         print(f"📊 Vollständige Datei: {len(data):,} Zeilen geladen")
     
+    if compact_dtypes:
+        data = compact_frame_dtypes(data)
+    
     return data
 
-def load_cmd_csv_data() -> pd.DataFrame:
-    """Lade CMD CSV-Daten"""
+def iter_tecdoc_chunks(chunk_size: int = Config.CHUNK_SIZE,
+                       sample_mode: bool = True,
+                       columns: List[str] = None,
+                       compact_dtypes: bool = None,
+                       max_chunks: int = None,
+                       use_cache: bool = None,
+                       engine: str = None,
+                       dtypes: Dict = None) -> Iterator[pd.DataFrame]:
+    """
+    Lese die TecDoc-CSV chunkweise, ohne sie vollständig zu laden
+    
+    Liegt der entsprechende Eintrag von load_tecdoc_data (Strategie 'head')
+    im Cache, werden dessen Zeilen in Chunks geteilt. Sonst liest der
+    gewählte CSV-Reader die Datei mit festen Typen: float- und Text-Spalten
+    werden vorab über partitions.source_dtypes bestimmt, sodass jeder Chunk
+    dieselben Typen und Matching-Werte liefert wie die ganze Datei bzw. die
+    Stichprobe von load_tecdoc_data (Kennungsspalten aus
+    Config.STRING_ID_COLUMNS sind immer String).
+    
+    Args:
+        chunk_size: Zeilen je Chunk
+        sample_mode: Nur erste Config.SAMPLE_CHUNKS Chunks
+        columns: Benötigte Spalten (None = alle)
+        compact_dtypes: Kompakte Datentypen (None = Config.COMPACT_DTYPES)
+        max_chunks: Zusätzlich nach N Chunks abbrechen (None = kein Limit)
+        use_cache: Vorhandenen Eingabe-Cache verwenden (None = Config.USE_CACHE)
+        engine: CSV-Reader 'c' oder 'pyarrow' (None = Config.CSV_ENGINE)
+        dtypes: Feste Datentypen je Spalte, z.B. {'batchsize1': 'float64'}
+    
+    Yields:
+        DataFrame je Chunk
+    """
+    from .cache import cached_entry
+    
+    file_path = resolve_input_file(Config.TECDOC_FILE)
+    
+    if file_path is None:
+        raise FileNotFoundError(f"TecDoc-Datei nicht gefunden: {Config.TECDOC_FILE}")
+    
+    if compact_dtypes is None:
+        compact_dtypes = Config.COMPACT_DTYPES
+    read_options = csv_read_options(file_path, columns, compact_dtypes)
+    engine = resolve_csv_engine(engine)
+    
+    nrows = chunk_size * Config.SAMPLE_CHUNKS if sample_mode else None
+    if max_chunks is not None:
+        nrows = min(nrows or chunk_size * max_chunks, chunk_size * max_chunks)
+    
+    if not dtypes:
+        variant = _tecdoc_variant(chunk_size, sample_mode, read_options, compact_dtypes, engine)
+        data = cached_entry('tecdoc', [file_path], variant, use_cache)
+        if data is not None:
+            data = data.iloc[:nrows]
+            for start in range(0, len(data), chunk_size):
+                yield data.iloc[start:start + chunk_size]
+            return
+    
+    from .partitions import source_dtypes
+    
+    # Typen über den ganzen gelesenen Bereich (Stichprobe ohne max_chunks)
+    type_rows = chunk_size * Config.SAMPLE_CHUNKS if sample_mode else None
+    read_options['dtype'] = {**source_dtypes(file_path, read_options, chunk_size, type_rows, engine),
+                             **(dtypes or {}), **read_options.get('dtype', {})}
+    
+    print(f"📂 Streame TecDoc-Daten: {file_path}")
+    if engine == 'pyarrow':
+        from .arrow_csv import iter_csv_chunks
+        chunks = iter_csv_chunks(file_path, read_options, chunk_size, nrows)
+    else:
+        chunks = pd.read_csv(file_path, chunksize=chunk_size, nrows=nrows, **read_options)
+    
+    for chunk in chunks:
+        yield compact_frame_dtypes(chunk) if compact_dtypes else chunk
+
+def load_cmd_csv_data(use_cache: bool = None, columns: List[str] = None,
+                      compact_dtypes: bool = None, engine: str = None) -> pd.DataFrame:
+    """
+    Lade CMD CSV-Daten
+    
+    Args:
+        use_cache: Spaltenbasierten Eingabe-Cache verwenden (None = Config.USE_CACHE)
+        columns: Benötigte Spalten, z.B. target_columns des Matchings (None = alle)
+        compact_dtypes: Kompakte Datentypen (None = Config.COMPACT_DTYPES)
+        engine: CSV-Reader 'c' oder 'pyarrow' (None = Config.CSV_ENGINE)
+    
+    Returns:
+        DataFrame mit CMD CSV-Daten
+    """
+    from .cache import cached_frame
+    
     csv_files = []
     
     for filename in Config.CMD_CSV_FILES:
-        file_path = Config.INPUT_DIR / filename
-        if not file_path.exists():
-            file_path = Config.PROJECT_ROOT / filename
+        file_path = resolve_input_file(filename)
         
-        if file_path.exists():
+        if file_path is not None:
             csv_files.append(file_path)
     
     if not csv_files:
         raise FileNotFoundError("Keine CMD CSV-Dateien gefunden")
     
-    # Lade alle CSV-Dateien
-    dataframes = []
-    for file_path in csv_files:
+    if compact_dtypes is None:
+        compact_dtypes = Config.COMPACT_DTYPES
+    
+    engine = resolve_csv_engine(engine)
+    
+    variant = (f"full|cols:{sorted(columns) if columns is not None else '*'}"
+               f"|compact:{compact_dtypes}|engine:{engine}")
+    combined_data = cached_frame('cmd_csv', csv_files, variant,
+                                 lambda: _read_cmd_csv_files(csv_files, columns, compact_dtypes, engine),
+                                 use_cache)
+    print(f"📊 CMD CSV geladen: {len(combined_data):,} Zeilen")
+    
+    return combined_data
+
+def _read_cmd_csv_files(csv_files: List[Path], columns: List[str] = None,
+                        compact_dtypes: bool = False, engine: str = 'c') -> pd.DataFrame:
+    """Parse und kombiniere CMD CSV-Dateien (ohne Cache)"""
+    from concurrent.futures import ThreadPoolExecutor
+    
+    def read_file(file_path: Path) -> pd.DataFrame:
         print(f"📂 Lade CMD CSV: {file_path}")
-        df = pd.read_csv(file_path)
-        dataframes.append(df)
+        return read_csv_frame(file_path, csv_read_options(file_path, columns, compact_dtypes), engine)
+    
+    # Lade alle CSV-Dateien parallel (Reader geben den GIL beim Parsen frei),
+    # map() erhält die Reihenfolge aus Config.CMD_CSV_FILES
+    workers = max(1, min(len(csv_files), Config.CSV_LOAD_WORKERS))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        dataframes = list(executor.map(read_file, csv_files))
     
     # Kombiniere alle DataFrames
     combined_data = pd.concat(dataframes, ignore_index=True)
-    print(f"📊 CMD CSV geladen: {len(combined_data):,} Zeilen")
+    
+    if compact_dtypes:
+        combined_data = compact_frame_dtypes(combined_data)
     
     return combined_data
 
-def extract_xml_values(xml_dir: str = None) -> Dict[str, List]:
-    """Extrahiere Werte aus XML-Dateien"""
-    import xml.etree.ElementTree as ET
+def extract_xml_values(xml_dir: str = None, use_cache: bool = None,
+                       workers: int = None) -> Dict[str, List]:
+    """
+    Extrahiere Werte aus XML-Dateien
+    
+    Args:
+        xml_dir: Verzeichnis mit CMD Platform XML-Dateien
+        use_cache: Spaltenbasierten Eingabe-Cache verwenden (None = Config.USE_CACHE)
+        workers: Anzahl Prozesse (None = Config.XML_WORKERS, 0 = alle CPU-Kerne)
+    
+    Returns:
+        Dict {tag: eindeutige Werte}
+    """
+    from .cache import cached_frame, xml_values_to_frame, frame_to_xml_values
     
     if xml_dir is None:
         xml_dir = Config.INPUT_DIR / Config.CMD_XML_DIR
@@ -138,41 +629,135 @@ def extract_xml_values(xml_dir: str = None) -> Dict[str, List]:
     if not Path(xml_dir).exists():
         raise FileNotFoundError(f"XML-Verzeichnis nicht gefunden: {xml_dir}")
     
-    xml_data = {}
-    xml_files = list(Path(xml_dir).glob("*.xml"))
+    xml_files = list_xml_files(xml_dir)
+    
+    if workers is None:
+        workers = Config.XML_WORKERS
+    if workers == 0:
+        workers = os.cpu_count() or 1
     
     print(f"🔍 Extrahiere XML-Werte aus {len(xml_files)} Dateien...")
     
+    frame = cached_frame('cmd_xml', xml_files, f"values:{','.join(Config.XML_TARGET_TAGS)}",
+                         lambda: xml_values_to_frame(_parse_xml_values(xml_files, workers)),
+                         use_cache)
+    xml_data = frame_to_xml_values(frame)
+    
+    for tag in Config.XML_TARGET_TAGS:
+        print(f"   {tag}: {len(xml_data[tag]):,} Werte gefunden")
+    
+    return xml_data
+
+def _parse_xml_values(xml_files: List[Path], workers: int = 1) -> Dict[str, List]:
+    """Parse XML-Dateien und sammle eindeutige Werte je Tag (ohne Cache)"""
+    from .xml_stream import run_extract_tasks
+    
     # Relevante XML-Tags
-    target_tags = [
-        'SupplierPtNo', 'TradeNo', 'ArticleDescription_DE', 'ArticleDescription_EN',
-        'Brand', 'MinOrderQuantity', 'MaxOrderQuantity', 'GrossWeight', 'Volume', 'CategoryID'
-    ]
+    target_tags = Config.XML_TARGET_TAGS
     
-    for tag in target_tags:
-        xml_data[tag] = []
+    # dict als geordnetes Set: eindeutig und deterministisch sortiert
+    xml_data = {tag: {} for tag in target_tags}
+    failures = set()
     
-    for xml_file in xml_files:
-        try:
-            tree = ET.parse(xml_file)
-            root = tree.getroot()
-            
-            # Extrahiere Werte für jeden Tag
-            for tag in target_tags:
-                elements = root.findall(f".//{tag}")
-                for elem in elements:
-                    if elem.text and elem.text.strip():
-                        xml_data[tag].append(elem.text.strip())
+    if workers > 1:
+        print(f"⚙️ Parallele XML-Extraktion mit {workers} Prozessen")
+    
+    # Ein Streaming-Durchlauf je Datei, Zusammenführung in Dateireihenfolge
+    for file_name, file_values, elapsed, error in run_extract_tasks(xml_files, target_tags, workers):
+        if error:
+            failures.add(file_name)
+            print(f"⚠️ Fehler beim Parsen von {file_name}: {error}")
+            continue
         
-        except Exception as e:
-            print(f"⚠️ Fehler beim Parsen von {xml_file}: {e}")
+        print(f"   📄 {Path(file_name).name}: {elapsed:.2f}s")
+        for tag in target_tags:
+            xml_data[tag].update(dict.fromkeys(file_values[tag]))
     
-    # Entferne Duplikate und konvertiere zu Sets
-    for tag in target_tags:
-        xml_data[tag] = list(set(xml_data[tag]))
-        print(f"   {tag}: {len(xml_data[tag]):,} Werte gefunden")
+    if failures:
+        print(f"⚠️ {len(failures)} von {len(xml_files)} XML-Dateien fehlerhaft")
     
-    return xml_data
+    return {tag: list(values) for tag, values in xml_data.items()}
+
+def extract_xml_records(xml_dir: str = None, use_cache: bool = None,
+                        workers: int = None) -> pd.DataFrame:
+    """
+    Extrahiere eine Artikeltabelle aus XML-Dateien
+    
+    Anders als extract_xml_values bleibt die Zuordnung der Tags zum Artikel
+    erhalten: eine Zeile je Artikel, eine Spalte je Tag aus
+    Config.XML_TARGET_TAGS. Die Tabelle kann direkt als Target-DataFrame an
+    run_deterministic_matching/run_fuzzy_matching übergeben werden.
+    
+    Args:
+        xml_dir: Verzeichnis mit CMD Platform XML-Dateien
+        use_cache: Spaltenbasierten Eingabe-Cache verwenden (None = Config.USE_CACHE)
+        workers: Anzahl Prozesse (None = Config.XML_WORKERS, 0 = alle CPU-Kerne)
+    
+    Returns:
+        DataFrame mit article_id, source_file und einer Spalte je Tag
+    """
+    from .cache import cached_frame
+    
+    if xml_dir is None:
+        xml_dir = Config.INPUT_DIR / Config.CMD_XML_DIR
+        if not xml_dir.exists():
+            xml_dir = Config.PROJECT_ROOT / Config.CMD_XML_DIR
+    
+    if not Path(xml_dir).exists():
+        raise FileNotFoundError(f"XML-Verzeichnis nicht gefunden: {xml_dir}")
+    
+    xml_files = list_xml_files(xml_dir)
+    
+    if workers is None:
+        workers = Config.XML_WORKERS
+    if workers == 0:
+        workers = os.cpu_count() or 1
+    
+    print(f"🔍 Extrahiere XML-Artikel aus {len(xml_files)} Dateien...")
+    
+    records = cached_frame('cmd_xml_records', xml_files,
+                           f"records:{','.join(Config.XML_TARGET_TAGS)}",
+                           lambda: _parse_xml_records(xml_files, workers), use_cache)
+    print(f"📊 XML-Artikel: {len(records):,} Zeilen")
+    
+    return records
+
+def _parse_xml_records(xml_files: List[Path], workers: int = 1) -> pd.DataFrame:
+    """Parse XML-Dateien in eine Artikeltabelle (ohne Cache)"""
+    from .xml_stream import run_extract_tasks
+    
+    target_tags = Config.XML_TARGET_TAGS
+    columns = {'article_id': [], 'source_file': [], **{tag: [] for tag in target_tags}}
+    positions = {}
+    
+    # Shards derselben Datei kommen in Dateireihenfolge zurück
+    for file_name, file_columns, elapsed, error in run_extract_tasks(xml_files, target_tags,
+                                                                     workers, mode='records'):
+        if error:
+            print(f"⚠️ Fehler beim Parsen von {file_name}: {error}")
+            continue
+        
+        print(f"   📄 {Path(file_name).name}: {elapsed:.2f}s")
+        source = Path(file_name).name
+        offset = positions.get(source, 0)
+        
+        # Artikel ohne ID-Attribut: <Datei>:<laufende Nummer>
+        ids = file_columns['article_id']
+        columns['article_id'].extend(article_id if article_id is not None else f"{source}:{offset + i}"
+                                     for i, article_id in enumerate(ids))
+        columns['source_file'].extend([source] * len(ids))
+        for tag in target_tags:
+            columns[tag].extend(file_columns[tag])
+        positions[source] = offset + len(ids)
+    
+    records = pd.DataFrame(columns)
+    
+    # Wiederkehrende Werte (Datei, Marke, Kategorie, ...) als Kategorien
+    for col in records.columns:
+        if col != 'article_id' and len(records) and records[col].nunique() < len(records) // 2:
+            records[col] = records[col].astype('category')
+    
+    return records
 
 # =============================================================================
 # MATCHING-UTILITIES
@@ -187,14 +772,17 @@ def get_numeric_values(values: List) -> Set[int]:
             numeric_set.add(int(clean_val))
     return numeric_set
 
+def normalize_str(value, remove_punct: bool = True) -> str:
+    """Normalisiere einen Wert (ohne Punkte/Bindestriche/Leerzeichen)"""
+    if remove_punct:
+        return str(value).replace('.', '').replace('-', '').replace(' ', '').upper().strip()
+    return clean_str(value)
+
 def normalize_values(values: List, remove_punct: bool = True) -> Set[str]:
     """Normalisiere Werte (ohne Punkte/Bindestriche)"""
     normalized = set()
     for val in values:
-        if remove_punct:
-            normalized_val = str(val).replace('.', '').replace('-', '').replace(' ', '').upper().strip()
-        else:
-            normalized_val = clean_str(val)
+        normalized_val = normalize_str(val, remove_punct)
         
         if normalized_val and len(normalized_val) >= Config.MIN_STRING_LENGTH:
             normalized.add(normalized_val)
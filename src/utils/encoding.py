@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Dictionary-Encoding normalisierter Werte
+Bildet jeden eindeutigen Wert einer Target-Spalte auf eine dichte Ganzzahl-ID ab
+"""
+
+from typing import Hashable, Iterable, List
+import numpy as np
+
+# =============================================================================
+# WERTE-WÖRTERBUCH
+# =============================================================================
+
+class ValueDictionary:
+    """
+    Wörterbuch Wert → ID einer Target-Spalte
+
+    Die Target-Werte werden einmal kodiert; TecDoc-Chunks schlagen ihre
+    Werte nur nach (lookup_set) und tragen nichts ein, da unbekannte Werte
+    ohnehin keinen Treffer ergeben. Das Wörterbuch wächst daher nicht mit
+    der Zahl der Chunks und wird mit der Target-Spalte freigegeben.
+    Schnittmengen werden als sortierte int32-Arrays (4 Bytes je Wert) mit
+    np.intersect1d gebildet.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._values = []
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, value: Hashable) -> bool:
+        return value in self._ids
+
+    def encode(self, values: Iterable[Hashable]) -> np.ndarray:
+        """IDs der Werte (gleiche Reihenfolge, neue Werte erhalten neue IDs)"""
+        if not isinstance(values, list):
+            values = list(values)
+
+        ids = self._ids
+        new_values = [value for value in values if value not in ids]
+        if new_values:
+            # Unbekannte Werte gesammelt eintragen (Duplikate nur einmal)
+            new_values = list(dict.fromkeys(new_values))
+            ids.update(zip(new_values, range(len(self._values), len(self._values) + len(new_values))))
+            self._values.extend(new_values)
+
+        if len(self._values) > np.iinfo(np.int32).max:
+            raise OverflowError("Zu viele eindeutige Werte für int32-IDs")
+        return np.fromiter(map(ids.__getitem__, values), dtype=np.int32, count=len(values))
+
+    def encode_set(self, values: Iterable[Hashable]) -> np.ndarray:
+        """Sortierte, eindeutige IDs einer Wertemenge (Eingabe für np.intersect1d)"""
+        ids = np.sort(self.encode(values))
+        if isinstance(values, (set, frozenset)) or len(ids) < 2:
+            return ids
+        return ids[np.concatenate(([True], ids[1:] != ids[:-1]))]
+
+    def lookup_set(self, values: Iterable[Hashable]) -> np.ndarray:
+        """Sortierte, eindeutige IDs der bekannten Werte (unbekannte entfallen, nichts wird eingetragen)"""
+        ids = self._ids
+        return np.unique(np.fromiter((ids[value] for value in values if value in ids), dtype=np.int32))
+
+    def decode(self, ids: Iterable[int]) -> List[Hashable]:
+        """Werte zu IDs"""
+        return [self._values[value_id] for value_id in ids]
+
+def intersect_ids(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    """Schnittmenge zweier sortierter, eindeutiger ID-Arrays"""
+    return np.intersect1d(left, right, assume_unique=True)
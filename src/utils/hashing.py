@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Gehashte String-Schlüssel als NumPy-Arrays
+Werte einer StringArena werden vektorisiert zu uint64-Hashes, Kollisionen byteweise geprüft
+"""
+
+from typing import List, Tuple
+import numpy as np
+
+from .arena import StringArena
+
+_HASH_BASE = 0x100000001B3
+_LENGTH_MIX = 0x9E3779B97F4A7C15
+
+class HashCollision(ValueError):
+    """Zwei verschiedene Werte einer Seite haben denselben Hash"""
+
+# =============================================================================
+# HASHES
+# =============================================================================
+
+def string_hashes(arena: StringArena) -> np.ndarray:
+    """
+    Polynom-Hash je Wert über die UTF-8-Bytes (modulo 2^64, prozessunabhängig)
+
+    h = Σ (byte_k + 1) · B^k mit k als Position im Wert, als Segmentsumme
+    über alle Bytes der Arena ohne Python-Schleife über die Werte. Die
+    Länge wird zusätzlich eingemischt.
+    """
+    offsets = arena.offsets.astype(np.int64)
+    data = arena.data[offsets[0]:offsets[-1]]
+    starts, lengths = offsets[:-1] - offsets[0], np.diff(offsets)
+    if not len(data):
+        return lengths.astype(np.uint64) * np.uint64(_LENGTH_MIX)
+
+    with np.errstate(over='ignore'):
+        powers = np.ones(int(lengths.max()), dtype=np.uint64)
+        np.cumprod(np.full(len(powers) - 1, _HASH_BASE, dtype=np.uint64), out=powers[1:])
+        positions = np.arange(len(data)) - np.repeat(starts, lengths)
+        # Abschließende 0, damit auch Segmente am Ende gültige Startindizes haben
+        terms = np.append((data.astype(np.uint64) + np.uint64(1)) * powers[positions], np.uint64(0))
+        hashes = np.add.reduceat(terms, starts)
+        hashes[lengths == 0] = 0
+        return hashes ^ (lengths.astype(np.uint64) * np.uint64(_LENGTH_MIX))
+
+def _same_bytes(left: StringArena, left_rows: np.ndarray,
+                right: StringArena, right_rows: np.ndarray) -> np.ndarray:
+    """Maske der Paare (left[i], right[j]) mit identischen Bytes"""
+    left_lengths = left.offsets[left_rows + 1] - left.offsets[left_rows]
+    right_lengths = right.offsets[right_rows + 1] - right.offsets[right_rows]
+    same = left_lengths == right_lengths
+    rows = np.flatnonzero(same)
+    lengths = left_lengths[rows].astype(np.int64)
+    if not lengths.sum():
+        return same
+
+    # Byte-Positionen aller Paare gleicher Länge, Vergleich in einem Schritt
+    pair = np.repeat(np.arange(len(rows)), lengths)
+    within = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    differs = (left.data[left.offsets[left_rows[rows]].astype(np.int64)[pair] + within]
+               != right.data[right.offsets[right_rows[rows]].astype(np.int64)[pair] + within])
+    same[rows[np.unique(pair[differs])]] = False
+    return same
+
+# =============================================================================
+# GEHASHTE MENGEN
+# =============================================================================
+
+class HashedSet:
+    """
+    Eindeutige Werte als sortierte uint64-Hashes plus Arena-Zeile je Hash
+
+    Gleiche Hashes verschiedener Werte werden byteweise erkannt: innerhalb
+    einer Seite mit HashCollision (der Aufrufer nutzt dann String-Mengen),
+    zwischen zwei Seiten zählt ein gemeinsamer Hash nur bei gleichen Bytes.
+    Das Ergebnis entspricht damit exakt dem Schnitt der String-Mengen.
+    """
+
+    def __init__(self, codes: np.ndarray, rows: np.ndarray, arena: StringArena):
+        self.codes = codes
+        self.rows = rows
+        self.arena = arena
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    @classmethod
+    def from_arena(cls, arena: StringArena) -> 'HashedSet':
+        """Eindeutige Werte einer Arena (Duplikate erlaubt)"""
+        hashes = string_hashes(arena)
+        order = np.argsort(hashes)
+        hashes = hashes[order]
+        first = np.ones(len(hashes), dtype=bool)
+        first[1:] = hashes[1:] != hashes[:-1]
+
+        # Jeder Wert muss byteweise seinem Gruppenvertreter gleichen
+        groups = np.cumsum(first) - 1
+        rows = order[first]
+        duplicates = np.flatnonzero(~first)
+        if len(duplicates) and not _same_bytes(arena, order[duplicates],
+                                               arena, rows[groups[duplicates]]).all():
+            raise HashCollision("Hash-Kollision innerhalb einer Wertemenge")
+        return cls(hashes[first], rows, arena)
+
+    def intersect(self, other: 'HashedSet', examples: int = 5) -> Tuple[int, List[str]]:
+        """Größe des Schnitts und bis zu examples gemeinsame Werte"""
+        _, mine, theirs = np.intersect1d(self.codes, other.codes, assume_unique=True,
+                                         return_indices=True)
+        same = _same_bytes(self.arena, self.rows[mine], other.arena, other.rows[theirs])
+        common = self.rows[mine[same]]
+        return len(common), [self.arena[row] for row in common[:examples].tolist()]
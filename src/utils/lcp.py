@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Längste gemeinsame Präfixe sortierter Werte
+Gemeinsame Präfixe zweier Wertemengen für alle Längen in einem Merge-Durchlauf
+"""
+
+from typing import Dict, Iterable, List, Tuple
+import numpy as np
+
+# =============================================================================
+# LCP-ARRAY
+# =============================================================================
+
+def adjacent_lcp(values: List[str], max_length: int) -> np.ndarray:
+    """
+    Länge des gemeinsamen Präfixes je Nachbarpaar einer sortierten Liste
+
+    Verglichen werden höchstens max_length Zeichen (als Code-Point-Matrix);
+    Eintrag i gehört zum Paar values[i], values[i + 1].
+    """
+    if len(values) < 2 or max_length <= 0:
+        return np.zeros(max(len(values) - 1, 0), dtype=np.int64)
+
+    points = np.array(values, dtype=f'U{max_length}').view(np.uint32).reshape(len(values), max_length)
+    equal = points[1:] == points[:-1]
+    lcp = np.where(equal.all(axis=1), max_length, equal.argmin(axis=1))
+    # Auffüllung hinter dem Wertende zählt nicht (auch bei Werten mit '\0')
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    return np.minimum(lcp, np.minimum(lengths[1:], lengths[:-1]))
+
+# =============================================================================
+# GEMEINSAME PRÄFIXE JE LÄNGE
+# =============================================================================
+
+def common_prefix_counts(left: List[str], right: List[str], lengths: Iterable[int],
+                         examples: int = 5) -> Dict[int, Tuple[int, List[str]]]:
+    """
+    Anzahl gemeinsamer Präfixe je Länge zweier sortierter, eindeutiger Wertelisten
+
+    Beide Listen werden zusammengeführt (Timsort erkennt die zwei sortierten
+    Läufe und mischt sie linear). Werte mit gleichem Präfix der Länge L
+    liegen dann nebeneinander; eine Gruppe beginnt, wo das LCP zum
+    Vorgänger kleiner als L ist. Gemeinsam ist ein Präfix, wenn seine
+    Gruppe Werte beider Seiten enthält. Das Ergebnis entspricht je Länge
+    len(prefixes(L) & prefixes(L)) der beiden Seiten.
+
+    Returns:
+        Dict Länge → (Anzahl gemeinsamer Präfixe, bis zu examples Präfixe)
+    """
+    lengths = list(lengths)
+    if not left or not right:
+        return {length: (0, []) for length in lengths}
+
+    values = left + right
+    order = sorted(range(len(values)), key=values.__getitem__)
+    merged = [values[pos] for pos in order]
+    from_left = np.array(order, dtype=np.int64) < len(left)
+
+    value_lengths = np.fromiter(map(len, merged), dtype=np.int64, count=len(merged))
+    lcp = adjacent_lcp(merged, max(lengths, default=0))
+
+    counts = {}
+    for length in lengths:
+        starts = np.concatenate(([True], lcp < length))
+        groups = np.cumsum(starts) - 1
+        long_enough = value_lengths >= length
+
+        has_left = np.zeros(groups[-1] + 1, dtype=bool)
+        has_right = has_left.copy()
+        has_left[groups[long_enough & from_left]] = True
+        has_right[groups[long_enough & ~from_left]] = True
+        common = np.flatnonzero(has_left & has_right)
+
+        first_rows = np.flatnonzero(starts)[common[:examples]]
+        counts[length] = (len(common), [merged[row][:length] for row in first_rows.tolist()])
+    return counts
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Byte-Offset-Zeilenindex für die TecDoc-CSV
+Ermöglicht zufällige und nach brandno geschichtete Stichproben ohne Volllesen der Datei
+"""
+
+import io
+from pathlib import Path
+from typing import Dict, Union
+import numpy as np
+import pandas as pd
+
+from .core import Config, open_input
+
+# =============================================================================
+# ZEILENINDEX
+# =============================================================================
+
+class CsvLineIndex:
+    """
+    Byte-Bereiche aller Datenzeilen einer CSV-Datei plus Schichtungsspalte
+
+    starts/ends enthalten je Datenzeile (ohne Header und Leerzeilen) den
+    Byte-Bereich, strata den Schichtcode (pd.factorize der Schichtungsspalte,
+    fehlende Werte = -1). Der Index setzt
+    voraus, dass Felder keine Zeilenumbrüche in Anführungszeichen enthalten.
+    """
+
+    SUFFIX = ".lineidx.npz"
+
+    def __init__(self, header: bytes, starts: np.ndarray, ends: np.ndarray,
+                 strata: np.ndarray = None):
+        self.header = header
+        self.starts = starts
+        self.ends = ends
+        self.strata = strata
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    @classmethod
+    def build(cls, file_path: Union[str, Path], stratify_column: str = None,
+              block_size: int = 16 * 1024 ** 2) -> 'CsvLineIndex':
+        """
+        Erzeuge den Index mit einem blockweisen Newline-Scan
+
+        Bei komprimierten Dateien beziehen sich die Offsets auf den
+        dekomprimierten Stream; gelesen wird dann per Vorwärts-Seek. Die
+        Schichtungsspalte wird im selben Durchlauf aus den vollständigen
+        Zeilen jedes Blocks gelesen (als String, damit die Codes über alle
+        Blöcke übereinstimmen).
+        """
+        starts = [np.zeros(1, dtype=np.int64)]
+        position = 0
+        head = b''
+        column_header = None
+        pending = b''
+        column_values = []
+
+        with open_input(file_path) as f:
+            while True:
+                block = f.read(block_size)
+                if not block:
+                    break
+                if position == 0:
+                    head = block
+                newlines = np.flatnonzero(np.frombuffer(block, dtype=np.uint8) == 10)
+                starts.append(newlines.astype(np.int64) + position + 1)
+                position += len(block)
+
+                if stratify_column:
+                    pending += block
+                    if column_header is None:
+                        first = pending.find(b'\n')
+                        if first < 0:
+                            continue
+                        column_header, pending = pending[:first + 1], pending[first + 1:]
+                    cut = pending.rfind(b'\n') + 1
+                    if cut:
+                        column_values.append(_column_values(column_header, pending[:cut],
+                                                            stratify_column))
+                        pending = pending[cut:]
+
+        if stratify_column and column_header is not None and pending.strip():
+            column_values.append(_column_values(column_header, pending + b'\n', stratify_column))
+
+        starts = np.concatenate(starts)
+        if starts[-1] < position:
+            # Letzte Zeile ohne abschließenden Zeilenumbruch
+            starts = np.append(starts, position)
+
+        header = head[:int(starts[1])] if len(starts) > 1 else b''
+
+        # Erste Zeile = Header; leere Zeilen überspringt auch pandas
+        line_starts, line_ends = starts[1:-1], starts[2:]
+        keep = (line_ends - line_starts) > 2
+        if not keep.all():
+            short = np.flatnonzero(~keep)
+            with open_input(file_path) as f:
+                for i in short:
+                    f.seek(int(line_starts[i]))
+                    if f.read(int(line_ends[i] - line_starts[i])).strip():
+                        keep[i] = True
+        row_starts, row_ends = line_starts[keep], line_ends[keep]
+
+        strata = None
+        if stratify_column:
+            values = (np.concatenate(column_values) if column_values
+                      else np.zeros(0, dtype=object))
+            if len(values) == len(row_starts):
+                strata = pd.factorize(values)[0].astype(np.int64)
+            else:
+                print(f"⚠️ Zeilenindex: {len(values):,} Werte für {len(row_starts):,} Zeilen "
+                      f"(Zeilenumbrüche in Feldern?) - keine Schichtung möglich")
+
+        return cls(header, row_starts, row_ends, strata)
+
+    @classmethod
+    def load_or_build(cls, file_path: Union[str, Path],
+                      stratify_column: str = None) -> 'CsvLineIndex':
+        """Lade den Sidecar-Index aus dem Cache-Verzeichnis oder erzeuge ihn"""
+        from .cache import sources_fingerprint
+
+        file_path = Path(file_path)
+        name = f"{file_path.stem}-{stratify_column or 'none'}"
+        sidecar = Config.CACHE_DIR / f"{name}-{sources_fingerprint([file_path])}{cls.SUFFIX}"
+
+        if sidecar.exists():
+            with np.load(sidecar) as stored:
+                return cls(stored['header'].tobytes(), stored['starts'], stored['ends'],
+                           stored['strata'] if 'strata' in stored else None)
+
+        print(f"🗂️ Erzeuge Zeilenindex für {file_path.name}...")
+        index = cls.build(file_path, stratify_column)
+
+        Config.CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        for stale in Config.CACHE_DIR.glob(f"{name}-*{cls.SUFFIX}"):
+            stale.unlink(missing_ok=True)
+        arrays = {'header': np.frombuffer(index.header, dtype=np.uint8),
+                  'starts': index.starts, 'ends': index.ends}
+        if index.strata is not None:
+            arrays['strata'] = index.strata
+        np.savez(sidecar, **arrays)
+
+        return index
+
+    # -------------------------------------------------------------------------
+    # STICHPROBEN
+    # -------------------------------------------------------------------------
+
+    def sample_rows(self, n: int, strategy: str = 'random', seed: int = None) -> np.ndarray:
+        """
+        Ziehe Zeilennummern (aufsteigend sortiert)
+
+        Args:
+            n: Stichprobengröße
+            strategy: 'random' (gleichverteilt) oder 'stratified' (proportional
+                je Schicht, siehe stratum_quotas)
+            seed: Zufalls-Seed
+
+        Returns:
+            Genau min(n, len(self)) Zeilennummern
+        """
+        rng = np.random.default_rng(seed)
+        total = len(self)
+        n = min(n, total)
+
+        if strategy == 'stratified' and self.strata is not None:
+            order = np.argsort(self.strata, kind='stable')
+            _, group_starts, group_sizes = np.unique(self.strata[order], return_index=True,
+                                                     return_counts=True)
+            quotas = stratum_quotas(group_sizes, n)
+            rows = [rng.choice(order[start:start + size], size=quota, replace=False)
+                    for start, size, quota in zip(group_starts, group_sizes, quotas)]
+            return np.sort(np.concatenate(rows))
+
+        if strategy == 'stratified':
+            print("⚠️ Keine Schichtungsspalte im Index - verwende Zufallsstichprobe")
+
+        return np.sort(rng.choice(total, size=n, replace=False))
+
+    def read_rows(self, file_path: Union[str, Path], rows: np.ndarray,
+                  read_options: Dict = None) -> pd.DataFrame:
+        """Lese die angegebenen Zeilen per Seek (aufsteigend, nur vorwärts) und parse sie als CSV"""
+        parts = [self.header]
+        with open_input(file_path) as f:
+            for row in np.sort(rows):
+                start, end = int(self.starts[row]), int(self.ends[row])
+                f.seek(start)
+                line = f.read(end - start)
+                parts.append(line if line.endswith(b'\n') else line + b'\n')
+
+        return pd.read_csv(io.BytesIO(b''.join(parts)), **(read_options or {}))
+
+def stratum_quotas(group_sizes: np.ndarray, n: int) -> np.ndarray:
+    """
+    Zeilen je Schicht für eine geschichtete Stichprobe von genau n Zeilen
+
+    Proportionale Aufteilung nach größtem Rest, jede Schicht erhält
+    mindestens eine Zeile. Die dafür zusätzlich nötigen Zeilen werden den
+    Schichten mit dem größten Überschuss über ihren exakten Anteil wieder
+    abgezogen. Gibt es mehr Schichten als n, erhalten nur die n größten
+    (bei Gleichstand die früheren) je eine Zeile. Die Summe ist immer
+    min(n, Zeilen).
+    """
+    group_sizes = np.asarray(group_sizes, dtype=np.int64)
+    total = int(group_sizes.sum())
+    n = min(n, total)
+
+    if n <= len(group_sizes):
+        quotas = np.zeros(len(group_sizes), dtype=np.int64)
+        quotas[np.argsort(-group_sizes, kind='stable')[:n]] = 1
+        return quotas
+
+    exact = group_sizes * n / total
+    quotas = np.floor(exact).astype(np.int64)
+    remainder = n - int(quotas.sum())
+    quotas[np.argsort(quotas - exact, kind='stable')[:remainder]] += 1
+    quotas = np.maximum(quotas, 1)
+    for _ in range(int(quotas.sum()) - n):
+        surplus = np.where(quotas > 1, quotas - exact, -np.inf)
+        quotas[np.argmax(surplus)] -= 1
+    return quotas
+
+def _column_values(header: bytes, lines: bytes, column: str) -> np.ndarray:
+    """Werte einer Spalte aus vollständigen CSV-Zeilen (als String, fehlend = NaN)"""
+    frame = pd.read_csv(io.BytesIO(header + lines), usecols=[column], dtype={column: str})
+    return frame[column].to_numpy(dtype=object)
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Vektorisierte Normalisierung ganzer Spalten
+Spaltenweise Gegenstücke zu clean_str, normalize_values und get_numeric_values mit konfigurierbaren Profilen
+"""
+
+import unicodedata
+from typing import Dict, Iterable, List, Set, Tuple, Union
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+from .arena import StringArena
+from .core import Config
+
+# Zeichen, die str.strip() im ASCII-Bereich entfernt
+_ASCII_WHITESPACE = ' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'
+
+_UMLAUT_TABLE = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'Ä': 'AE', 'Ö': 'OE',
+                               'Ü': 'UE', 'ß': 'ss', 'ẞ': 'SS'})
+
+# =============================================================================
+# PROFILE
+# =============================================================================
+
+def get_profile(profile: Union[str, Dict] = None) -> Dict:
+    """
+    Normalisierungsprofil aus Config.NORMALIZATION_PROFILES
+
+    Ein Profil ist ein Dict mit remove_chars (zu löschende Zeichen),
+    nfkc (Unicode-NFKC) und fold_umlauts (ä → AE, ß → SS). Danach wird
+    immer in Großbuchstaben gewandelt und Leerraum an den Rändern entfernt.
+    """
+    if profile is None:
+        profile = Config.NORMALIZATION_PROFILE
+    if isinstance(profile, dict):
+        return profile
+    if profile not in Config.NORMALIZATION_PROFILES:
+        raise ValueError(f"Unbekanntes Normalisierungsprofil: {profile}")
+    return Config.NORMALIZATION_PROFILES[profile]
+
+# =============================================================================
+# NORMALISIERUNG
+# =============================================================================
+
+def _normalize_python(texts: List[str], profile: Dict) -> List[str]:
+    """Referenzpfad in Python (gleiche Reihenfolge wie normalize_str)"""
+    remove_chars = profile.get('remove_chars', '')
+    nfkc = profile.get('nfkc', False)
+    fold_umlauts = profile.get('fold_umlauts', False)
+
+    result = []
+    for text in texts:
+        if not text.isascii():
+            if nfkc:
+                text = unicodedata.normalize('NFKC', text)
+            if fold_umlauts:
+                text = text.translate(_UMLAUT_TABLE)
+        for char in remove_chars:
+            text = text.replace(char, '')
+        result.append(text.upper().strip())
+    return result
+
+def _normalize_arrow(texts: Union[List[str], 'pa.Array'], profile: Dict) -> 'pa.Array':
+    """
+    Arrow-Kernels für reine ASCII-Werte, Python-Pfad für den Rest
+
+    Für ASCII-Text sind NFKC und Umlaut-Faltung wirkungslos und Arrow
+    liefert bei Groß-/Kleinschreibung und Leerraum dieselben Ergebnisse
+    wie str; Sonderfälle wie 'ß'.upper() == 'SS' bleiben so exakt.
+    """
+    array = texts if isinstance(texts, (pa.Array, pa.ChunkedArray)) else pa.array(texts, type=pa.string())
+    is_ascii = pc.string_is_ascii(array)
+
+    if not pc.all(is_ascii).as_py():
+        ascii_rows = np.asarray(is_ascii.to_numpy(zero_copy_only=False), dtype=bool)
+        result = np.empty(len(array), dtype=object)
+        result[~ascii_rows] = _normalize_python(pc.filter(array, pc.invert(is_ascii)).to_pylist(),
+                                                profile)
+        if ascii_rows.any():
+            result[ascii_rows] = _normalize_arrow(pc.filter(array, is_ascii),
+                                                  profile).to_numpy(zero_copy_only=False)
+        return pa.array(result, type=pa.string())
+
+    for char in profile.get('remove_chars', ''):
+        array = pc.replace_substring(array, char, '')
+    return pc.utf8_trim(pc.ascii_upper(array), _ASCII_WHITESPACE)
+
+def _to_text(values: Iterable) -> pd.Series:
+    """Werte als object-Series (fehlende Werte bleiben NaN)"""
+    if isinstance(values, pd.Series):
+        return values.astype(object)
+    if isinstance(values, pd.Index):
+        return pd.Series(values.to_numpy(dtype=object), dtype=object)
+    return pd.Series(values if isinstance(values, (list, np.ndarray)) else list(values),
+                     dtype=object)
+
+def _present_texts(series: pd.Series) -> List[str]:
+    """String-Darstellung der vorhandenen Werte (wie str() in clean_str)"""
+    return [str(value) for value in series.to_numpy()[series.notna().to_numpy()]]
+
+def _value_texts(values: Iterable) -> Union[List[str], 'pa.Array']:
+    """Vorhandene Werte als Text; eine StringArena wird direkt als Arrow-Array genutzt"""
+    if isinstance(values, StringArena):
+        return values.to_arrow() if PYARROW_AVAILABLE else values.tolist()
+    return _present_texts(_to_text(values))
+
+def normalize_series(values: Iterable, profile: Union[str, Dict] = None) -> pd.Series:
+    """
+    Normalisiere eine ganze Spalte in einem Durchlauf
+
+    Profil 'clean' entspricht clean_str, Profil 'punct' normalize_str
+    (ohne Punkte/Bindestriche/Leerzeichen). Fehlende Werte werden zu ''.
+    Bei kategorischen Spalten werden nur die Kategorien normalisiert.
+
+    Args:
+        values: Series, Liste oder Array
+        profile: Profilname oder Profil-Dict (None = Config.NORMALIZATION_PROFILE)
+
+    Returns:
+        object-Series gleicher Länge (Index bleibt bei Series erhalten)
+    """
+    profile = get_profile(profile)
+
+    if isinstance(values, pd.Series) and isinstance(values.dtype, pd.CategoricalDtype):
+        # Code -1 (fehlend) greift auf das angehängte '' zu
+        categories = np.append(normalize_series(values.cat.categories, profile).to_numpy(dtype=object), '')
+        return pd.Series(categories[values.cat.codes.to_numpy()], index=values.index, dtype=object)
+
+    if isinstance(values, StringArena):
+        # Arena enthält nur vorhandene Werte
+        texts = _value_texts(values)
+        if PYARROW_AVAILABLE and len(texts):
+            return pd.Series(_normalize_arrow(texts, profile).to_numpy(zero_copy_only=False), dtype=object)
+        return pd.Series(_normalize_python(texts, profile), dtype=object)
+
+    series = _to_text(values)
+    texts = _present_texts(series)
+
+    if PYARROW_AVAILABLE and texts:
+        normalized = _normalize_arrow(texts, profile).to_numpy(zero_copy_only=False)
+    else:
+        normalized = _normalize_python(texts, profile)
+
+    result = np.full(len(series), '', dtype=object)
+    result[series.notna().to_numpy()] = normalized
+    return pd.Series(result, index=series.index, dtype=object)
+
+def clean_series(values: Iterable) -> pd.Series:
+    """Spaltenweises clean_str (fehlende Werte → '')"""
+    return normalize_series(values, 'clean')
+
+def normalized_value_set(values: Iterable, profile: Union[str, Dict] = 'punct',
+                         min_length: int = None) -> Set[str]:
+    """
+    Spaltenweises normalize_values: eindeutige normalisierte Werte
+
+    Mit pyarrow werden Normalisierung und Längenfilter als Arrow-Kernels
+    ausgeführt. Fehlende Werte werden ignoriert.
+    """
+    if min_length is None:
+        min_length = Config.MIN_STRING_LENGTH
+    profile = get_profile(profile)
+    texts = _value_texts(values)
+
+    if PYARROW_AVAILABLE and len(texts):
+        normalized = _normalize_arrow(texts, profile)
+        long_enough = pc.greater_equal(pc.utf8_length(normalized), min_length)
+        return set(pc.filter(normalized, long_enough).to_pylist())
+
+    return {value for value in _normalize_python(set(texts), profile) if len(value) >= min_length}
+
+def numeric_value_set(values: Iterable) -> Set[int]:
+    """
+    Spaltenweises get_numeric_values: Ganzzahlen aus reinen Ziffernfolgen
+
+    ASCII-Ziffernfolgen bis 18 Stellen werden mit pyarrow vektorisiert
+    umgewandelt, alle übrigen per str.isdigit/int(). Nicht-ASCII-Ziffern,
+    die int() ablehnt (z.B. '²'), werden übersprungen.
+    """
+    texts = _value_texts(values)
+    numbers = set()
+
+    if PYARROW_AVAILABLE and len(texts):
+        cleaned = _normalize_arrow(texts, get_profile('clean'))
+        short_digits = pc.match_substring_regex(cleaned, '^[0-9]{1,18}$')
+        numbers.update(pc.cast(pc.filter(cleaned, short_digits), pa.int64()).to_pylist())
+        remaining = pc.filter(cleaned, pc.invert(short_digits)).to_pylist()
+    else:
+        remaining = _normalize_python(set(texts), get_profile('clean'))
+
+    for text in remaining:
+        if text.isdigit():
+            try:
+                numbers.add(int(text))
+            except ValueError:
+                continue
+
+    return numbers
+
+# =============================================================================
+# ARRAY-VARIANTEN (NumPy-Backend der Matcher)
+# =============================================================================
+
+def normalized_arena(values: Iterable, profile: Union[str, Dict] = 'punct',
+                     min_length: int = 1) -> StringArena:
+    """
+    Normalisierte Werte ab min_length Zeichen als StringArena (Duplikate bleiben)
+
+    Mit pyarrow wird das Ergebnis der Arrow-Kernels ohne Kopie übernommen.
+    Als Menge entspricht es normalized_value_set (Profil 'clean' und
+    min_length=1: den nicht leeren clean_str-Werten).
+    """
+    profile = get_profile(profile)
+    texts = _value_texts(values)
+
+    if PYARROW_AVAILABLE and len(texts):
+        normalized = _normalize_arrow(texts, profile)
+        long_enough = pc.greater_equal(pc.utf8_length(normalized), min_length)
+        return StringArena.from_arrow(pc.filter(normalized, long_enough))
+
+    return StringArena.from_values(value for value in _normalize_python(texts, profile)
+                                   if len(value) >= min_length)
+
+def numeric_value_array(values: Iterable) -> Tuple[np.ndarray, Set[int]]:
+    """
+    numeric_value_set als sortiertes, eindeutiges int64-Array plus Restmenge
+
+    Ganzzahlen außerhalb des int64-Bereichs (mehr als 18 Stellen) bleiben
+    als Python-Menge.
+    """
+    texts = _value_texts(values)
+    parts = [np.zeros(0, dtype=np.int64)]
+
+    if PYARROW_AVAILABLE and len(texts):
+        cleaned = _normalize_arrow(texts, get_profile('clean'))
+        short_digits = pc.match_substring_regex(cleaned, '^[0-9]{1,18}$')
+        parts.append(pc.cast(pc.filter(cleaned, short_digits), pa.int64()).to_numpy(zero_copy_only=False))
+        # Übrige ASCII-Werte sind nur als lange Ziffernfolge Zahlen (str.isdigit)
+        candidates = pc.and_(pc.invert(short_digits),
+                             pc.or_(pc.invert(pc.string_is_ascii(cleaned)),
+                                    pc.match_substring_regex(cleaned, '^[0-9]+$')))
+        remaining = pc.filter(cleaned, candidates).to_pylist()
+    else:
+        remaining = _normalize_python(set(texts), get_profile('clean'))
+
+    limit = np.iinfo(np.int64).max
+    small, rest = [], set()
+    for text in remaining:
+        if text.isdigit():
+            try:
+                number = int(text)
+            except ValueError:
+                continue
+            if number <= limit:
+                small.append(number)
+            else:
+                rest.add(number)
+    parts.append(np.array(small, dtype=np.int64))
+
+    numbers = np.sort(np.concatenate(parts))
+    if len(numbers) > 1:
+        numbers = numbers[np.concatenate(([True], numbers[1:] != numbers[:-1]))]
+    return numbers, rest
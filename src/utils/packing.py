@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Gepackte uint64-Codes für kurze Artikelnummern
+Normalisierte Werte aus 0-9/A-Z mit höchstens 12 Zeichen werden als Basis-37-Zahl in uint64 kodiert
+"""
+
+from typing import Callable, Iterable, List, Set, Tuple
+import numpy as np
+
+PACK_ALPHABET = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+PACK_BASE = len(PACK_ALPHABET) + 1  # Symbol 0 = Auffüllung hinter dem Wertende
+MAX_PACKED_LENGTH = 12  # 37^12 < 2^64
+
+_POWERS = np.array([PACK_BASE ** i for i in range(MAX_PACKED_LENGTH + 1)], dtype=np.uint64)
+
+# Code Point → Symbol (1..36), -1 für nicht packbare Zeichen
+_SYMBOLS = np.full(128, -1, dtype=np.int64)
+for _symbol, _char in enumerate(PACK_ALPHABET, start=1):
+    _SYMBOLS[ord(_char)] = _symbol
+
+# =============================================================================
+# PACKEN / ENTPACKEN
+# =============================================================================
+
+def pack_values(values: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Packe Strings linksbündig in uint64 (Zeichen i hat Gewicht 37^(11-i))
+
+    Die Codes sind eindeutig und sortieren wie die Strings; ein Präfix der
+    Länge L ist code // 37^(12-L) * 37^(12-L).
+
+    Returns:
+        (codes, packbar): Codes als uint64 (0 für nicht packbare Werte) und
+        Maske der packbaren Werte (1-12 Zeichen aus 0-9/A-Z)
+    """
+    if not isinstance(values, list):
+        values = list(values)
+    if not values:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=bool)
+
+    lengths = np.fromiter(map(len, values), dtype=np.int64, count=len(values))
+    # Eine Spalte mehr, damit zu lange Werte erkennbar bleiben
+    points = np.array(values, dtype=f'U{MAX_PACKED_LENGTH + 1}').view(np.uint32)
+    points = points.reshape(len(values), MAX_PACKED_LENGTH + 1)[:, :MAX_PACKED_LENGTH]
+
+    symbols = np.where(points < 128, _SYMBOLS[np.minimum(points, 127)], -1)
+    in_value = np.arange(MAX_PACKED_LENGTH) < lengths[:, None]
+    packable = ((lengths >= 1) & (lengths <= MAX_PACKED_LENGTH)
+                & ~((symbols < 0) & in_value).any(axis=1))
+    symbols = np.where(in_value & packable[:, None], symbols, 0).astype(np.uint64)
+
+    codes = np.zeros(len(values), dtype=np.uint64)
+    for column in range(MAX_PACKED_LENGTH):
+        codes = codes * np.uint64(PACK_BASE) + symbols[:, column]
+    return codes, packable
+
+def unpack_codes(codes: Iterable[int]) -> List[str]:
+    """Strings zu linksbündigen Codes"""
+    values = []
+    for code in codes:
+        code, chars = int(code), []
+        for power in range(MAX_PACKED_LENGTH - 1, -1, -1):
+            symbol = code // PACK_BASE ** power % PACK_BASE
+            if symbol == 0:
+                break
+            chars.append(PACK_ALPHABET[symbol - 1])
+        values.append(''.join(chars))
+    return values
+
+def unpack_integers(codes: Iterable[int]) -> List[int]:
+    """Ganzzahlen zu int64-Codes"""
+    return [int(code) for code in codes]
+
+def packed_lengths(codes: np.ndarray) -> np.ndarray:
+    """Zeichenanzahl je Code (Anzahl Stellen vor der Auffüllung)"""
+    lengths = np.zeros(len(codes), dtype=np.int64)
+    for length in range(1, MAX_PACKED_LENGTH + 1):
+        # Stelle length-1 ist belegt, wenn der Rest ab dort nicht 0 ist
+        lengths += (codes % _POWERS[MAX_PACKED_LENGTH - length + 1]) >= _POWERS[MAX_PACKED_LENGTH - length]
+    return lengths
+
+def prefix_codes(codes: np.ndarray, length: int) -> np.ndarray:
+    """Präfix-Codes der Länge length aller ausreichend langen Codes (linksbündig)"""
+    scale = _POWERS[MAX_PACKED_LENGTH - length]
+    codes = codes[packed_lengths(codes) >= length]
+    return codes // scale * scale
+
+def suffix_codes(codes: np.ndarray, length: int) -> np.ndarray:
+    """Suffix-Codes der Länge length aller ausreichend langen Codes (linksbündig)"""
+    lengths = packed_lengths(codes)
+    long_enough = lengths >= length
+    codes, lengths = codes[long_enough], lengths[long_enough]
+    # Rechtsbündig verschieben, letzte length Stellen behalten, wieder linksbündig
+    right_aligned = codes // _POWERS[MAX_PACKED_LENGTH - lengths]
+    return right_aligned % _POWERS[length] * _POWERS[MAX_PACKED_LENGTH - length]
+
+def sorted_unique(codes: np.ndarray) -> np.ndarray:
+    """Sortierte, eindeutige Codes"""
+    codes = np.sort(codes)
+    if len(codes) < 2:
+        return codes
+    return codes[np.concatenate(([True], codes[1:] != codes[:-1]))]
+
+# =============================================================================
+# GEPACKTE MENGEN
+# =============================================================================
+
+class PackedSet:
+    """
+    Wertemenge als sortierte Ganzzahl-Codes plus Restmenge
+
+    Packbare Werte liegen als sortiertes uint64- bzw. int64-Array vor,
+    die seltenen übrigen (lange Werte, Sonderzeichen, sehr große Zahlen)
+    als gewöhnliche Menge. Ein packbarer Wert kann nie einem Restwert
+    gleichen, daher ergibt sich der Schnitt zweier Mengen aus dem
+    Merge-Join der Codes und dem Schnitt der Restmengen.
+    """
+
+    def __init__(self, codes: np.ndarray, rest: Set, decode: Callable = None):
+        self.codes = codes
+        self.rest = rest
+        # Codes → Werte (modulweite Funktion bzw. partial, damit die Menge picklebar bleibt)
+        self.decode = decode or unpack_codes
+
+    def __len__(self) -> int:
+        return len(self.codes) + len(self.rest)
+
+    @classmethod
+    def from_strings(cls, values: Iterable[str], extra_codes: np.ndarray = None) -> 'PackedSet':
+        """Packe Strings (Duplikate erlaubt), extra_codes werden hinzugefügt"""
+        if not isinstance(values, list):
+            values = list(values)
+        codes, packable = pack_values(values)
+        codes = codes[packable]
+        if extra_codes is not None:
+            codes = np.concatenate([codes, extra_codes])
+        rest = {values[pos] for pos in np.flatnonzero(~packable).tolist()}
+        return cls(sorted_unique(codes), rest)
+
+    @classmethod
+    def from_integers(cls, numbers: Iterable[int]) -> 'PackedSet':
+        """Ganzzahlen im int64-Bereich als Codes, größere als Restmenge"""
+        limit = np.iinfo(np.int64).max
+        small = [number for number in numbers if -limit <= number <= limit]
+        rest = {number for number in numbers if not -limit <= number <= limit}
+        return cls(sorted_unique(np.array(small, dtype=np.int64)), rest, decode=unpack_integers)
+
+    def intersect(self, other: 'PackedSet', examples: int = 5) -> Tuple[int, List]:
+        """Größe des Schnitts und bis zu examples gemeinsame Werte"""
+        common = np.intersect1d(self.codes, other.codes, assume_unique=True)
+        common_rest = self.rest & other.rest
+        values = self.decode(common[:examples])
+        values.extend(list(common_rest)[:examples - len(values)])
+        return len(common) + len(common_rest), values
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Markenpartitionierte Ablage der TecDoc-Daten
+Schreibt je brandno eine eigene CSV-Datei, damit markenbezogene Läufe nur ihre Partitionen lesen
+"""
+
+import json
+import re
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+import numpy as np
+import pandas as pd
+
+from .core import Config, resolve_input_file
+
+MANIFEST_FILE = "manifest.json"
+
+# =============================================================================
+# MARKENSCHLÜSSEL
+# =============================================================================
+
+def brand_key(value) -> str:
+    """Einheitlicher Schlüssel für Markenwerte (12, 12.0 und '12' → '12', fehlend → '')"""
+    if pd.isna(value):
+        return ''
+    if isinstance(value, (float, np.floating)) and float(value).is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+def brand_keys(brands: Iterable) -> List[str]:
+    """Markenschlüssel ohne Duplikate (Reihenfolge bleibt erhalten)"""
+    return list(dict.fromkeys(brand_key(brand) for brand in brands))
+
+def select_brands(data: pd.DataFrame, brands: Iterable,
+                  partition_column: str = None) -> pd.DataFrame:
+    """
+    Zeilen der gewählten Marken, Marken in Reihenfolge von brands
+
+    Innerhalb einer Marke bleibt die Dateireihenfolge erhalten, damit das
+    Ergebnis dem Lesen der Partitionen entspricht.
+    """
+    if partition_column is None:
+        partition_column = Config.PARTITION_COLUMN
+
+    position = {key: i for i, key in enumerate(brand_keys(brands))}
+    keys = data[partition_column].astype(object).map(brand_key)
+    order = keys.map(position)
+    selected = data[order.notna()]
+
+    sort_order = np.argsort(order[order.notna()].to_numpy(dtype=np.int64), kind='stable')
+    return selected.iloc[sort_order].reset_index(drop=True)
+
+def _column_kinds(chunk: pd.DataFrame, kinds: Dict[str, set]):
+    """
+    Wertarten je Spalte eines als Text gelesenen Chunks sammeln
+
+    'missing' (NA-Werte von read_csv), 'int', 'float' oder 'text' - daraus
+    ergibt sich der Typ, den read_csv für die ganze Datei wählen würde.
+    Bereits als null gelesene Felder (pyarrow) zählen ebenfalls als 'missing'.
+    """
+    from .arrow_csv import STR_NA_VALUES
+
+    for col in chunk.columns:
+        values = chunk[col]
+        missing = values.isna() | values.isin(STR_NA_VALUES)
+        present = values[~missing]
+        column_kinds = kinds.setdefault(col, set())
+        if missing.any():
+            column_kinds.add('missing')
+        if present.empty:
+            continue
+        numbers = pd.to_numeric(present, errors='coerce')
+        if numbers.isna().any():
+            column_kinds.add('text')
+        else:
+            column_kinds.add('int' if pd.api.types.is_integer_dtype(numbers) else 'float')
+
+def _source_dtypes(kinds: Dict[str, set]) -> Dict[str, str]:
+    """Typ je Spalte wie beim Lesen der ganzen Datei ('int64', 'float64' oder 'str')"""
+    dtypes = {}
+    for col, column_kinds in kinds.items():
+        if 'text' in column_kinds:
+            dtypes[col] = 'str'
+        elif column_kinds == {'int'}:
+            dtypes[col] = 'int64'
+        else:
+            dtypes[col] = 'float64'
+    return dtypes
+
+def _forced_dtypes(dtypes: Dict[str, str]) -> Dict:
+    """
+    dtype-Option für read_csv aus den Typen der Originaldatei
+
+    float- und Text-Spalten werden erzwungen; int-Spalten haben im ganzen
+    Bereich keine Lücken und werden daher auch in jedem Teil int.
+    """
+    forced = {'float64': 'float64', 'str': str}
+    return {col: forced[dtype] for col, dtype in dtypes.items() if dtype in forced}
+
+def _partition_name(key: str, used: set) -> str:
+    """Dateiname einer Partition (nur sichere Zeichen, eindeutig)"""
+    name = f"brand_{re.sub(r'[^0-9A-Za-z_.-]', '_', key) or '_leer'}"
+    candidate, counter = name, 1
+    while candidate in used:
+        counter += 1
+        candidate = f"{name}_{counter}"
+    used.add(candidate)
+    return candidate
+
+# =============================================================================
+# SCHREIBEN
+# =============================================================================
+
+def write_brand_partitions(file_path: Union[str, Path] = None,
+                           partition_dir: Union[str, Path] = None,
+                           partition_column: str = None,
+                           chunk_size: int = None) -> Dict:
+    """
+    Zerlege die TecDoc-CSV in eine CSV-Datei je Marke
+
+    Die Quelle wird einmal chunkweise gelesen; alle Felder bleiben Text.
+    Das Manifest enthält zusätzlich die Typen, die read_csv für die ganze
+    Datei wählt (eine Partition allein wäre z.B. ohne Lücken int statt
+    float), sodass die Partitionen mit partition_dtypes dieselben Werte und
+    Datentypen liefern wie die Originaldatei. Geschrieben wird in ein
+    temporäres Verzeichnis, das erst am Ende die alten Partitionen ersetzt.
+
+    Args:
+        file_path: TecDoc-CSV (None = Config.TECDOC_FILE, auch komprimiert)
+        partition_dir: Zielverzeichnis (None = Config.TECDOC_PARTITION_DIR)
+        partition_column: Partitionsspalte (None = Config.PARTITION_COLUMN)
+        chunk_size: Zeilen je Lese-Chunk (None = Config.PARTITION_CHUNK_SIZE)
+
+    Returns:
+        Manifest {source, fingerprint, column, rows, dtypes, partitions: {marke: {file, rows}}}
+    """
+    from .cache import sources_fingerprint
+
+    if file_path is None:
+        file_path = resolve_input_file(Config.TECDOC_FILE)
+        if file_path is None:
+            raise FileNotFoundError(f"TecDoc-Datei nicht gefunden: {Config.TECDOC_FILE}")
+    file_path = Path(file_path)
+    partition_dir = Path(partition_dir) if partition_dir else Config.TECDOC_PARTITION_DIR
+    partition_column = partition_column or Config.PARTITION_COLUMN
+    chunk_size = chunk_size or Config.PARTITION_CHUNK_SIZE
+
+    print(f"🗂️ Partitioniere {file_path.name} nach {partition_column}...")
+
+    tmp_dir = partition_dir.with_name(partition_dir.name + ".tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir(parents=True)
+
+    partitions = {}
+    used_names = set()
+    kinds = {}
+    total_rows = 0
+
+    for chunk in pd.read_csv(file_path, chunksize=chunk_size, dtype=str, keep_default_na=False):
+        if partition_column not in chunk.columns:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise KeyError(f"Partitionsspalte fehlt: {partition_column}")
+
+        _column_kinds(chunk, kinds)
+        keys = chunk[partition_column].map(brand_key)
+        for key, group in chunk.groupby(keys, sort=False):
+            entry = partitions.get(key)
+            if entry is None:
+                entry = partitions[key] = {'file': f"{_partition_name(key, used_names)}.csv",
+                                           'rows': 0}
+            group.to_csv(tmp_dir / entry['file'], mode='a', header=entry['rows'] == 0,
+                         index=False)
+            entry['rows'] += len(group)
+
+        total_rows += len(chunk)
+        print(f"   🔄 {total_rows:,} Zeilen, {len(partitions):,} Marken")
+
+    manifest = {
+        'source': file_path.name,
+        'fingerprint': sources_fingerprint([file_path]),
+        'column': partition_column,
+        'rows': total_rows,
+        'dtypes': _source_dtypes(kinds),
+        'partitions': partitions
+    }
+    with open(tmp_dir / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+
+    shutil.rmtree(partition_dir, ignore_errors=True)
+    tmp_dir.rename(partition_dir)
+    print(f"✅ {len(partitions):,} Partitionen geschrieben: {partition_dir}")
+
+    return manifest
+
+# =============================================================================
+# LESEN
+# =============================================================================
+
+def load_partition_manifest(partition_dir: Union[str, Path] = None) -> Optional[Dict]:
+    """Lade das Manifest (None, falls keine Partitionen vorhanden)"""
+    partition_dir = Path(partition_dir) if partition_dir else Config.TECDOC_PARTITION_DIR
+    manifest_path = partition_dir / MANIFEST_FILE
+
+    if not manifest_path.exists():
+        return None
+
+    with open(manifest_path, encoding='utf-8') as f:
+        return json.load(f)
+
+def partition_files(file_path: Union[str, Path], brands: Iterable,
+                    partition_dir: Union[str, Path] = None) -> Optional[List[Path]]:
+    """
+    Partitionsdateien der gewählten Marken (Partition Pruning)
+
+    Returns:
+        Dateien in Reihenfolge von brands, oder None, wenn keine zur
+        Quelldatei passenden Partitionen existieren (fehlend oder veraltet)
+    """
+    from .cache import sources_fingerprint
+
+    partition_dir = Path(partition_dir) if partition_dir else Config.TECDOC_PARTITION_DIR
+    manifest = load_partition_manifest(partition_dir)
+
+    if manifest is None or manifest['column'] != Config.PARTITION_COLUMN:
+        return None
+    if 'dtypes' not in manifest:
+        print("⚠️ Markenpartitionen ohne Typinformation - bitte neu erzeugen")
+        return None
+    if manifest['fingerprint'] != sources_fingerprint([file_path]):
+        print("⚠️ Markenpartitionen veraltet (Quelldatei geändert)")
+        return None
+
+    files = []
+    missing = []
+    for key in brand_keys(brands):
+        entry = manifest['partitions'].get(key)
+        if entry is None:
+            missing.append(key)
+        else:
+            files.append(partition_dir / entry['file'])
+
+    if missing:
+        print(f"⚠️ Keine TecDoc-Zeilen für Marken: {', '.join(missing[:10])}")
+
+    return files
+
+def partition_dtypes(partition_dir: Union[str, Path] = None) -> Dict:
+    """dtype-Option für read_csv auf Partitionen (Typen der Originaldatei)"""
+    manifest = load_partition_manifest(partition_dir) or {}
+    return _forced_dtypes(manifest.get('dtypes', {}))
+
+def source_dtypes(file_path: Union[str, Path], read_options: Dict = None,
+                  chunk_size: int = None, nrows: int = None, engine: str = 'c') -> Dict:
+    """
+    dtype-Option, mit der jeder Chunk so gelesen wird wie die ganze Datei
+
+    Beim chunkweisen Lesen bestimmt jeder Chunk seine Typen selbst: eine
+    Spalte mit Lücken erst in späteren Chunks wäre anfangs int, in der
+    ganzen Datei aber float ('1' statt '1.0' als Matching-Wert). Die Typen
+    stammen aus dem Manifest passender Markenpartitionen (nur für die ganze
+    Datei), sonst aus einem Typlauf über die ersten nrows Zeilen, der die
+    Spalten nur als Text liest. Spalten mit festem Typ in read_options
+    werden übersprungen.
+
+    Args:
+        file_path: CSV-Datei (auch komprimiert)
+        read_options: Optionen des eigentlichen Lesens (usecols/dtype)
+        chunk_size: Zeilen je Lese-Chunk (None = Config.PARTITION_CHUNK_SIZE)
+        nrows: Nur die ersten N Zeilen (None = ganze Datei)
+        engine: CSV-Reader 'c' oder 'pyarrow'
+
+    Returns:
+        {spalte: dtype} für float- und Text-Spalten
+    """
+    from .cache import sources_fingerprint
+
+    read_options = read_options or {}
+    fixed = read_options.get('dtype') or {}
+    usecols = [col for col in read_options.get('usecols', pd.read_csv(file_path, nrows=0).columns)
+               if col not in fixed]
+    if not usecols:
+        return {}
+
+    manifest = load_partition_manifest()
+    if (nrows is None and manifest is not None and 'dtypes' in manifest
+            and manifest['fingerprint'] == sources_fingerprint([file_path])):
+        return _forced_dtypes({col: dtype for col, dtype in manifest['dtypes'].items()
+                               if col in usecols})
+
+    print(f"🗂️ Bestimme Spaltentypen: {Path(file_path).name}")
+    chunk_size = chunk_size or Config.PARTITION_CHUNK_SIZE
+    if engine == 'pyarrow':
+        from .arrow_csv import iter_csv_batches
+        chunks = iter_csv_batches(file_path, {'usecols': usecols})
+    else:
+        chunks = pd.read_csv(file_path, usecols=usecols, chunksize=chunk_size, nrows=nrows,
+                             dtype=str, keep_default_na=False)
+
+    kinds = {}
+    remaining = nrows
+    for chunk in chunks:
+        if remaining is not None:
+            chunk = chunk.iloc[:remaining]
+            remaining -= len(chunk)
+        _column_kinds(chunk, kinds)
+        if remaining == 0:
+            break
+
+    return _forced_dtypes(_source_dtypes(kinds))
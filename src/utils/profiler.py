@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Streaming-Profiler für TecDoc- und CMD-Quelldaten
+Zeilen-/Artikelzählung, Distinct-Schätzung (HyperLogLog), Nullraten und Längenverteilungen
+bei konstantem Speicherbedarf
+"""
+
+import mmap
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Union
+import numpy as np
+import pandas as pd
+
+from .core import (Config, is_compressed, open_input, resolve_input_file,
+                   list_xml_files, resolve_csv_engine)
+
+# =============================================================================
+# HYPERLOGLOG
+# =============================================================================
+
+def _bit_length(values: np.ndarray) -> np.ndarray:
+    """Bitlänge je uint64-Wert (vektorisiert, exakt)"""
+    x = values.copy()
+    length = np.zeros(len(x), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        mask = x >= (np.uint64(1) << np.uint64(shift))
+        x[mask] >>= np.uint64(shift)
+        length[mask] += shift
+    return length + (x > 0)
+
+class HyperLogLog:
+    """HyperLogLog-Schätzer für die Anzahl eindeutiger Werte (2^p Register)"""
+
+    def __init__(self, p: int = 14):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def update_hashes(self, hashes: np.ndarray):
+        """Füge 64-Bit-Hashes hinzu"""
+        if len(hashes) == 0:
+            return
+        hashes = hashes.astype(np.uint64, copy=False)
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rest = hashes << np.uint64(self.p)
+        # Position des ersten 1-Bits in den restlichen 64 - p Bits
+        rank = np.minimum(64 - _bit_length(rest) + 1, 64 - self.p + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def update(self, values: pd.Series):
+        """Füge Werte hinzu (gehasht über ihre String-Darstellung)"""
+        self.update_hashes(pd.util.hash_pandas_object(values.astype(str), index=False).to_numpy())
+
+    def estimate(self) -> int:
+        """Geschätzte Anzahl eindeutiger Werte"""
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        raw = alpha * self.m ** 2 / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * self.m and zeros:
+            # Kleine Kardinalitäten: Linear Counting
+            return int(round(self.m * np.log(self.m / zeros)))
+        return int(round(raw))
+
+# =============================================================================
+# ZÄHLUNG
+# =============================================================================
+
+def count_csv_rows(file_path: Union[str, Path], block_size: int = 16 * 1024 ** 2) -> int:
+    """Datenzeilen einer CSV per Newline-Scan (memory-mapped bzw. Stream bei Kompression)"""
+    newlines = 0
+    last = b'\n'
+
+    if is_compressed(file_path) or Path(file_path).stat().st_size == 0:
+        with open_input(file_path) as f:
+            while True:
+                block = f.read(block_size)
+                if not block:
+                    break
+                newlines += block.count(b'\n')
+                last = block[-1:]
+    else:
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            for start in range(0, len(data), block_size):
+                newlines += data[start:start + block_size].count(b'\n')
+            last = data[-1:]
+
+    lines = newlines + (last != b'\n')
+    return max(0, lines - 1)  # ohne Header
+
+def count_xml_articles(xml_file: Union[str, Path]) -> Dict:
+    """
+    Zähle Artikel einer XML-Datei per iterparse
+
+    articles zählt wie bisher get_data_sizes.py alle Elemente mit einem Tag
+    aus Config.XML_ARTICLE_TAGS in beliebiger Tiefe (Fallback: direkte
+    Kinder des Root-Elements), children wie xml_artikel_zaehler.py die
+    direkten Kinder des Root-Elements.
+
+    Returns:
+        Dict mit articles, children, article_tag (häufigster Tag der
+        direkten Kinder) und first_article_id
+    """
+    from .xml_stream import _iterparse
+
+    if is_compressed(xml_file):
+        with open_input(xml_file) as stream:
+            return _count_xml_stream(stream, _iterparse)
+    return _count_xml_stream(str(xml_file), _iterparse)
+
+def _count_xml_stream(source, iterparse) -> Dict:
+    from .xml_stream import _release
+
+    article_tags = set(Config.XML_ARTICLE_TAGS)
+    children = Counter()
+    articles = 0
+    first_id = None
+    open_elements = []
+
+    for event, elem in iterparse(source):
+        if event == 'start':
+            if len(open_elements) == 1 and first_id is None:
+                first_id = next((elem.get(attr) for attr in Config.XML_ARTICLE_ID_ATTRIBUTES
+                                 if elem.get(attr)), None)
+            open_elements.append(elem)
+            continue
+
+        open_elements.pop()
+        tag = elem.tag.split('}')[-1]
+        if open_elements and tag in article_tags:
+            articles += 1
+        if len(open_elements) == 1:
+            children[tag] += 1
+        _release(elem, open_elements[-1] if open_elements else None)
+
+    return {'articles': articles or sum(children.values()),
+            'children': sum(children.values()),
+            'article_tag': children.most_common(1)[0][0] if children else None,
+            'first_article_id': first_id}
+
+# =============================================================================
+# SPALTENPROFILE
+# =============================================================================
+
+def detect_separator(file_path: Union[str, Path]) -> str:
+    """Trennzeichen aus der Kopfzeile ableiten (',' oder ';')"""
+    with open_input(file_path) as f:
+        header = f.readline()
+    return ';' if header.count(b';') > header.count(b',') else ','
+
+def profile_csv_columns(file_path: Union[str, Path], columns: List[str] = None,
+                        chunk_size: int = 200000, max_length: int = None) -> pd.DataFrame:
+    """
+    Spaltenprofil in einem Streaming-Durchlauf
+
+    Alle Werte werden als String gelesen. Je Spalte: Anzahl Werte,
+    Nullrate, geschätzte eindeutige Werte (HyperLogLog) und eine
+    Längenverteilung (letzter Bucket = Länge >= max_length).
+    """
+    if max_length is None:
+        max_length = Config.PROFILE_MAX_LENGTH
+
+    sep = detect_separator(file_path)
+    header = pd.read_csv(file_path, sep=sep, nrows=0).columns
+    selected = [col for col in header if columns is None or col in set(columns)]
+    read_options = {'sep': sep, 'usecols': selected, 'dtype': {col: str for col in selected}}
+
+    stats = {col: {'values': 0, 'nulls': 0, 'hll': HyperLogLog(),
+                   'lengths': np.zeros(max_length + 1, dtype=np.int64)} for col in selected}
+
+    if resolve_csv_engine() == 'pyarrow' and sep == ',':
+        from .arrow_csv import iter_csv_batches
+        chunks = iter_csv_batches(file_path, read_options)
+    else:
+        chunks = pd.read_csv(file_path, chunksize=chunk_size, **read_options)
+
+    for chunk in chunks:
+        for col in selected:
+            series = chunk[col]
+            present = series.dropna()
+            entry = stats[col]
+            entry['values'] += len(series)
+            entry['nulls'] += len(series) - len(present)
+            entry['hll'].update(present)
+            lengths = np.minimum(present.str.len().to_numpy(dtype=np.int64), max_length)
+            entry['lengths'] += np.bincount(lengths, minlength=max_length + 1)
+
+    rows = []
+    for col, entry in stats.items():
+        lengths = entry['lengths']
+        present = lengths.sum()
+        rows.append({
+            'Spalte': col,
+            'Werte': entry['values'],
+            'Nullrate': entry['nulls'] / entry['values'] if entry['values'] else 0.0,
+            'Distinct_geschaetzt': entry['hll'].estimate(),
+            'Laenge_Mittel': float((lengths * np.arange(len(lengths))).sum() / present) if present else 0.0,
+            'Laenge_Max': int(np.flatnonzero(lengths).max()) if present else 0,
+            'Laengen_Histogramm': {int(length): int(count)
+                                   for length, count in enumerate(lengths) if count}
+        })
+
+    return pd.DataFrame(rows)
+
+# =============================================================================
+# GESAMTBERICHT
+# =============================================================================
+
+def profile_datasets(column_stats: bool = True, xml_dir: Union[str, Path] = None) -> Dict:
+    """
+    Profil aller Quelldaten in einem Bericht
+
+    Args:
+        column_stats: Spaltenprofile erstellen (sonst nur Zählungen)
+        xml_dir: Verzeichnis mit CMD Platform XML-Dateien (None = Standard)
+
+    Returns:
+        Dict mit 'tecdoc', 'cmd_csv' (je Datei, Zeilen, Spaltenprofil) und 'xml'
+    """
+    report = {'tecdoc': None, 'cmd_csv': [], 'xml': {'files': {}, 'articles': 0}}
+
+    tecdoc_file = resolve_input_file(Config.TECDOC_FILE)
+    if tecdoc_file is not None:
+        print(f"🔍 Profil TecDoc: {tecdoc_file.name}")
+        report['tecdoc'] = {
+            'file': str(tecdoc_file),
+            'rows': count_csv_rows(tecdoc_file),
+            'columns': profile_csv_columns(tecdoc_file) if column_stats else None
+        }
+
+    for filename in Config.CMD_CSV_FILES:
+        file_path = resolve_input_file(filename)
+        if file_path is None:
+            continue
+        print(f"🔍 Profil CMD CSV: {file_path.name}")
+        report['cmd_csv'].append({
+            'file': str(file_path),
+            'rows': count_csv_rows(file_path),
+            'columns': profile_csv_columns(file_path) if column_stats else None
+        })
+
+    if xml_dir is None:
+        xml_dir = Config.INPUT_DIR / Config.CMD_XML_DIR
+    if Path(xml_dir).exists():
+        for xml_file in list_xml_files(xml_dir):
+            try:
+                report['xml']['files'][xml_file.name] = count_xml_articles(xml_file)
+            except Exception as e:
+                print(f"⚠️ Fehler bei {xml_file.name}: {e}")
+        report['xml']['articles'] = sum(entry['articles'] for entry in report['xml']['files'].values())
+
+    return report
+
+def print_profile(report: Dict):
+    """Drucke den Profilbericht"""
+    print("\n📊 DATENPROFIL")
+    print("=" * 60)
+
+    sources = ([('TecDoc', report['tecdoc'])] if report['tecdoc'] else []) + \
+              [('CMD CSV', entry) for entry in report['cmd_csv']]
+    for label, entry in sources:
+        print(f"📂 {label}: {Path(entry['file']).name} - {entry['rows']:,} Zeilen")
+        if entry['columns'] is not None:
+            for _, row in entry['columns'].iterrows():
+                print(f"   {row['Spalte']}: ~{row['Distinct_geschaetzt']:,} eindeutig, "
+                      f"{row['Nullrate']:.1%} leer, Länge Ø {row['Laenge_Mittel']:.1f} "
+                      f"(max {row['Laenge_Max']})")
+
+    for name, entry in report['xml']['files'].items():
+        print(f"📄 {name}: {entry['articles']:,} Artikel ({entry['article_tag']})")
+    print(f"📊 XML-Daten gesamt: {report['xml']['articles']:,} Artikel "
+          f"aus {len(report['xml']['files'])} Dateien")
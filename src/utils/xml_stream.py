@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Streaming-Extraktion für CMD Platform XML-Dateien
+Liest jede Datei genau einmal per iterparse und verwirft verarbeitete Elemente
+"""
+
+import mmap
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple, Union
+import xml.etree.ElementTree as ET
+
+try:
+    from lxml import etree as LET
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+from .core import Config, is_compressed, open_input
+
+# =============================================================================
+# PARSER
+# =============================================================================
+
+def _iterparse(source, parser: str = None):
+    """iterparse mit start/end-Events (lxml falls verfügbar und gewünscht)"""
+    if parser is None:
+        parser = Config.XML_PARSER
+
+    if parser == 'lxml' or (parser == 'auto' and LXML_AVAILABLE):
+        if not LXML_AVAILABLE:
+            raise ImportError("lxml nicht verfügbar")
+        return LET.iterparse(source, events=('start', 'end'), huge_tree=True)
+
+    return ET.iterparse(source, events=('start', 'end'))
+
+def _release(elem, parent):
+    """
+    Fertig verarbeitetes Element leeren und seine vorherigen Geschwister lösen
+
+    Das Element selbst bleibt (leer) im Baum, da der Parser es bei lxml noch
+    referenziert; je Ebene bleibt so höchstens ein leeres Element übrig,
+    unabhängig von der Verschachtelungstiefe der Artikel.
+    """
+    elem.clear()
+    if parent is not None and len(parent) > 1:
+        del parent[:-1]
+
+def iter_tag_values(source: Union[str, Path], target_tags: List[str],
+                    parser: str = None) -> Iterator[Tuple[str, str]]:
+    """
+    Liefere (tag, text) für alle Ziel-Tags in einem einzigen Durchlauf
+
+    Jedes Element wird nach seinem End-Event geleert und von seinem
+    Elternelement gelöst (auch unter Wrapper-Elementen wie
+    <Root><Articles><Article>), damit der Speicherbedarf unabhängig von der
+    Dateigröße konstant bleibt. Komprimierte Dateien werden als Stream
+    dekomprimiert.
+    """
+    if isinstance(source, (str, Path)) and is_compressed(source):
+        with open_input(source) as stream:
+            yield from iter_tag_values(stream, target_tags, parser)
+        return
+
+    wanted = set(target_tags)
+    open_elements = []
+
+    for event, elem in _iterparse(str(source) if isinstance(source, Path) else source, parser):
+        if event == 'start':
+            open_elements.append(elem)
+            continue
+
+        open_elements.pop()
+        if elem.tag in wanted:
+            text = elem.text
+            if text and text.strip():
+                yield elem.tag, text.strip()
+
+        _release(elem, open_elements[-1] if open_elements else None)
+
+def collect_tag_values(source: Union[str, Path], target_tags: List[str],
+                       parser: str = None) -> Dict[str, Dict[str, None]]:
+    """Sammle eindeutige Werte je Tag (dict als geordnetes Set)"""
+    values = {tag: {} for tag in target_tags}
+    for tag, text in iter_tag_values(source, target_tags, parser):
+        values[tag][text] = None
+    return values
+
+def iter_article_records(source: Union[str, Path], target_tags: List[str],
+                         article_tag: str, parser: str = None) -> Iterator[Tuple[str, Dict[str, str]]]:
+    """
+    Liefere (Artikel-ID, {tag: wert}) je Artikel in einem Durchlauf
+
+    Artikel sind alle Elemente mit article_tag in beliebiger Tiefe (in
+    Artikeln verschachtelte Elemente gleichen Namens zählen nicht extra).
+    Die ID stammt aus dem ersten vorhandenen Attribut aus
+    Config.XML_ARTICLE_ID_ATTRIBUTES (sonst None). Kommt ein Tag in einem
+    Artikel mehrfach vor, gilt der erste Wert. Verarbeitete Elemente werden
+    wie in iter_tag_values sofort freigegeben.
+    """
+    if isinstance(source, (str, Path)) and is_compressed(source):
+        with open_input(source) as stream:
+            yield from iter_article_records(stream, target_tags, article_tag, parser)
+        return
+
+    wanted = set(target_tags)
+    open_elements = []
+    article_depth = None
+    record = {}
+
+    for event, elem in _iterparse(str(source) if isinstance(source, Path) else source, parser):
+        if event == 'start':
+            if article_depth is None and elem.tag == article_tag:
+                article_depth = len(open_elements)
+            open_elements.append(elem)
+            continue
+
+        open_elements.pop()
+        if article_depth is not None:
+            if len(open_elements) == article_depth:
+                article_id = next((elem.get(attr) for attr in Config.XML_ARTICLE_ID_ATTRIBUTES
+                                   if elem.get(attr)), None)
+                yield article_id, record
+                article_depth = None
+                record = {}
+            elif elem.tag in wanted and elem.tag not in record:
+                text = elem.text
+                if text and text.strip():
+                    record[elem.tag] = text.strip()
+
+        _release(elem, open_elements[-1] if open_elements else None)
+
+def collect_article_records(source: Union[str, Path], target_tags: List[str],
+                            article_tag: str, parser: str = None) -> Dict[str, List]:
+    """Sammle Artikel spaltenweise: {'article_id': [...], tag: [...]} (None = fehlt)"""
+    columns = {'article_id': [], **{tag: [] for tag in target_tags}}
+    for article_id, record in iter_article_records(source, target_tags, article_tag, parser):
+        columns['article_id'].append(article_id)
+        for tag in target_tags:
+            columns[tag].append(record.get(tag))
+    return columns
+
+# =============================================================================
+# BYTE-RANGE-SHARDING
+# =============================================================================
+
+_ROOT_START = re.compile(rb'<([^?!/\s>][^\s/>]*)[^>]*>')
+
+class _ShardReader:
+    """Dateiartiges Objekt: prefix + Datei[start:end] + suffix, blockweise gelesen"""
+
+    def __init__(self, xml_file: Union[str, Path], start: int, end: int,
+                 prefix: bytes = b'', suffix: bytes = b''):
+        self._file = open(xml_file, 'rb')
+        self._file.seek(start)
+        self._remaining = end - start
+        self._prefix = prefix
+        self._suffix = suffix
+
+    def read(self, size: int = -1) -> bytes:
+        if size is None or size < 0:
+            size = 1 << 20
+
+        if self._prefix:
+            data, self._prefix = self._prefix[:size], self._prefix[size:]
+            return data
+
+        if self._remaining > 0:
+            data = self._file.read(min(size, self._remaining))
+            self._remaining -= len(data)
+            if data:
+                return data
+            self._remaining = 0
+
+        data, self._suffix = self._suffix[:size], self._suffix[size:]
+        return data
+
+    def close(self):
+        self._file.close()
+
+def _article_level(xml_file, parser: str = None,
+                   probe_elements: int = 5000) -> Tuple[str, int]:
+    """
+    Artikel-Tag und seine Tiefe (Root = 1) aus den ersten Elementen der Datei
+
+    Kommt ein Tag aus Config.XML_ARTICLE_TAGS vor, ist er der Artikel-Tag
+    (bei mehreren der am wenigsten tief liegende, dann der häufigste).
+    Sonst sind Artikel der häufigste Tag unter den direkten Kindern des
+    Root-Elements. Ist das einzige Kind ein einzelnes Element, unter dem
+    sich ein Tag wiederholt, ist es eine Wrapper-Ebene (z.B.
+    <Root><Articles><Article>...) und die Suche geht eine Ebene tiefer;
+    bei gleich häufigen Tags (z.B. <Header/> neben einem einzigen Artikel)
+    nicht. Von gleich häufigen Tags gilt der letzte, da Kopfdaten vor den
+    Artikeln stehen.
+    """
+    if isinstance(xml_file, (str, Path)) and is_compressed(xml_file):
+        with open_input(xml_file) as stream:
+            return _article_level(stream, parser, probe_elements)
+
+    article_tags = set(Config.XML_ARTICLE_TAGS)
+    levels = {}
+    configured = {}
+    depth = 0
+    seen = 0
+    for event, elem in _iterparse(str(xml_file) if isinstance(xml_file, Path) else xml_file, parser):
+        if event == 'start':
+            depth += 1
+            if depth >= 2:
+                levels.setdefault(depth, Counter())[elem.tag] += 1
+                if elem.tag.split('}')[-1] in article_tags:
+                    configured.setdefault(elem.tag, depth)
+                seen += 1
+                if seen >= probe_elements:
+                    break
+        else:
+            depth -= 1
+            elem.clear()
+    if 2 not in levels:
+        raise ValueError(f"Keine Artikel-Elemente in {xml_file}")
+
+    if configured:
+        tag = min(configured, key=lambda tag: (configured[tag], -levels[configured[tag]][tag]))
+        return tag, configured[tag]
+
+    depth = 2
+    while (sum(levels[depth].values()) == 1 and depth + 1 in levels
+           and levels[depth + 1].most_common(1)[0][1] > 1):
+        depth += 1
+    top = levels[depth].most_common(1)[0][1]
+    return [tag for tag, count in levels[depth].items() if count == top][-1], depth
+
+def _article_tag(xml_file, parser: str = None) -> str:
+    """Artikel-Tag einer Datei (siehe _article_level)"""
+    return _article_level(xml_file, parser)[0]
+
+def plan_shards(xml_file: Union[str, Path], n_shards: int,
+                parser: str = None) -> List[Tuple[int, int, bytes, bytes]]:
+    """
+    Zerlege eine große XML-Datei an Artikelgrenzen in Byte-Bereiche
+
+    Jeder Bereich beginnt mit dem Start-Tag eines Artikels. Damit jeder
+    Shard für sich wohlgeformt ist, erhalten alle außer dem ersten die
+    XML-Deklaration und das Root-Start-Tag (inkl. Namespaces) als Präfix,
+    alle außer dem letzten das Root-End-Tag als Suffix. Artikel-Tags in
+    CDATA-Abschnitten oder Kommentaren werden nicht erkannt. Liegen die
+    Artikel unter einem Wrapper-Element, bleibt die Datei ein Bereich.
+
+    Returns:
+        Liste von (start, end, prefix, suffix)
+    """
+    article_tag, article_depth = _article_level(xml_file, parser)
+    local_name = article_tag.split('}')[-1]
+    article_start = re.compile(rb'<(?:[\w.-]+:)?' + re.escape(local_name.encode()) + rb'[\s/>]')
+
+    with open(xml_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        size = len(data)
+
+        root_match = _ROOT_START.search(data)
+        if root_match is None:
+            raise ValueError(f"Kein Root-Element in {xml_file}")
+        first = article_start.search(data, root_match.end())
+        if first is None or n_shards <= 1 or article_depth != 2:
+            return [(0, size, b'', b'')]
+
+        header = data[:root_match.start()] if data[:5] == b'<?xml' else b''
+        prefix = bytes(header) + root_match.group(0)
+        suffix = b'</' + root_match.group(1) + b'>'
+
+        # Grenzen: nächster Artikel-Start ab gleichmäßig verteilten Offsets
+        boundaries = [0]
+        step = (size - first.start()) // n_shards
+        for k in range(1, n_shards):
+            match = article_start.search(data, first.start() + k * step)
+            if match and match.start() > boundaries[-1]:
+                boundaries.append(match.start())
+        boundaries.append(size)
+
+    shards = []
+    last = len(boundaries) - 2
+    for i in range(len(boundaries) - 1):
+        shards.append((boundaries[i], boundaries[i + 1],
+                       prefix if i > 0 else b'',
+                       suffix if i < last else b''))
+    return shards
+
+# =============================================================================
+# PARALLELE EXTRAKTION
+# =============================================================================
+
+def extract_file_task(xml_file: Union[str, Path], target_tags: List[str],
+                      parser: str = None,
+                      shard: Tuple[int, int, bytes, bytes] = None,
+                      mode: str = 'values') -> Tuple[str, Dict[str, List[str]], float, str]:
+    """
+    Worker-Aufgabe für eine Datei oder einen Byte-Bereich (läuft im Prozess-Pool)
+
+    Args:
+        mode: 'values' (eindeutige Werte je Tag) oder 'records' (eine Zeile je Artikel)
+
+    Returns:
+        (Dateiname, Werte je Tag bzw. Spalten, Laufzeit in s, Fehlermeldung oder None)
+    """
+    start = time.perf_counter()
+    source = _ShardReader(xml_file, *shard) if shard else xml_file
+    try:
+        if mode == 'records':
+            article_tag = _article_tag(xml_file, parser)
+            result = collect_article_records(source, target_tags, article_tag, parser)
+        else:
+            values = collect_tag_values(source, target_tags, parser)
+            result = {tag: list(tag_values) for tag, tag_values in values.items()}
+        error = None
+    except Exception as e:
+        result = {}
+        error = str(e)
+    finally:
+        if shard:
+            source.close()
+    return str(xml_file), result, time.perf_counter() - start, error
+
+def _plan_tasks(xml_files: List[Path], workers: int) -> List[Tuple[Path, Tuple]]:
+    """Eine Aufgabe je Datei; große Dateien werden bei workers > 1 in Shards zerlegt"""
+    tasks = []
+    for xml_file in xml_files:
+        shards = None
+        # Komprimierte Dateien erlauben keinen wahlfreien Zugriff; fehlende
+        # Dateien meldet extract_file_task als Fehler der Datei
+        if (workers > 1 and not is_compressed(xml_file) and Path(xml_file).is_file()
+                and Path(xml_file).stat().st_size >= Config.XML_SHARD_MIN_BYTES):
+            try:
+                shards = plan_shards(xml_file, workers)
+                print(f"✂️ {Path(xml_file).name}: {len(shards)} Byte-Bereiche")
+            except Exception as e:
+                print(f"⚠️ Sharding von {Path(xml_file).name} nicht möglich: {e}")
+
+        if shards and len(shards) > 1:
+            tasks.extend((xml_file, shard) for shard in shards)
+        else:
+            tasks.append((xml_file, None))
+    return tasks
+
+def run_extract_tasks(xml_files: List[Path], target_tags: List[str],
+                      workers: int = 1,
+                      mode: str = 'values') -> List[Tuple[str, Dict[str, List[str]], float, str]]:
+    """
+    Führe extract_file_task für alle Dateien aus (seriell oder im Prozess-Pool)
+
+    Dateien ab Config.XML_SHARD_MIN_BYTES werden dabei an Artikelgrenzen in
+    einen Bereich pro Worker zerlegt. Die Ergebnisse werden unabhängig von der
+    Fertigstellungsreihenfolge in Datei- und Shard-Reihenfolge zurückgegeben;
+    Fehler einzelner Dateien brechen den Batch nicht ab.
+    """
+    tasks = _plan_tasks(xml_files, workers)
+
+    if workers <= 1 or len(tasks) <= 1:
+        return [extract_file_task(xml_file, target_tags, shard=shard, mode=mode)
+                for xml_file, shard in tasks]
+
+    parser = Config.XML_PARSER
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(extract_file_task, xml_file, target_tags, parser, shard, mode)
+                   for xml_file, shard in tasks]
+
+        results = []
+        for (xml_file, _), future in zip(tasks, futures):
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # z.B. abgestürzter Worker-Prozess
+                results.append((str(xml_file), {}, 0.0, str(e)))
+
+    return results
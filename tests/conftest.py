@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Gemeinsame Fixtures der Tests
+Eigenes Daten-/Cache-Verzeichnis je Test, kleine TecDoc-/CMD-Eingaben
+"""
+
+import sys
+from pathlib import Path
+import pandas as pd
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.utils.core import Config
+
+@pytest.fixture
+def data_dirs(tmp_path, monkeypatch):
+    """Config-Verzeichnisse auf ein temporäres Projekt umbiegen"""
+    monkeypatch.setattr(Config, 'PROJECT_ROOT', tmp_path)
+    monkeypatch.setattr(Config, 'DATA_DIR', tmp_path / "data")
+    monkeypatch.setattr(Config, 'INPUT_DIR', tmp_path / "data" / "input")
+    monkeypatch.setattr(Config, 'CACHE_DIR', tmp_path / "data" / "cache")
+    monkeypatch.setattr(Config, 'TECDOC_PARTITION_DIR', tmp_path / "data" / "partitions" / "tecdoc")
+    Config.INPUT_DIR.mkdir(parents=True)
+    return tmp_path
+
+def tecdoc_frame(rows: int = 200) -> pd.DataFrame:
+    """Kleine TecDoc-Tabelle mit führenden Nullen, Lücken und Wiederholungen"""
+    return pd.DataFrame({
+        'artno': [f"{'0' if i % 7 == 0 else ''}{i % 150}-{i % 3}" for i in range(rows)],
+        'brandno': [i % 9 for i in range(rows)],
+        'batchsize1': [None if i % 11 == 0 else i % 5 for i in range(rows)],
+        'batchsize2': [i % 4 for i in range(rows)],
+    })
+
+def late_gap_csv(path):
+    """TecDoc-CSV, deren batchsize1 erst ab Zeile 50 Lücken hat (int bis dahin)"""
+    data = tecdoc_frame(100)
+    data['batchsize1'] = pd.array([None if i >= 50 and i % 11 == 0 else i % 5 for i in range(100)],
+                                  dtype='Int64')
+    data.to_csv(path, index=False)
+
+@pytest.fixture
+def tecdoc_csv(data_dirs):
+    """TecDoc-CSV im Eingabeverzeichnis"""
+    path = Config.INPUT_DIR / Config.TECDOC_FILE
+    tecdoc_frame().to_csv(path, index=False)
+    return path
+
+def xml_document(articles: int, wrapper: str = None, start: int = 0) -> str:
+    """CMD-Platform-XML mit optionalem Wrapper-Element um die Artikel"""
+    body = "".join(
+        f'<Article ArticleNumber="A{i}"><SupplierPtNo>SP{i % 40}</SupplierPtNo>'
+        f'<TradeNo>{1000 + i}</TradeNo><Brand>B{i % 5}</Brand>'
+        f'<Prices><Price>{i % 3}.5</Price><Price>9</Price></Prices></Article>\n'
+        for i in range(start, start + articles))
+    if wrapper:
+        body = f"<{wrapper}>\n{body}</{wrapper}>\n"
+    return f'<?xml version="1.0"?>\n<ArticleMasterData>\n<Header><Brand>Kopf</Brand></Header>\n{body}</ArticleMasterData>\n'
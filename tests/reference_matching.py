@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+"""
+Referenz-Matcher für die Tests
+Unveränderte Methoden der ursprünglichen Matcher (vor den Optimierungen), gegen die alle
+Kodierungen und Backends geprüft werden
+"""
+
+from collections import defaultdict
+from difflib import SequenceMatcher
+from typing import Dict, List, Tuple
+import numpy as np
+
+try:
+    from jellyfish import jaro_winkler_similarity
+    JELLYFISH_AVAILABLE = True
+except ImportError:
+    JELLYFISH_AVAILABLE = False
+
+from src.utils.core import Config, clean_str, get_numeric_values, normalize_values
+
+# =============================================================================
+# DETERMINISTISCH
+# =============================================================================
+
+class ReferenceDeterministicMatcher:
+    """Zentrale Klasse für deterministische Matching-Algorithmen"""
+    
+    def __init__(self):
+        self.methods = {
+            'Exakt': self.exact_match,
+            'Substring': self.substring_match,
+            'Prefix': self.prefix_match,
+            'Suffix': self.suffix_match,
+            'Numerisch_Exakt': self.numeric_exact_match,
+            'Längenbasiert': self.length_based_match
+        }
+    
+    def exact_match(self, tecdoc_values: List, target_values: List) -> Tuple[int, List[str]]:
+        """Exaktes String-Matching mit verschiedenen Normalisierungsstrategien"""
+        matches = 0
+        examples = []
+        
+        try:
+            # Strategie 1: Direkte exakte Übereinstimmung
+            tecdoc_clean = set(clean_str(val) for val in tecdoc_values if clean_str(val))
+            target_clean = set(clean_str(val) for val in target_values if clean_str(val))
+            direct_matches = tecdoc_clean & target_clean
+            
+            if direct_matches:
+                matches += len(direct_matches)
+                examples.extend([f"Direkt: '{m}'" for m in list(direct_matches)[:2]])
+            
+            # Strategie 2: Numerische Normalisierung
+            tecdoc_numeric = get_numeric_values(tecdoc_values)
+            target_numeric = get_numeric_values(target_values)
+            numeric_matches = tecdoc_numeric & target_numeric
+            
+            if numeric_matches:
+                matches += len(numeric_matches)
+                examples.extend([f"Numerisch: {m}" for m in list(numeric_matches)[:2]])
+            
+            # Strategie 3: Ohne Punkte/Bindestriche
+            tecdoc_normalized = normalize_values(tecdoc_values)
+            target_normalized = normalize_values(target_values)
+            normalized_matches = tecdoc_normalized & target_normalized
+            
+            if normalized_matches:
+                matches += len(normalized_matches)
+                examples.extend([f"Normalisiert: '{m}'" for m in list(normalized_matches)[:2]])
+            
+        except Exception as e:
+            print(f"⚠️ Fehler bei exact_match: {e}")
+        
+        return matches, examples[:5]
+    
+    def substring_match(self, tecdoc_values: List, target_values: List) -> Tuple[int, List[str]]:
+        """Substring-Matching (TecDoc-Wert als Teilstring im Target)"""
+        matches = 0
+        examples = []
+        
+        try:
+            # Bereite Daten vor
+            tecdoc_clean = [clean_str(val) for val in tecdoc_values if clean_str(val) and len(clean_str(val)) >= Config.MIN_STRING_LENGTH]
+            target_clean = [clean_str(val) for val in target_values if clean_str(val) and len(clean_str(val)) >= Config.MIN_STRING_LENGTH]
+            
+            # Finde Substring-Matches
+            for tec_val in tecdoc_clean:
+                for target_val in target_clean:
+                    if tec_val in target_val and tec_val != target_val:  # Substring, aber nicht identisch
+                        matches += 1
+                        if len(examples) < 5:
+                            examples.append(f"'{tec_val}' ↔ '{target_val}'")
+                        break  # Ein Match pro TecDoc-Wert
+            
+        except Exception as e:
+            print(f"⚠️ Fehler bei substring_match: {e}")
+        
+        return matches, examples
+    
+    def prefix_match(self, tecdoc_values: List, target_values: List, 
+                    length: int = None) -> Tuple[int, List[str]]:
+        """Prefix-Matching (gleicher Anfang)"""
+        if length is None:
+            length = Config.PREFIX_SUFFIX_LENGTH
+            
+        matches = 0
+        examples = []
+        
+        try:
+            # Bereite Präfixe vor
+            tecdoc_prefixes = set()
+            target_prefixes = set()
+            
+            for val in tecdoc_values:
+                clean_val = clean_str(val)
+                if len(clean_val) >= length:
+                    tecdoc_prefixes.add(clean_val[:length])
+            
+            for val in target_values:
+                clean_val = clean_str(val)
+                if len(clean_val) >= length:
+                    target_prefixes.add(clean_val[:length])
+            
+            # Finde gemeinsame Präfixe
+            common_prefixes = tecdoc_prefixes & target_prefixes
+            matches = len(common_prefixes)
+            examples = list(common_prefixes)[:5]
+            
+        except Exception as e:
+            print(f"⚠️ Fehler bei prefix_match: {e}")
+        
+        return matches, examples
+    
+    def suffix_match(self, tecdoc_values: List, target_values: List,
+                    length: int = None) -> Tuple[int, List[str]]:
+        """Suffix-Matching (gleiches Ende)"""
+        if length is None:
+            length = Config.PREFIX_SUFFIX_LENGTH
+            
+        matches = 0
+        examples = []
+        
+        try:
+            # Bereite Suffixe vor
+            tecdoc_suffixes = set()
+            target_suffixes = set()
+            
+            for val in tecdoc_values:
+                clean_val = clean_str(val)
+                if len(clean_val) >= length:
+                    tecdoc_suffixes.add(clean_val[-length:])
+            
+            for val in target_values:
+                clean_val = clean_str(val)
+                if len(clean_val) >= length:
+                    target_suffixes.add(clean_val[-length:])
+            
+            # Finde gemeinsame Suffixe
+            common_suffixes = tecdoc_suffixes & target_suffixes
+            matches = len(common_suffixes)
+            examples = list(common_suffixes)[:5]
+            
+        except Exception as e:
+            print(f"⚠️ Fehler bei suffix_match: {e}")
+        
+        return matches, examples
+    
+    def numeric_exact_match(self, tecdoc_values: List, target_values: List) -> Tuple[int, List[str]]:
+        """Exaktes numerisches Matching"""
+        matches = 0
+        examples = []
+        
+        try:
+            tecdoc_numeric = get_numeric_values(tecdoc_values)
+            target_numeric = get_numeric_values(target_values)
+            
+            common_numbers = tecdoc_numeric & target_numeric
+            matches = len(common_numbers)
+            examples = [str(num) for num in list(common_numbers)[:5]]
+            
+        except Exception as e:
+            print(f"⚠️ Fehler bei numeric_exact_match: {e}")
+        
+        return matches, examples
+    
+    def length_based_match(self, tecdoc_values: List, target_values: List) -> Tuple[int, List[str]]:
+        """Längenbasiertes Matching (gleiche String-Länge)"""
+        matches = 0
+        examples = []
+        
+        try:
+            # Gruppiere nach Längen
+            tecdoc_lengths = defaultdict(list)
+            target_lengths = defaultdict(list)
+            
+            for val in tecdoc_values:
+                clean_val = clean_str(val)
+                if clean_val:
+                    tecdoc_lengths[len(clean_val)].append(clean_val)
+            
+            for val in target_values:
+                clean_val = clean_str(val)
+                if clean_val:
+                    target_lengths[len(clean_val)].append(clean_val)
+            
+            # Finde gemeinsame Längen
+            for length in tecdoc_lengths:
+                if length in target_lengths:
+                    matches += min(len(tecdoc_lengths[length]), len(target_lengths[length]))
+                    if len(examples) < 5:
+                        examples.append(str(length))
+            
+        except Exception as e:
+            print(f"⚠️ Fehler bei length_based_match: {e}")
+        
+        return matches, examples
+    
+    def run_all_methods(self, tecdoc_values: List, target_values: List) -> Dict[str, Tuple[int, List[str]]]:
+        """Führe alle deterministischen Methoden aus"""
+        results = {}
+        
+        for method_name, method_func in self.methods.items():
+            try:
+                matches, examples = method_func(tecdoc_values, target_values)
+                results[method_name] = (matches, examples)
+            except Exception as e:
+                print(f"⚠️ Fehler bei {method_name}: {e}")
+                results[method_name] = (0, [])
+        
+        return results
+
+# =============================================================================
+# FUZZY
+# =============================================================================
+
+class ReferenceFuzzyMatcher:
+    """Zentrale Klasse für Fuzzy/Probabilistische Matching-Algorithmen"""
+    
+    def __init__(self, similarity_threshold: float = None):
+        self.threshold = similarity_threshold or Config.SIMILARITY_THRESHOLD
+        
+        self.methods = {
+            'Levenshtein': self.levenshtein_match,
+            'Numerisch_Toleranz': self.numeric_tolerance_match,
+            'Teilstring_Fuzzy': self.fuzzy_substring_match,
+            'Längen_Toleranz': self.length_tolerance_match
+        }
+        
+        # Jaro-Winkler nur wenn verfügbar
+        if JELLYFISH_AVAILABLE:
+            self.methods['Jaro_Winkler'] = self.jaro_winkler_match
+    
+    def levenshtein_match(self, tecdoc_values: List, target_values: List) -> Tuple[int, List[str]]:
+        """Levenshtein-basiertes Fuzzy Matching"""
+        matches = 0
+        examples = []
+        
+        try:
+            # Bereite Daten vor
+            tecdoc_clean = [clean_str(val) for val in tecdoc_values 
+                           if clean_str(val) and len(clean_str(val)) >= Config.MIN_STRING_LENGTH]
+            target_clean = [clean_str(val) for val in target_values 
+                           if clean_str(val) and len(clean_str(val)) >= Config.MIN_STRING_LENGTH]
+            
+            # Berechne Ähnlichkeiten
+            for tec_val in tecdoc_clean:
+                best_similarity = 0
+                best_match = None
+                
+                for target_val in target_clean:
+                    similarity = SequenceMatcher(None, tec_val, target_val).ratio()
+                    if similarity > best_similarity and similarity >= self.threshold:
+                        best_similarity = similarity
+                        best_match = target_val
+                
+                if best_match:
+                    matches += 1
+                    if len(examples) < 5:
+                        examples.append(f"'{tec_val}' ↔ '{best_match}' ({best_similarity:.2f})")
+            
+        except Exception as e:
+            print(f"⚠️ Fehler bei levenshtein_match: {e}")
+        
+        return matches, examples
+    
+    def jaro_winkler_match(self, tecdoc_values: List, target_values: List) -> Tuple[int, List[str]]:
+        """Jaro-Winkler Similarity Matching"""
+        if not JELLYFISH_AVAILABLE:
+            return 0, []
+        
+        matches = 0
+        examples = []
+        
+        try:
+            # Bereite Daten vor
+            tecdoc_clean = [clean_str(val) for val in tecdoc_values 
+                           if clean_str(val) and len(clean_str(val)) >= Config.MIN_STRING_LENGTH]
+            target_clean = [clean_str(val) for val in target_values 
+                           if clean_str(val) and len(clean_str(val)) >= Config.MIN_STRING_LENGTH]
+            
+            # Berechne Jaro-Winkler Ähnlichkeiten
+            for tec_val in tecdoc_clean:
+                best_similarity = 0
+                best_match = None
+                
+                for target_val in target_clean:
+                    similarity = jaro_winkler_similarity(tec_val, target_val)
+                    if similarity > best_similarity and similarity >= self.threshold:
+                        best_similarity = similarity
+                        best_match = target_val
+                
+                if best_match:
+                    matches += 1
+                    if len(examples) < 5:
+                        examples.append(f"'{tec_val}' ↔ '{best_match}' ({best_similarity:.2f})")
+            
+        except Exception as e:
+            print(f"⚠️ Fehler bei jaro_winkler_match: {e}")
+        
+        return matches, examples
+    
+    def numeric_tolerance_match(self, tecdoc_values: List, target_values: List,
+                              tolerance_percent: float = 5.0) -> Tuple[int, List[str]]:
+        """Numerisches Matching mit Toleranz"""
+        matches = 0
+        examples = []
+        
+        try:
+            # Extrahiere numerische Werte
+            tecdoc_numeric = []
+            target_numeric = []
+            
+            for val in tecdoc_values:
+                try:
+                    num_val = float(clean_str(val))
+                    if not np.isnan(num_val):
+                        tecdoc_numeric.append(num_val)
+                except:
+                    continue
+            
+            for val in target_values:
+                try:
+                    num_val = float(clean_str(val))
+                    if not np.isnan(num_val):
+                        target_numeric.append(num_val)
+                except:
+                    continue
+            
+            # Finde Matches mit Toleranz
+            for tec_num in tecdoc_numeric:
+                for target_num in target_numeric:
+                    if tec_num == 0 or target_num == 0:
+                        continue
+                    
+                    # Berechne prozentuale Abweichung
+                    diff_percent = abs((tec_num - target_num) / tec_num) * 100
+                    
+                    if diff_percent <= tolerance_percent:
+                        matches += 1
+                        if len(examples) < 5:
+                            examples.append(f"{tec_num} ↔ {target_num} ({diff_percent:.1f}%)")
+                        break  # Ein Match pro TecDoc-Wert
+            
+        except Exception as e:
+            print(f"⚠️ Fehler bei numeric_tolerance_match: {e}")
+        
+        return matches, examples
+    
+    def fuzzy_substring_match(self, tecdoc_values: List, target_values: List,
+                            min_length: int = 4) -> Tuple[int, List[str]]:
+        """Fuzzy Substring-Matching"""
+        matches = 0
+        examples = []
+        
+        try:
+            # Bereite Daten vor
+            tecdoc_clean = [clean_str(val) for val in tecdoc_values 
+                           if clean_str(val) and len(clean_str(val)) >= min_length]
+            target_clean = [clean_str(val) for val in target_values 
+                           if clean_str(val) and len(clean_str(val)) >= min_length]
+            
+            # Finde Fuzzy-Substrings
+            for tec_val in tecdoc_clean:
+                best_similarity = 0
+                best_match = None
+                
+                for target_val in target_clean:
+                    # Prüfe alle möglichen Substrings
+                    for i in range(len(target_val) - min_length + 1):
+                        substring = target_val[i:i + len(tec_val)]
+                        if len(substring) >= min_length:
+                            similarity = SequenceMatcher(None, tec_val, substring).ratio()
+                            if similarity > best_similarity and similarity >= self.threshold:
+                                best_similarity = similarity
+                                best_match = f"{tec_val} in {target_val}"
+                
+                if best_match:
+                    matches += 1
+                    if len(examples) < 5:
+                        examples.append(f"{best_match} ({best_similarity:.2f})")
+            
+        except Exception as e:
+            print(f"⚠️ Fehler bei fuzzy_substring_match: {e}")
+        
+        return matches, examples
+    
+    def length_tolerance_match(self, tecdoc_values: List, target_values: List,
+                             max_diff: int = 2) -> Tuple[int, List[str]]:
+        """Längen-Toleranz Matching (ähnliche Längen)"""
+        matches = 0
+        examples = []
+        
+        try:
+            # Gruppiere nach ähnlichen Längen
+            from collections import defaultdict
+            
+            tecdoc_by_length = defaultdict(list)
+            target_by_length = defaultdict(list)
+            
+            for val in tecdoc_values:
+                clean_val = clean_str(val)
+                if clean_val:
+                    tecdoc_by_length[len(clean_val)].append(clean_val)
+            
+            for val in target_values:
+                clean_val = clean_str(val)
+                if clean_val:
+                    target_by_length[len(clean_val)].append(clean_val)
+            
+            # Finde Matches mit Längen-Toleranz
+            for tec_length, tec_vals in tecdoc_by_length.items():
+                for target_length in range(max(1, tec_length - max_diff), 
+                                         tec_length + max_diff + 1):
+                    if target_length in target_by_length:
+                        potential_matches = min(len(tec_vals), len(target_by_length[target_length]))
+                        matches += potential_matches
+                        
+                        if len(examples) < 5 and potential_matches > 0:
+                            examples.append(f"Länge {tec_length} ↔ {target_length}")
+            
+        except Exception as e:
+            print(f"⚠️ Fehler bei length_tolerance_match: {e}")
+        
+        return matches, examples
+    
+    def run_all_methods(self, tecdoc_values: List, target_values: List) -> Dict[str, Tuple[int, List[str]]]:
+        """Führe alle Fuzzy-Methoden aus"""
+        results = {}
+        
+        for method_name, method_func in self.methods.items():
+            try:
+                matches, examples = method_func(tecdoc_values, target_values)
+                results[method_name] = (matches, examples)
+            except Exception as e:
+                print(f"⚠️ Fehler bei {method_name}: {e}")
+                results[method_name] = (0, [])
+        
+        return results
+
+# =============================================================================
+# TESTDATEN
+# =============================================================================
+
+def matching_values(n: int = 300, seed: int = 0, offset: int = 0) -> List:
+    """
+    Gemischte Spaltenwerte: Artikelnummern mit Satzzeichen, Zahlen, Floats,
+    Duplikate, Umlaute, Vollbreite-Ziffern und Werte über 12 Zeichen
+    """
+    rng = np.random.default_rng(seed)
+    pool = ['AB-123.45', 'ab 12345', '0042', 42, 3.0, 'Straße', 'x', 'ABCDEFGHIJKLMNOP',
+            'ÄBC-1', '１２', ' 12 ', '', '12345678901234567890', 'K-9', 7, 'abcdefghijklm-1']
+    values = []
+    for i in range(n):
+        kind = rng.integers(4)
+        if kind == 0:
+            values.append(pool[rng.integers(len(pool))])
+        elif kind == 1:
+            values.append(f"{rng.choice(['A', 'B', 'k'])}{rng.integers(100 + offset)}-{rng.integers(3)}")
+        elif kind == 2:
+            values.append(int(rng.integers(2000 + offset)))
+        else:
+            values.append(f"W{rng.integers(50)}.{rng.integers(10)} X{offset + rng.integers(30)}")
+    return values
+
+def match_counts(results: Dict[str, Tuple[int, List[str]]]) -> Dict[str, int]:
+    """Trefferzahlen je Methode (Beispiele hängen von der Mengen-Reihenfolge ab)"""
+    return {method: matches for method, (matches, _) in results.items()}
+
+def reference_results(matcher, tecdoc_data, target_data, target_columns: List[str],
+                      tecdoc_columns: List[str], chunk_size: int):
+    """Ergebnistabelle der ursprünglichen Chunk-Schleife (_run_csv_matching/_run_xml_matching)"""
+    import pandas as pd
+
+    is_xml = isinstance(target_data, dict)
+    label, source = ('XML_Tag', 'XML') if is_xml else ('CMD_Spalte', 'CMD')
+    results = []
+    for chunk_num in range(len(tecdoc_data) // chunk_size + 1):
+        chunk = tecdoc_data.iloc[chunk_num * chunk_size:(chunk_num + 1) * chunk_size]
+        for tecdoc_col in tecdoc_columns:
+            tecdoc_values = chunk[tecdoc_col].dropna().tolist()
+            if not tecdoc_values:
+                continue
+            for target_col in target_columns:
+                if is_xml:
+                    target_values = target_data.get(target_col, [])
+                elif target_col in target_data.columns:
+                    target_values = target_data[target_col].dropna().tolist()
+                else:
+                    target_values = []
+                if not target_values:
+                    continue
+                for method_name, (matches, _) in matcher.run_all_methods(tecdoc_values,
+                                                                         target_values).items():
+                    results.append({'Chunk': chunk_num + 1, 'TecDoc_Spalte': tecdoc_col,
+                                    label: target_col, 'Methode': method_name, 'Matches': matches,
+                                    'TecDoc_Anzahl': len(tecdoc_values),
+                                    f'{source}_Anzahl': len(target_values)})
+    return pd.DataFrame(results)
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests für den Aho-Corasick-Automaten (src/utils/aho_corasick.py)
+"""
+
+import numpy as np
+import pytest
+
+from src.matching.deterministic import DeterministicMatcher
+from src.utils import aho_corasick
+from src.utils.aho_corasick import AhoCorasick, first_containing
+from reference_matching import ReferenceDeterministicMatcher
+
+def random_words(n: int, seed: int, alphabet: str = 'ABC', max_length: int = 6):
+    rng = np.random.default_rng(seed)
+    return [''.join(rng.choice(list(alphabet), rng.integers(0, max_length + 1))) for _ in range(n)]
+
+def naive_first_containing(patterns, texts):
+    found = {}
+    for pattern in patterns:
+        for index, text in enumerate(texts):
+            if pattern in text and pattern != text:
+                found[pattern] = index
+                break
+    return found
+
+@pytest.fixture(params=['python', 'pyahocorasick'])
+def backend(request, monkeypatch):
+    if request.param == 'pyahocorasick' and not aho_corasick.AHOCORASICK_AVAILABLE:
+        pytest.skip("pyahocorasick nicht installiert")
+    monkeypatch.setattr(aho_corasick, 'AHOCORASICK_AVAILABLE', request.param == 'pyahocorasick')
+
+def test_automaton_finds_all_occurrences():
+    patterns = ['HE', 'SHE', 'HIS', 'HERS', 'E', 'ÄÖ']
+    text = 'USHERSHISÄÖE'
+    automaton = AhoCorasick(patterns)
+    expected = sorted((start + len(pattern) - 1, index) for index, pattern in enumerate(patterns)
+                      for start in range(len(text)) if text.startswith(pattern, start))
+    assert sorted(automaton.iter(text)) == expected
+
+@pytest.mark.parametrize('seed', range(5))
+def test_first_containing_matches_naive(backend, seed):
+    patterns, texts = random_words(60, seed), random_words(80, seed + 100, max_length=9)
+    assert first_containing(patterns, texts) == naive_first_containing(patterns, texts)
+
+def test_substring_match_matches_reference():
+    tecdoc = random_words(150, 1, alphabet='AB12-', max_length=6)
+    target = random_words(200, 2, alphabet='AB12-', max_length=10)
+    expected = ReferenceDeterministicMatcher().substring_match(tecdoc, target)
+    for distinct in (True, False):
+        result = DeterministicMatcher(distinct_values=distinct).substring_match(tecdoc, target)
+        assert result[0] == expected[0] > 0
+    assert DeterministicMatcher(distinct_values=False).substring_match(tecdoc, target) == expected
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests für die String-Arena (src/utils/arena.py)
+"""
+
+import pickle
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.matching.deterministic import DeterministicMatcher
+from src.utils.arena import StringArena
+from src.utils.normalization import normalize_series
+from reference_matching import ReferenceDeterministicMatcher, match_counts, matching_values
+
+pa = pytest.importorskip("pyarrow")
+
+VALUES = ['ab-1', None, 'Straße', 12, 3.5, float('nan'), '', 'ΩX']
+
+def test_from_values_matches_dropna():
+    arena = StringArena.from_values(VALUES)
+    expected = [str(value) for value in pd.Series(VALUES, dtype=object).dropna()]
+    assert arena.tolist() == expected
+    assert [arena[i] for i in range(len(arena))] == expected
+
+def test_from_series_is_zero_copy_for_arrow_strings():
+    series = pd.Series(['a', None, 'bcd'], dtype='str')
+    arena = StringArena.from_series(series)
+    assert arena.tolist() == ['a', 'bcd']
+    assert StringArena.from_series(pd.Series([1, None, 3])).tolist() == ['1.0', '3.0']
+
+    array = pa.array(['xy', 'z'])
+    arena = StringArena.from_arrow(array)
+    assert np.shares_memory(arena.data, np.frombuffer(array.buffers()[2], dtype=np.uint8))
+
+def test_sliced_arrays_are_rebased():
+    series = pd.Series([f"v-{i}" for i in range(100)], dtype='str')
+    chunk = StringArena.from_series(series.iloc[40:60])
+    assert chunk.offsets[0] == 0
+    assert chunk.tolist() == series.iloc[40:60].tolist()
+    # Arrow-Kernels auf der Sicht liefern die Werte des Ausschnitts
+    assert normalize_series(chunk).tolist() == [f"V{i}" for i in range(40, 60)]
+
+def test_chunks_match_reference():
+    tecdoc = pd.Series([str(value) for value in matching_values(300, seed=1)], dtype='str')
+    target = matching_values(400, seed=2, offset=50)
+    matcher = DeterministicMatcher()
+    for start in (0, 100, 200):
+        chunk = tecdoc.iloc[start:start + 100]
+        expected = ReferenceDeterministicMatcher().run_all_methods(chunk.dropna().tolist(), target)
+        result = matcher.run_all_methods(StringArena.from_series(chunk), StringArena.from_values(target))
+        assert match_counts(result) == match_counts(expected)
+
+def test_shared_arena_pickles_by_name():
+    arena = StringArena.from_values(['a', 'bc', 'déf']).share()
+    try:
+        payload = pickle.dumps(arena)
+        assert len(payload) < 500
+        copy = pickle.loads(payload)
+        assert copy.tolist() == ['a', 'bc', 'déf']
+        copy.close()
+    finally:
+        arena.unlink()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Tests für den Arrow-IPC-Eingabecache (src/utils/cache.py)
+"""
+
+import os
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from src.utils.cache import (InputCache, cached_frame, file_fingerprint,
+                             frame_to_xml_values, xml_values_to_frame)
+from src.utils.core import Config, load_tecdoc_data
+
+# =============================================================================
+# FINGERPRINTS
+# =============================================================================
+
+def test_fingerprint_changes_with_content(tmp_path):
+    path = tmp_path / "a.csv"
+    path.write_text("artno\n1\n")
+    before = file_fingerprint(path)
+    assert file_fingerprint(path) == before
+
+    stat = path.stat()
+    path.write_text("artno\n2\n")
+    # Gleiche Größe und mtime: nur die Inhaltsstichprobe unterscheidet
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert file_fingerprint(path) != before
+
+# =============================================================================
+# LADEN UND SCHREIBEN
+# =============================================================================
+
+def test_roundtrip_keeps_values_and_dtypes(data_dirs):
+    frame = pd.DataFrame({'artno': pd.Series(['007', 'A-1', None], dtype='str'),
+                          'brandno': pd.Series([1, 2, 3], dtype='int16'),
+                          'tag': pd.Categorical(['x', 'y', 'x'])})
+    calls = []
+    loader = lambda: calls.append(1) or frame
+
+    first = cached_frame('tecdoc', [], 'v1', loader, use_cache=True)
+    second = cached_frame('tecdoc', [], 'v1', loader, use_cache=True)
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+    pd.testing.assert_frame_equal(second, frame)
+
+def test_loaded_frame_is_writable(data_dirs):
+    cache = InputCache()
+    entry = cache.entry_path('tecdoc', [], 'v1')
+    cache.store(entry, pd.DataFrame({'brandno': [1, 2, 3], 'artno': ['a', 'b', 'c']}))
+
+    data = cache.load(entry)
+    data.loc[0, 'brandno'] = 9
+    data.loc[1, 'artno'] = 'z'
+    assert data['brandno'].tolist() == [9, 2, 3]
+    assert data['artno'].tolist() == ['a', 'z', 'c']
+
+def test_corrupt_entry_is_removed(data_dirs):
+    cache = InputCache()
+    entry = cache.entry_path('tecdoc', [], 'v1')
+    cache.cache_dir.mkdir(parents=True)
+    entry.write_bytes(b"kein arrow")
+
+    assert cache.load(entry) is None
+    assert not entry.exists()
+
+def test_source_change_invalidates(tecdoc_csv):
+    first = load_tecdoc_data(sample_mode=False, use_cache=True)
+    pd.DataFrame({'artno': ['X'], 'brandno': [1], 'batchsize1': [1],
+                  'batchsize2': [1]}).to_csv(tecdoc_csv, index=False)
+    second = load_tecdoc_data(sample_mode=False, use_cache=True)
+
+    assert len(first) == 200
+    assert second['artno'].tolist() == ['X']
+    assert len(list(Config.CACHE_DIR.glob("tecdoc-*.arrow"))) == 1
+
+# =============================================================================
+# VERDRÄNGUNG
+# =============================================================================
+
+def test_variant_limit_per_name(data_dirs):
+    cache = InputCache(max_variants=2)
+    frame = pd.DataFrame({'a': [1]})
+    for variant in ['v1', 'v2', 'v3']:
+        cache.store(cache.entry_path('tecdoc', [], variant), frame)
+    cache.store(cache.entry_path('tecdoc_brands', [], 'v1'), frame)
+
+    names = sorted(path.name.rsplit("-", 2)[0] for path in cache.cache_dir.glob("*.arrow"))
+    assert names == ['tecdoc', 'tecdoc', 'tecdoc_brands']
+    assert cache.entry_path('tecdoc', [], 'v3').exists()
+    assert not cache.entry_path('tecdoc', [], 'v1').exists()
+
+def test_size_limit_keeps_new_entry(data_dirs):
+    frame = pd.DataFrame({'a': range(1000)})
+    cache = InputCache(max_bytes=1)
+    first = cache.entry_path('tecdoc', [], 'v1')
+    second = cache.entry_path('cmd_csv', [], 'v1')
+    cache.store(first, frame)
+    cache.store(second, frame)
+
+    assert not first.exists()
+    assert second.exists()
+
+def test_xml_values_roundtrip():
+    xml_data = {'TradeNo': ['1', '2'], 'Brand': [], 'Volume': ['0.5']}
+    assert frame_to_xml_values(xml_values_to_frame(xml_data)) == xml_data
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Tests für die Zeichenmatrix (src/utils/char_matrix.py)
+"""
+
+import pytest
+
+from src.matching.deterministic import DeterministicMatcher
+from src.utils.char_matrix import CharMatrix, latin1_keys, unpack_latin1
+from reference_matching import ReferenceDeterministicMatcher, match_counts, matching_values
+
+VALUES = ['ABCDE', 'AB', 'ÄBCDEF', 'ΩMEGA-1', 'X' * 40, '']
+
+def test_matrix_layout():
+    matrix = CharMatrix(VALUES, max_width=32)
+    assert matrix.width == 32 and matrix.matrix.dtype.itemsize == 4
+    assert matrix.truncated.tolist() == [False] * 4 + [True, False]
+    assert CharMatrix(['ab', 'äb']).matrix.dtype.itemsize == 1
+
+@pytest.mark.parametrize('kind', ['prefix', 'suffix'])
+@pytest.mark.parametrize('length', [1, 3, 5, 9, 35])
+def test_affix_keys_match_strings(kind, length):
+    keys = CharMatrix(VALUES, max_width=32).affix_keys(kind, length)
+    expected = {value[:length] if kind == 'prefix' else value[-length:]
+                for value in VALUES if len(value) >= length}
+    assert set(keys.decode(keys.codes)) | keys.rest == expected
+    assert len(keys) == len(expected)
+
+def test_latin1_keys_roundtrip():
+    assert unpack_latin1(latin1_keys(['ÄB1', 'XYZ'], 3), 3) == ['ÄB1', 'XYZ']
+
+def test_matrix_encoding_matches_reference():
+    tecdoc, target = matching_values(300, seed=1), matching_values(400, seed=2, offset=50)
+    expected = ReferenceDeterministicMatcher().run_all_methods(tecdoc, target)
+    result = DeterministicMatcher(key_encoding='matrix').run_all_methods(tecdoc, target)
+    assert match_counts(result) == match_counts(expected)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests für komprimierte Eingaben (gzip, xz, bz2, zstd)
+"""
+
+import bz2
+import gzip
+import lzma
+import pandas as pd
+import pytest
+
+from src.utils.core import (Config, extract_xml_values, load_tecdoc_data, open_input,
+                            resolve_input_file)
+from conftest import tecdoc_frame, xml_document
+
+def _compress(data: bytes, suffix: str) -> bytes:
+    if suffix == '.gz':
+        return gzip.compress(data)
+    if suffix == '.xz':
+        return lzma.compress(data)
+    if suffix == '.bz2':
+        return bz2.compress(data)
+    zstandard = pytest.importorskip("zstandard")
+    return zstandard.ZstdCompressor().compress(data)
+
+SUFFIXES = ['.gz', '.xz', '.bz2', '.zst']
+
+@pytest.mark.parametrize('suffix', SUFFIXES)
+def test_open_input_roundtrip(tmp_path, suffix):
+    data = b"artno\n" + b"x\n" * 1000
+    path = tmp_path / f"a.csv{suffix}"
+    path.write_bytes(_compress(data, suffix))
+    with open_input(path) as f:
+        assert f.read() == data
+
+@pytest.mark.parametrize('suffix', SUFFIXES)
+@pytest.mark.parametrize('sample_mode', [True, False])
+def test_tecdoc_compressed_equals_raw(data_dirs, suffix, sample_mode, monkeypatch):
+    monkeypatch.setattr(Config, 'SAMPLE_CHUNKS', 2)
+    raw = tecdoc_frame().to_csv(index=False).encode()
+    (Config.INPUT_DIR / Config.TECDOC_FILE).write_bytes(raw)
+    expected = load_tecdoc_data(chunk_size=40, sample_mode=sample_mode, use_cache=False)
+
+    (Config.INPUT_DIR / Config.TECDOC_FILE).unlink()
+    compressed = Config.INPUT_DIR / f"{Config.TECDOC_FILE}{suffix}"
+    compressed.write_bytes(_compress(raw, suffix))
+    assert resolve_input_file(Config.TECDOC_FILE) == compressed
+
+    data = load_tecdoc_data(chunk_size=40, sample_mode=sample_mode, use_cache=False)
+    pd.testing.assert_frame_equal(data, expected)
+
+@pytest.mark.parametrize('suffix', ['.gz', '.zst'])
+def test_xml_compressed_equals_raw(data_dirs, suffix, monkeypatch):
+    monkeypatch.setattr(Config, 'XML_TARGET_TAGS', ['SupplierPtNo', 'TradeNo'])
+    xml_dir = Config.INPUT_DIR / Config.CMD_XML_DIR
+    xml_dir.mkdir()
+    document = xml_document(40).encode()
+    (xml_dir / "a.xml").write_bytes(document)
+    expected = extract_xml_values(use_cache=False)
+
+    (xml_dir / "a.xml").unlink()
+    (xml_dir / f"a.xml{suffix}").write_bytes(_compress(document, suffix))
+    assert extract_xml_values(use_cache=False) == expected
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests für das Laden der CSV-Eingaben (Projektion, kompakte Datentypen, Reader)
+"""
+
+import pandas as pd
+
+from src.utils.core import (Config, compact_frame_dtypes, csv_read_options,
+                            load_cmd_csv_data, load_tecdoc_data)
+
+# =============================================================================
+# PROJEKTION UND DATENTYPEN
+# =============================================================================
+
+def test_read_options_project_existing_columns(tecdoc_csv):
+    options = csv_read_options(tecdoc_csv, ['artno', 'brandno', 'fehlt'], compact_dtypes=True)
+    assert options == {'usecols': ['artno', 'brandno'], 'dtype': {'artno': str}}
+    assert csv_read_options(tecdoc_csv, compact_dtypes=False) == {}
+
+def test_projection_and_leading_zeros(tecdoc_csv):
+    data = load_tecdoc_data(sample_mode=False, use_cache=False, columns=['artno'],
+                            compact_dtypes=True)
+    assert list(data.columns) == ['artno']
+    assert isinstance(data['artno'].dtype, pd.CategoricalDtype)
+    assert data['artno'].iloc[0] == '00-0'
+
+def test_compact_values_unchanged(tecdoc_csv):
+    compact = load_tecdoc_data(sample_mode=False, use_cache=False, compact_dtypes=True)
+    plain = load_tecdoc_data(sample_mode=False, use_cache=False, compact_dtypes=False)
+
+    assert compact['brandno'].dtype == 'int8'
+    assert compact['batchsize1'].dtype == plain['batchsize1'].dtype == 'float64'
+    for col in ['brandno', 'batchsize1', 'batchsize2']:
+        assert compact[col].astype(str).tolist() == plain[col].astype(str).tolist()
+
+def test_compact_frame_dtypes_downcasts_integers():
+    frame = pd.DataFrame({'artno': ['1', '1', '2'], 'n': [1, 2, 300], 'f': [1.0, None, 2.0]})
+    compact = compact_frame_dtypes(frame.copy())
+    assert compact['n'].dtype == 'int16'
+    assert compact['f'].dtype == 'float64'
+    assert list(compact['artno'].cat.categories) == ['1', '2']
+
+def test_numeric_ids_keep_leading_zeros(data_dirs):
+    pd.DataFrame({'artno': ['007', '12']}).to_csv(Config.INPUT_DIR / Config.TECDOC_FILE, index=False)
+    compact = load_tecdoc_data(sample_mode=False, use_cache=False, compact_dtypes=True)
+    plain = load_tecdoc_data(sample_mode=False, use_cache=False, compact_dtypes=False)
+    assert compact['artno'].tolist() == ['007', '12']
+    assert plain['artno'].tolist() == [7, 12]
+
+def test_cmd_csv_projection(data_dirs):
+    pd.DataFrame({'article_number': ['007', '8'], 'brand': ['A', 'B'], 'x': [1, 2]}).to_csv(
+        Config.INPUT_DIR / "cmd_daten.csv", index=False)
+    data = load_cmd_csv_data(use_cache=False, columns=['article_number', 'brand'])
+    assert list(data.columns) == ['article_number', 'brand']
+    assert data['article_number'].astype(str).tolist() == ['007', '8']
+
+# =============================================================================
+# PYARROW-READER
+# =============================================================================
+
+import pytest
+
+from src.utils.arrow_csv import PYARROW_AVAILABLE, iter_csv_batches, read_csv_arrow
+
+needs_arrow = pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow fehlt")
+
+MIXED_CSV = ('artno,brand,menge,gewicht,leer,flag\n'
+             '007,A,1,1.5,,True\n'
+             ',,2,,,False\n'
+             'NA,"",,2.0,,True\n'
+             'X-1,B,4,3,,\n')
+
+@needs_arrow
+@pytest.mark.parametrize('options', [{}, {'dtype': {'artno': str}},
+                                     {'usecols': ['artno', 'menge'], 'dtype': {'artno': str}}])
+def test_arrow_engine_matches_pandas(tmp_path, options):
+    path = tmp_path / "mixed.csv"
+    path.write_text(MIXED_CSV)
+
+    expected = pd.read_csv(path, **options)
+    pd.testing.assert_frame_equal(read_csv_arrow(path, options), expected)
+    pd.testing.assert_frame_equal(read_csv_arrow(path, options, nrows=3),
+                                  pd.read_csv(path, nrows=3, **options))
+
+@needs_arrow
+def test_arrow_stream_types_span_all_blocks(tmp_path):
+    # Erste Blöcke nur Ganzzahlen, später Text bzw. Dezimalzahlen
+    rows = [f"{i},{i}" for i in range(2000)] + ["A-1,2.5"] + [f"{i},{i}" for i in range(10)]
+    path = tmp_path / "late.csv"
+    path.write_text("artno,menge\n" + "\n".join(rows) + "\n")
+
+    data = read_csv_arrow(path, {}, nrows=2005, block_size=1024)
+    expected = pd.read_csv(path, nrows=2005)
+    pd.testing.assert_frame_equal(data, expected)
+    assert sum(len(batch) for batch in iter_csv_batches(path, {}, block_size=1024)) == 2011
+
+@needs_arrow
+@pytest.mark.parametrize('sample_mode', [True, False])
+def test_tecdoc_engines_identical(tecdoc_csv, sample_mode, monkeypatch):
+    monkeypatch.setattr(Config, 'SAMPLE_CHUNKS', 2)
+    frames = [load_tecdoc_data(chunk_size=50, sample_mode=sample_mode, use_cache=False,
+                               compact_dtypes=compact, engine=engine)
+              for compact in (True, False) for engine in ('c', 'pyarrow')]
+    pd.testing.assert_frame_equal(frames[0], frames[1])
+    pd.testing.assert_frame_equal(frames[2], frames[3])
+    assert frames[1]['batchsize1'].isna().sum() == frames[0]['batchsize1'].isna().sum() > 0
+
+@needs_arrow
+def test_profile_nullrate_engine_independent(tmp_path, monkeypatch):
+    from src.utils.profiler import profile_csv_columns
+
+    path = tmp_path / "mixed.csv"
+    path.write_text(MIXED_CSV)
+    profiles = []
+    for engine in ('c', 'pyarrow'):
+        monkeypatch.setattr(Config, 'CSV_ENGINE', engine)
+        profiles.append(profile_csv_columns(path))
+
+    pd.testing.assert_frame_equal(profiles[0], profiles[1])
+    assert profiles[1].set_index('Spalte')['Nullrate'].to_dict()['brand'] == 0.5
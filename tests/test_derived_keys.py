@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Tests für die gemeinsame Schlüsselableitung (NormalizedColumn.derive_keys)
+"""
+
+import pytest
+
+from src.matching.deterministic import DeterministicMatcher
+from src.matching.normalized import NormalizedColumn
+from src.utils.arena import StringArena
+from src.utils.core import Config
+from reference_matching import ReferenceDeterministicMatcher, match_counts, matching_values
+
+VALUES = matching_values(300, seed=1) + [' ab-12 ', '٣٤٥', '²', ' . - ', 'a b-cd']
+VARIANTS = [('clean_set',), ('numeric_set',), ('normalized_set',), ('prefixes', 5),
+            ('suffixes', 5), ('length_counts',), ('weighted_min', 3)]
+
+def variant(column: NormalizedColumn, name: str, *args):
+    value = getattr(column, name)
+    return value(*args) if args else value
+
+@pytest.mark.parametrize('as_arena', [False, True])
+def test_derived_variants_equal_separate(as_arena):
+    values = StringArena.from_values(VALUES) if as_arena else VALUES
+    derived = NormalizedColumn(values).derive_keys(5, 3)
+    separate = NormalizedColumn(values)
+    for name, *args in VARIANTS:
+        assert variant(derived, name, *args) == variant(separate, name, *args), name
+
+def test_other_profiles_keep_normalized_separate(monkeypatch):
+    monkeypatch.setitem(Config.NORMALIZATION_PROFILES, 'punct',
+                        {'remove_chars': '.- ', 'nfkc': True, 'fold_umlauts': True})
+    derived = NormalizedColumn(VALUES).derive_keys(5, 3)
+    assert 'normalized_set' not in derived._variants
+    assert derived.normalized_set == NormalizedColumn(VALUES).normalized_set
+
+@pytest.mark.parametrize('fused', [True, False])
+def test_fused_matches_reference(fused):
+    # Ohne '²': get_numeric_values bricht bei int('²') ab, die Referenz zählt dann nichts
+    values = [value for value in VALUES if value != '²']
+    target = matching_values(400, seed=2, offset=50)
+    expected = ReferenceDeterministicMatcher().run_all_methods(values, target)
+    result = DeterministicMatcher(fused=fused).run_all_methods(values, target)
+    assert match_counts(result) == match_counts(expected)
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Tests für das Matching je eindeutigem Wert (Config.DISTINCT_VALUES)
+"""
+
+import pytest
+
+from src.matching.deterministic import DeterministicMatcher
+from src.matching.fuzzy import FuzzyMatcher
+from src.matching.normalized import NormalizedColumn
+from reference_matching import (ReferenceDeterministicMatcher, ReferenceFuzzyMatcher,
+                                match_counts, matching_values)
+
+# Viele Wiederholungen: 40 Werte aus wenigen eindeutigen
+TECDOC = matching_values(20, seed=3) * 3
+TARGET = matching_values(30, seed=4, offset=20) * 2
+
+def test_weighted_values_keep_first_occurrence():
+    column = NormalizedColumn(['b-1', 'abc', 'B-1', 'x', 'abc'])
+    assert column.weighted_min(3) == (['B-1', 'ABC'], [2, 2])
+    assert column.weighted_min(3, distinct=False) == (['B-1', 'ABC', 'B-1', 'ABC'], [1, 1, 1, 1])
+
+@pytest.mark.parametrize('distinct', [True, False])
+def test_deterministic_matches_reference(distinct):
+    expected = ReferenceDeterministicMatcher().run_all_methods(TECDOC, TARGET)
+    result = DeterministicMatcher(distinct_values=distinct).run_all_methods(TECDOC, TARGET)
+    assert match_counts(result) == match_counts(expected)
+
+@pytest.mark.parametrize('distinct', [True, False])
+def test_fuzzy_matches_reference(distinct):
+    expected = ReferenceFuzzyMatcher().run_all_methods(TECDOC, TARGET)
+    result = FuzzyMatcher(distinct_values=distinct).run_all_methods(TECDOC, TARGET)
+    assert match_counts(result) == match_counts(expected)
+
+def test_examples_without_repeats():
+    substring = DeterministicMatcher(distinct_values=True).substring_match(['abc'] * 4, ['xabcx'])
+    assert substring == (4, ["'ABC' ↔ 'XABCX'"])
+    loop = DeterministicMatcher(distinct_values=False).substring_match(['abc'] * 4, ['xabcx'])
+    assert loop == (4, ["'ABC' ↔ 'XABCX'"] * 4)
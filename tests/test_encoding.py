@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+Tests für das Dictionary-Encoding (src/utils/encoding.py)
+"""
+
+import numpy as np
+
+from src.matching.deterministic import DeterministicMatcher
+from src.matching.normalized import PreparedTarget
+from src.utils.encoding import ValueDictionary, intersect_ids
+from reference_matching import ReferenceDeterministicMatcher, match_counts, matching_values
+
+TECDOC = matching_values(300, seed=1)
+TARGET = matching_values(400, seed=2, offset=50)
+
+def test_encode_and_lookup():
+    dictionary = ValueDictionary()
+    assert dictionary.encode(['b', 'a', 'b']).tolist() == [0, 1, 0]
+    assert dictionary.encode_set(['c', 'a', 'c']).tolist() == [1, 2]
+    assert dictionary.lookup_set(['x', 'c', 'b', 'c']).tolist() == [0, 2]
+    assert len(dictionary) == 3 and 'x' not in dictionary
+    assert dictionary.decode([2, 0]) == ['c', 'b']
+    assert intersect_ids(np.array([0, 2, 5]), np.array([2, 3, 5])).tolist() == [2, 5]
+
+def test_dictionary_matches_reference():
+    expected = ReferenceDeterministicMatcher().run_all_methods(TECDOC, TARGET)
+    result = DeterministicMatcher(key_encoding='dictionary').run_all_methods(TECDOC, TARGET)
+    assert match_counts(result) == match_counts(expected)
+
+def test_chunks_do_not_grow_target_dictionary():
+    matcher = DeterministicMatcher(key_encoding='dictionary')
+    target = PreparedTarget(TARGET, 'article_number', matcher)
+    sizes = {key: len(value[0]) for key, value in target._variants.items()
+             if isinstance(key, tuple) and key[0] == 'encoded'}
+    assert sizes
+
+    for seed in range(5):
+        chunk = matching_values(200, seed=10 + seed, offset=500)
+        assert match_counts(matcher.run_all_methods(chunk, target)) == \
+            match_counts(ReferenceDeterministicMatcher().run_all_methods(chunk, TARGET))
+    assert {key: len(target._variants[key][0]) for key in sizes} == sizes
+    assert not hasattr(matcher, 'dictionary')
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests für den globalen Hash-Join über alle Chunks (src/matching/global_join.py)
+"""
+
+import pandas as pd
+import pytest
+
+from src.matching.deterministic import run_deterministic_matching
+from src.matching.global_join import TargetIndex, run_global_matching
+from src.utils.core import Config
+from conftest import late_gap_csv
+from reference_matching import ReferenceDeterministicMatcher, match_counts, matching_values
+
+TECDOC = pd.DataFrame({'artno': [str(value) for value in matching_values(250, seed=5)],
+                       'brandno': [i % 9 for i in range(250)]})
+TARGET = pd.DataFrame({'article_number': matching_values(150, seed=7, offset=30),
+                       'ean': matching_values(150, seed=8)})
+METHODS = ['Exakt', 'Prefix', 'Suffix', 'Numerisch_Exakt']
+
+def test_target_index_probe():
+    index = TargetIndex(['A', 'B', 'C'])
+    bitmap = index.bitmap()
+    index.probe({'C', 'X'}, bitmap)
+    index.probe({'A', 'C'}, bitmap)
+    assert bitmap.tolist() == [True, False, True]
+
+@pytest.mark.parametrize('chunk_size', [40, 1000])
+def test_global_counts_match_single_chunk_reference(chunk_size, monkeypatch, capsys):
+    monkeypatch.setattr(Config, 'CHUNK_SIZE', chunk_size)
+    results = run_deterministic_matching(TECDOC, TARGET, ['article_number', 'ean'],
+                                         ['artno', 'brandno'], sample_mode=False, scope='global')
+
+    reference = ReferenceDeterministicMatcher()
+    for row in results.itertuples():
+        expected = match_counts(reference.run_all_methods(TECDOC[row.TecDoc_Spalte].tolist(),
+                                                          TARGET[row.CMD_Spalte].tolist()))
+        assert row.Matches == expected[row.Methode]
+        assert row.TecDoc_Anzahl == len(TECDOC)
+    assert sorted(results['Methode'].unique()) == sorted(METHODS)
+    assert "Substring und Längenbasiert werden nicht berechnet" in capsys.readouterr().out
+
+def test_streamed_late_gaps_match_chunk_scope(data_dirs, monkeypatch):
+    monkeypatch.setattr(Config, 'USE_CACHE', False)
+    late_gap_csv(Config.INPUT_DIR / Config.TECDOC_FILE)
+    target = pd.DataFrame({'article_number': [f"{i % 5}.0" for i in range(20)],
+                           'ean': [str(i % 5) for i in range(20)]})
+    columns = (['article_number', 'ean'], ['artno', 'batchsize1'])
+
+    # Global in zwei gestreamten Chunks, Referenz als ein geladener Chunk
+    monkeypatch.setattr(Config, 'CHUNK_SIZE', 50)
+    streamed = run_deterministic_matching(None, target, *columns, sample_mode=False,
+                                          scope='global')
+    monkeypatch.setattr(Config, 'CHUNK_SIZE', 100)
+    loaded = run_deterministic_matching(None, target, *columns, sample_mode=False,
+                                        scope='chunk')
+
+    keys = ['TecDoc_Spalte', 'CMD_Spalte', 'Methode']
+    expected = loaded[loaded['Methode'].isin(METHODS)].set_index(keys)['Matches']
+    assert streamed.set_index(keys)['Matches'].sort_index().to_dict() == expected.to_dict()
+    assert expected[('batchsize1', 'article_number', 'Exakt')] == 5
+
+def test_xml_target(capsys):
+    xml_data = {col: TARGET[col].tolist() for col in TARGET}
+    results = run_global_matching(xml_data, ['ean', 'fehlt'], ['artno'], TECDOC, sample_mode=False)
+    assert set(results['XML_Tag']) == {'ean'}
+    assert (results['XML_Anzahl'] == len(TARGET)).all()
+
+@pytest.mark.parametrize('setting, value', [('KEY_ENCODING', 'packed'),
+                                            ('DETERMINISTIC_BACKEND', 'numpy')])
+def test_ignored_settings_are_reported(setting, value, monkeypatch, capsys):
+    run_global_matching(TARGET, ['ean'], ['artno'], TECDOC, sample_mode=False)
+    assert "werden ignoriert" not in capsys.readouterr().out
+
+    monkeypatch.setattr(Config, setting, value)
+    run_global_matching(TARGET, ['ean'], ['artno'], TECDOC, sample_mode=False)
+    assert f"{setting}='{value}'" in capsys.readouterr().out
@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Tests für das LCP-basierte Präfix-/Suffix-Profil (src/utils/lcp.py)
+"""
+
+from src.matching.deterministic import DeterministicMatcher
+from src.utils.core import Config, clean_str
+from src.utils.lcp import adjacent_lcp, common_prefix_counts
+from reference_matching import ReferenceDeterministicMatcher, matching_values
+
+def test_adjacent_lcp():
+    values = sorted(['AB', 'ABC', 'ABD', 'B', 'B\0X'])
+    assert adjacent_lcp(values, 8).tolist() == [2, 2, 0, 1]
+    assert adjacent_lcp(values, 1).tolist() == [1, 1, 0, 1]
+
+def test_common_prefix_counts_match_sets():
+    left = sorted(set(str(value) for value in matching_values(200, seed=1)))
+    right = sorted(set(str(value) for value in matching_values(200, seed=2, offset=40)))
+    counts = common_prefix_counts(left, right, range(1, 15))
+    for length, (matches, examples) in counts.items():
+        common = ({value[:length] for value in left if len(value) >= length}
+                  & {value[:length] for value in right if len(value) >= length})
+        assert matches == len(common)
+        assert set(examples) <= common and len(examples) == min(5, len(common))
+    assert common_prefix_counts([], right, [3]) == {3: (0, [])}
+
+def test_length_profile_matches_reference(monkeypatch):
+    monkeypatch.setattr(Config, 'PREFIX_SUFFIX_PROFILE', True)
+    tecdoc, target = matching_values(300, seed=1), matching_values(400, seed=2, offset=50)
+    results = DeterministicMatcher().run_all_methods(tecdoc, target)
+    reference = ReferenceDeterministicMatcher()
+    target_clean = [clean_str(value) for value in target]
+
+    lengths = range(Config.MIN_STRING_LENGTH, Config.PREFIX_SUFFIX_MAX_LENGTH + 1)
+    for length in lengths:
+        assert results[f'Prefix_{length}'][0] == reference.prefix_match(tecdoc, target, length)[0]
+        assert results[f'Suffix_{length}'][0] == reference.suffix_match(tecdoc, target, length)[0]
+        # Beispiele vorwärts gelesen, wie bei suffix_match
+        suffixes = {value[-length:] for value in target_clean if len(value) >= length}
+        assert set(results[f'Suffix_{length}'][1]) <= suffixes
+    assert results['Prefix'][0] == results[f'Prefix_{Config.PREFIX_SUFFIX_LENGTH}'][0]
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Tests für den Byte-Offset-Zeilenindex und die Stichproben (src/utils/line_index.py)
+"""
+
+import gzip
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.core import Config, load_tecdoc_data
+from src.utils.line_index import CsvLineIndex, stratum_quotas
+from conftest import tecdoc_frame
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+@pytest.fixture
+def csv_text():
+    # Leerzeile in der Mitte, letzte Zeile ohne Zeilenumbruch
+    text = tecdoc_frame(300).to_csv(index=False)
+    lines = text.splitlines()
+    return "\n".join(lines[:100] + [""] + lines[100:])
+
+@pytest.mark.parametrize('suffix', ['', '.gz'])
+def test_index_rows_and_strata(tmp_path, csv_text, suffix):
+    path = tmp_path / f"tecdoc.csv{suffix}"
+    if suffix:
+        with gzip.open(path, 'wt') as f:
+            f.write(csv_text)
+    else:
+        path.write_text(csv_text)
+
+    index = CsvLineIndex.build(path, 'brandno', block_size=257)
+    expected = pd.read_csv(path, dtype={'artno': str})
+
+    assert len(index) == len(expected) == 300
+    assert index.strata.tolist() == pd.factorize(expected['brandno'])[0].tolist()
+    rows = np.array([0, 5, 99, 100, 299])
+    pd.testing.assert_frame_equal(index.read_rows(path, rows, {'dtype': {'artno': str}}),
+                                  expected.iloc[rows].reset_index(drop=True))
+
+def test_sidecar_reused(data_dirs, tmp_path, csv_text, monkeypatch):
+    path = tmp_path / "tecdoc.csv"
+    path.write_text(csv_text)
+    first = CsvLineIndex.load_or_build(path, 'brandno')
+
+    monkeypatch.setattr(CsvLineIndex, 'build', classmethod(lambda *args: pytest.fail("neu gebaut")))
+    second = CsvLineIndex.load_or_build(path, 'brandno')
+    assert np.array_equal(first.starts, second.starts)
+    assert np.array_equal(first.strata, second.strata)
+
+# =============================================================================
+# STICHPROBEN
+# =============================================================================
+
+@pytest.mark.parametrize('sizes,n', [([50, 30, 20], 10), ([1] * 30 + [500], 10),
+                                     ([5, 5, 5], 2), ([3, 1, 1], 100), ([7, 1, 1, 1], 5)])
+def test_quotas_sum_to_n(sizes, n):
+    quotas = stratum_quotas(np.array(sizes), n)
+    assert quotas.sum() == min(n, sum(sizes))
+    assert (quotas <= np.array(sizes)).all()
+    if n >= len(sizes):
+        assert (quotas >= 1).all()
+
+def test_quotas_prefer_largest_strata():
+    assert stratum_quotas(np.array([1, 9, 2, 9, 1]), 3).tolist() == [0, 1, 1, 1, 0]
+    assert stratum_quotas(np.array([60, 30, 10]), 10).tolist() == [6, 3, 1]
+
+def test_quotas_random_sizes():
+    rng = np.random.default_rng(0)
+    for _ in range(200):
+        sizes = rng.integers(1, 20, size=rng.integers(1, 40))
+        n = int(rng.integers(1, sizes.sum() + 5))
+        assert stratum_quotas(sizes, n).sum() == min(n, sizes.sum())
+
+@pytest.mark.parametrize('strategy', ['random', 'stratified'])
+def test_sample_rows_exact_size(strategy):
+    strata = np.repeat(np.arange(40), 3)
+    index = CsvLineIndex(b'', np.arange(120), np.arange(1, 121), strata)
+
+    rows = index.sample_rows(25, strategy, seed=1)
+    assert len(rows) == len(np.unique(rows)) == 25
+    assert (np.diff(rows) > 0).all()
+    if strategy == 'stratified':
+        assert len(np.unique(strata[rows])) == 25
+
+@pytest.mark.parametrize('strategy', ['random', 'stratified'])
+def test_tecdoc_sample_strategies(tecdoc_csv, monkeypatch, strategy):
+    monkeypatch.setattr(Config, 'SAMPLE_CHUNKS', 2)
+    data = load_tecdoc_data(chunk_size=15, sample_mode=True, use_cache=False,
+                            sample_strategy=strategy)
+    full = load_tecdoc_data(sample_mode=False, use_cache=False)
+
+    assert len(data) == 30
+    merged = data.astype(str).merge(full.astype(str).drop_duplicates(), how='left', indicator=True)
+    assert (merged['_merge'] == 'both').all()
+    if strategy == 'stratified':
+        assert data['brandno'].nunique() == full['brandno'].nunique()
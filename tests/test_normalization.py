@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests für die spaltenweise Normalisierung (src/utils/normalization.py)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils import normalization
+from src.utils.arena import StringArena
+from src.utils.core import clean_str, get_numeric_values, normalize_str, normalize_values
+from src.utils.normalization import (clean_series, normalize_series, normalized_value_set,
+                                     numeric_value_set)
+
+VALUES = ['  ab-12.3 ', 'Straße', 'ÄÖü x', '0042', 7, 3.0, None, np.nan, '', 'a b',
+          '１２', '\tq\n', '12345678901234567890', 'x.-']
+
+@pytest.fixture(params=[True, False], ids=['arrow', 'python'])
+def backend(request, monkeypatch):
+    """Arrow-Kernels und Python-Referenzpfad"""
+    if request.param:
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(normalization, 'PYARROW_AVAILABLE',
+                        request.param and normalization.PYARROW_AVAILABLE)
+
+# =============================================================================
+# GLEICHWERTIGKEIT MIT DEN SKALAREN FUNKTIONEN
+# =============================================================================
+
+def test_clean_series_matches_clean_str(backend):
+    series = pd.Series(VALUES, index=range(10, 10 + len(VALUES)), dtype=object)
+    result = clean_series(series)
+    assert result.tolist() == [clean_str(value) for value in VALUES]
+    assert result.index.equals(series.index)
+
+def test_punct_profile_matches_normalize_str(backend):
+    present = [value for value in VALUES if not pd.isna(value)]
+    assert normalize_series(present, 'punct').tolist() == [normalize_str(value) for value in present]
+
+def test_value_sets_match_scalar_functions(backend):
+    # Die Matcher übergeben Werte ohne fehlende (dropna), diese werden ignoriert
+    present = [value for value in VALUES if not pd.isna(value)]
+    assert normalized_value_set(VALUES) == normalize_values(present)
+    assert normalized_value_set(VALUES, 'clean') == \
+        normalize_values(present, remove_punct=False)
+    assert numeric_value_set(VALUES) == get_numeric_values(VALUES)
+
+def test_numeric_skips_digits_int_rejects(backend):
+    assert numeric_value_set(['²', '12', ' 7 ']) == {12, 7}
+
+def test_arena_input(backend):
+    arena = StringArena.from_values(['a-1', 'B 2', 'c'])
+    assert normalize_series(arena).tolist() == ['A1', 'B2', 'C']
+    assert normalized_value_set(arena, min_length=2) == {'A1', 'B2'}
+
+# =============================================================================
+# PROFILE
+# =============================================================================
+
+def test_categorical_normalizes_categories():
+    series = pd.Series(pd.Categorical(['a-1', None, 'a-1', 'b']))
+    assert normalize_series(series).tolist() == ['A1', '', 'A1', 'B']
+
+def test_unicode_profile_folds(backend):
+    assert normalize_series(['Maß-Ä', 'ｘ１'], 'unicode').tolist() == ['MASSAE', 'X1']
+
+def test_unknown_profile():
+    with pytest.raises(ValueError):
+        normalize_series(['a'], 'gibt-es-nicht')
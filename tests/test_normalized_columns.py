@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests für die geteilten normalisierten Spalten (src/matching/normalized.py)
+"""
+
+import pandas as pd
+
+from src.matching.deterministic import DeterministicMatcher
+from src.matching.fuzzy import FuzzyMatcher
+from src.matching.normalized import NormalizedColumn, PreparedTarget, prepare_targets
+from src.utils.arena import StringArena
+from reference_matching import (ReferenceDeterministicMatcher, ReferenceFuzzyMatcher,
+                                match_counts, matching_values)
+
+TECDOC = matching_values(300, seed=1)
+TARGET = matching_values(400, seed=2, offset=50)
+
+# =============================================================================
+# GLEICHWERTIGKEIT
+# =============================================================================
+
+def test_deterministic_matches_reference():
+    expected = ReferenceDeterministicMatcher().run_all_methods(TECDOC, TARGET)
+    assert match_counts(DeterministicMatcher().run_all_methods(TECDOC, TARGET)) == \
+        match_counts(expected)
+
+def test_fuzzy_matches_reference():
+    tecdoc, target = TECDOC[:60], TARGET[:80]
+    expected = ReferenceFuzzyMatcher().run_all_methods(tecdoc, target)
+    assert match_counts(FuzzyMatcher().run_all_methods(tecdoc, target)) == match_counts(expected)
+
+# =============================================================================
+# GETEILTE VARIANTEN
+# =============================================================================
+
+def test_variants_computed_once():
+    column = NormalizedColumn(TECDOC)
+    DeterministicMatcher().run_all_methods(column, TARGET)
+    clean_set = column.clean_set
+    DeterministicMatcher().run_all_methods(column, TARGET[:10])
+    assert column.clean_set is clean_set
+    assert column.clean_min(3) is column.clean_min(3)
+
+def test_prepared_target_reused_across_chunks():
+    matcher = DeterministicMatcher()
+    target = PreparedTarget(StringArena.from_values(TARGET), 'article_number', matcher)
+    variants = dict(target._variants)
+    for start in (0, 100, 200):
+        chunk = TECDOC[start:start + 100]
+        assert match_counts(matcher.run_all_methods(chunk, target)) == \
+            match_counts(ReferenceDeterministicMatcher().run_all_methods(chunk, TARGET))
+    assert all(target._variants[key] is value for key, value in variants.items())
+
+def test_prepare_targets_skips_empty_columns():
+    data = pd.DataFrame({'a': ['x', None], 'b': [None, None]})
+    targets = prepare_targets(DeterministicMatcher(), data, ['b', 'a', 'fehlt'])
+    assert list(targets) == ['a']
+    assert targets['a'].name == 'a'
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests für das NumPy-Backend (src/utils/hashing.py, DETERMINISTIC_BACKEND='numpy')
+"""
+
+import numpy as np
+import pytest
+
+from src.matching.deterministic import DeterministicMatcher
+from src.matching.normalized import NormalizedColumn, PreparedTarget
+from src.utils import hashing
+from src.utils.arena import StringArena
+from src.utils.hashing import HashCollision, HashedSet, string_hashes
+from reference_matching import ReferenceDeterministicMatcher, match_counts, matching_values
+
+TECDOC = matching_values(300, seed=1)
+TARGET = matching_values(400, seed=2, offset=50)
+
+def test_hashes_are_stable_and_distinguish_lengths():
+    arena = StringArena.from_values(['', 'A', 'A', 'AB', 'Ä'])
+    hashes = string_hashes(arena)
+    assert hashes[1] == hashes[2] and len(set(hashes.tolist())) == 4
+    # Ausschnitte einer Arena liefern dieselben Hashes wie eigene Arenen
+    assert string_hashes(StringArena.from_values(['AB'])).tolist() == [hashes[3]]
+
+def test_hashed_set_intersection():
+    left = HashedSet.from_arena(StringArena.from_values(['A1', 'B2', 'A1', 'Ö']))
+    right = HashedSet.from_arena(StringArena.from_values(['Ö', 'C3', 'A1']))
+    count, examples = left.intersect(right)
+    assert count == 2 and sorted(examples) == ['A1', 'Ö']
+
+def test_collisions_are_checked_bytewise(monkeypatch):
+    monkeypatch.setattr(hashing, 'string_hashes', lambda arena: np.zeros(len(arena), dtype=np.uint64))
+    with pytest.raises(HashCollision):
+        HashedSet.from_arena(StringArena.from_values(['A', 'B']))
+
+    # Gleicher Hash auf beiden Seiten, aber verschiedene Werte: kein Treffer
+    left = HashedSet.from_arena(StringArena.from_values(['A']))
+    right = HashedSet.from_arena(StringArena.from_values(['B']))
+    assert left.intersect(right) == (0, [])
+
+    # Kollision innerhalb einer Spalte: Fallback auf String-Mengen
+    column = NormalizedColumn(['abc', 'abd'])
+    assert column.hashed('clean_set') == {'ABC', 'ABD'}
+    result = DeterministicMatcher(backend='numpy').run_all_methods(['abc', 'x'], column)
+    assert result['Exakt'] == ReferenceDeterministicMatcher().exact_match(['abc', 'x'], ['abc', 'abd'])
+
+@pytest.mark.parametrize('key_encoding', ['strings', 'dictionary', 'packed', 'matrix'])
+def test_numpy_backend_matches_reference(key_encoding):
+    expected = match_counts(ReferenceDeterministicMatcher().run_all_methods(TECDOC, TARGET))
+    matcher = DeterministicMatcher(key_encoding=key_encoding, backend='numpy')
+    assert match_counts(matcher.run_all_methods(TECDOC, TARGET)) == expected
+    prepared = PreparedTarget(StringArena.from_values(TARGET), 'x', matcher)
+    assert match_counts(matcher.run_all_methods(StringArena.from_values(TECDOC), prepared)) == expected
+
+def test_length_examples_in_first_occurrence_order():
+    result = DeterministicMatcher(backend='numpy').length_based_match(['abcd', 'a', 'ab', 'x'],
+                                                                      ['zz', 'q', 'wxyz'])
+    assert result == (3, ['4', '1', '2'])
+    assert result == ReferenceDeterministicMatcher().length_based_match(['abcd', 'a', 'ab', 'x'],
+                                                                        ['zz', 'q', 'wxyz'])
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        DeterministicMatcher(backend='gpu')
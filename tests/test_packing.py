@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests für die gepackten Basis-37-Codes (src/utils/packing.py)
+"""
+
+import numpy as np
+import pytest
+
+from src.matching.deterministic import DeterministicMatcher
+from src.matching.normalized import PreparedTarget
+from src.utils.packing import (MAX_PACKED_LENGTH, PackedSet, pack_values, packed_lengths,
+                               prefix_codes, suffix_codes, unpack_codes)
+from reference_matching import ReferenceDeterministicMatcher, match_counts, matching_values
+
+VALUES = ['A', '0', 'Z9', 'AB12', 'ABCDEFGHIJKL', 'ZZZZZZZZZZZZ', '00A', 'A0']
+
+def test_pack_roundtrip_and_order():
+    codes, packable = pack_values(VALUES)
+    assert packable.all()
+    assert unpack_codes(codes) == VALUES
+    assert packed_lengths(codes).tolist() == [len(value) for value in VALUES]
+    # Codes sortieren wie die Strings
+    assert np.argsort(codes, kind='stable').tolist() == \
+        sorted(range(len(VALUES)), key=VALUES.__getitem__)
+
+def test_unpackable_values():
+    values = ['', 'a1', 'AB-1', 'ÄB', 'A' * (MAX_PACKED_LENGTH + 1), 'AB1']
+    codes, packable = pack_values(values)
+    assert packable.tolist() == [False, False, False, False, False, True]
+    assert codes[~packable].tolist() == [0] * 5
+
+@pytest.mark.parametrize('length', [1, 3, 5, MAX_PACKED_LENGTH])
+def test_prefix_suffix_codes(length):
+    codes, _ = pack_values(VALUES)
+    long_values = [value for value in VALUES if len(value) >= length]
+    assert unpack_codes(prefix_codes(codes, length)) == [value[:length] for value in long_values]
+    assert unpack_codes(suffix_codes(codes, length)) == [value[-length:] for value in long_values]
+
+def test_packed_set_intersection():
+    left = PackedSet.from_strings(['AB1', 'AB1', 'LANGER-WERT', 'X'])
+    right = PackedSet.from_strings(['X', 'LANGER-WERT', 'AB2'])
+    count, examples = left.intersect(right)
+    assert count == 2 and sorted(examples) == ['LANGER-WERT', 'X']
+
+    numbers = PackedSet.from_integers([1, 2, 10 ** 30])
+    count, examples = numbers.intersect(PackedSet.from_integers([2, 10 ** 30]))
+    assert count == 2 and sorted(examples) == [2, 10 ** 30]
+
+def test_packed_matches_reference():
+    tecdoc, target = matching_values(300, seed=1), matching_values(400, seed=2, offset=50)
+    expected = match_counts(ReferenceDeterministicMatcher().run_all_methods(tecdoc, target))
+    matcher = DeterministicMatcher(key_encoding='packed')
+    assert match_counts(matcher.run_all_methods(tecdoc, target)) == expected
+    prepared = PreparedTarget(target, 'article_number', matcher)
+    assert match_counts(matcher.run_all_methods(tecdoc, prepared)) == expected
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests für die Markenpartitionen der TecDoc-Daten (src/utils/partitions.py)
+"""
+
+import pandas as pd
+import pytest
+
+from src.utils.core import Config, load_tecdoc_data
+from src.utils.partitions import (brand_key, brand_keys, load_partition_manifest,
+                                  partition_dtypes, partition_files, select_brands, write_brand_partitions)
+from conftest import tecdoc_frame
+
+def test_brand_keys():
+    assert [brand_key(value) for value in (12, 12.0, '12', ' 12 ', None, float('nan'), 'A')] == \
+        ['12', '12', '12', '12', '', '', 'A']
+    assert brand_keys([3, '3', 1.0, 5]) == ['3', '1', '5']
+
+def test_select_brands_order():
+    data = pd.DataFrame({'brandno': [1, 2, 1, 3, 2], 'x': range(5)})
+    assert select_brands(data, ['2', 1])['x'].tolist() == [1, 4, 0, 2]
+
+def test_write_partitions_manifest(tecdoc_csv):
+    manifest = write_brand_partitions(chunk_size=37)
+    expected = tecdoc_frame()['brandno'].astype(str).value_counts().to_dict()
+
+    assert manifest['rows'] == len(tecdoc_frame())
+    assert {key: entry['rows'] for key, entry in manifest['partitions'].items()} == expected
+    assert load_partition_manifest() == manifest
+    assert not Config.TECDOC_PARTITION_DIR.with_name("tecdoc.tmp").exists()
+
+def test_partition_pruning_and_staleness(tecdoc_csv):
+    write_brand_partitions()
+    files = partition_files(tecdoc_csv, [4, 2, 99])
+    assert [path.name for path in files] == ['brand_4.csv', 'brand_2.csv']
+
+    tecdoc_csv.write_text(tecdoc_csv.read_text() + "X,4,1,1\n")
+    assert partition_files(tecdoc_csv, [4]) is None
+
+@pytest.mark.parametrize('sample_mode', [True, False])
+def test_partitions_match_filtered_scan(tecdoc_csv, sample_mode, monkeypatch):
+    monkeypatch.setattr(Config, 'SAMPLE_CHUNKS', 1)
+    brands = [4, 2, 7]
+    scanned = load_tecdoc_data(chunk_size=30, sample_mode=sample_mode, use_cache=False, brands=brands)
+    write_brand_partitions()
+    partitioned = load_tecdoc_data(chunk_size=30, sample_mode=sample_mode, use_cache=False,
+                                   brands=brands)
+
+    pd.testing.assert_frame_equal(partitioned, scanned)
+    expected = select_brands(tecdoc_frame(), brands)
+    if sample_mode:
+        expected = expected.iloc[:30]
+    assert partitioned['artno'].astype(str).tolist() == expected['artno'].tolist()
+    if not sample_mode:
+        assert partitioned['brandno'].drop_duplicates().tolist() == brands
+
+@pytest.mark.parametrize('engine', ['c', 'pyarrow'])
+def test_partition_dtypes_follow_source(data_dirs, engine, monkeypatch):
+    if engine == 'pyarrow':
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(Config, 'CSV_ENGINE', engine)
+    # Lücken in batchsize1 nur bei Marke 1: Marke 2 allein wäre int64
+    (Config.INPUT_DIR / Config.TECDOC_FILE).write_text("artno,brandno,batchsize1\na,1,\nb,2,3\nc,2,4\n")
+    scanned = load_tecdoc_data(sample_mode=False, use_cache=False, brands=[2])
+    write_brand_partitions()
+    partitioned = load_tecdoc_data(sample_mode=False, use_cache=False, brands=[2])
+
+    pd.testing.assert_frame_equal(partitioned, scanned)
+    assert partition_dtypes() == {'artno': str, 'batchsize1': 'float64'}
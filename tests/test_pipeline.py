@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests für das TecDoc-Streaming und die überlappende Matching-Pipeline
+"""
+
+import pandas as pd
+import pytest
+
+from src.matching.deterministic import run_deterministic_matching
+from src.utils.core import Config, iter_tecdoc_chunks, load_tecdoc_data
+from src.utils.partitions import write_brand_partitions
+from conftest import late_gap_csv, tecdoc_frame
+
+# =============================================================================
+# STREAMING
+# =============================================================================
+
+@pytest.mark.parametrize('engine', ['c', 'pyarrow'])
+def test_stream_uses_full_file_dtypes(data_dirs, engine):
+    if engine == 'pyarrow':
+        pytest.importorskip("pyarrow")
+    late_gap_csv(Config.INPUT_DIR / Config.TECDOC_FILE)
+
+    chunks = list(iter_tecdoc_chunks(50, sample_mode=False, compact_dtypes=False,
+                                     use_cache=False, engine=engine))
+    expected = pd.read_csv(Config.INPUT_DIR / Config.TECDOC_FILE)
+
+    assert [len(chunk) for chunk in chunks] == [50, 50]
+    # Lücken erst im zweiten Chunk: trotzdem schon der erste Chunk float
+    assert all(chunk['batchsize1'].dtype == 'float64' for chunk in chunks)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+    # Keine Typ-Sidecars im Cache
+    assert not Config.CACHE_DIR.exists()
+
+def test_stream_dtypes_from_partition_manifest(data_dirs, capsys):
+    late_gap_csv(Config.INPUT_DIR / Config.TECDOC_FILE)
+    write_brand_partitions()
+    capsys.readouterr()
+
+    chunks = list(iter_tecdoc_chunks(50, sample_mode=False, use_cache=False))
+
+    assert all(chunk['batchsize1'].dtype == 'float64' for chunk in chunks)
+    assert "Bestimme Spaltentypen" not in capsys.readouterr().out
+
+@pytest.mark.parametrize('engine', ['c', 'pyarrow'])
+def test_stream_sample_rows_and_pinned_dtypes(data_dirs, engine, monkeypatch):
+    if engine == 'pyarrow':
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(Config, 'SAMPLE_CHUNKS', 3)
+    late_gap_csv(Config.INPUT_DIR / Config.TECDOC_FILE)
+
+    chunks = list(iter_tecdoc_chunks(30, sample_mode=True, use_cache=False, engine=engine,
+                                     dtypes={'batchsize1': 'float64'}))
+    loaded = load_tecdoc_data(30, sample_mode=True, use_cache=False, engine=engine)
+
+    assert [len(chunk) for chunk in chunks] == [30, 30, 30]
+    assert all(chunk['batchsize1'].dtype == 'float64' for chunk in chunks)
+    assert chunks[0]['artno'].tolist() == loaded['artno'].iloc[:30].tolist()
+
+def test_stream_from_cache_entry(tecdoc_csv):
+    pytest.importorskip("pyarrow")
+    loaded = load_tecdoc_data(40, sample_mode=False, use_cache=True)
+
+    chunks = list(iter_tecdoc_chunks(40, sample_mode=False, use_cache=True))
+    pd.testing.assert_frame_equal(pd.concat(chunks), loaded)
+
+    # Ohne Cache: gleiche Werte, aber aus der Datei gelesen
+    streamed = pd.concat(iter_tecdoc_chunks(40, sample_mode=False, use_cache=False),
+                         ignore_index=True)
+    assert streamed['artno'].astype(str).tolist() == loaded['artno'].astype(str).tolist()
+
+# =============================================================================
+# PIPELINE
+# =============================================================================
+
+def test_pipeline_is_opt_in():
+    assert Config.MATCH_PIPELINE is False
+
+@pytest.mark.parametrize('target_kind', ['csv', 'xml'])
+def test_pipeline_matches_loop(target_kind, monkeypatch):
+    monkeypatch.setattr(Config, 'CHUNK_SIZE', 60)
+    tecdoc = tecdoc_frame()
+    target = pd.DataFrame({'article_number': [f"{i % 150}-{i % 3}" for i in range(0, 300, 2)],
+                           'ean': [f"0{i}-{i % 3}" for i in range(150)]})
+    if target_kind == 'xml':
+        target = {col: target[col].tolist() for col in target.columns}
+
+    loop = run_deterministic_matching(tecdoc, target, ['article_number', 'ean'],
+                                      ['artno', 'batchsize1'], sample_mode=False, pipeline=False)
+    pipeline = run_deterministic_matching(tecdoc, target, ['article_number', 'ean'],
+                                          ['artno', 'batchsize1'], sample_mode=False, pipeline=True)
+
+    assert loop['Chunk'].max() == 4
+    pd.testing.assert_frame_equal(pipeline, loop)
+
+@pytest.mark.parametrize('sample_mode', [False, True])
+def test_streamed_pipeline_matches_loop_late_gaps(data_dirs, monkeypatch, sample_mode):
+    monkeypatch.setattr(Config, 'CHUNK_SIZE', 50)
+    monkeypatch.setattr(Config, 'SAMPLE_CHUNKS', 2)
+    monkeypatch.setattr(Config, 'USE_CACHE', False)
+    late_gap_csv(Config.INPUT_DIR / Config.TECDOC_FILE)
+    # '1.0' trifft batchsize1 nur mit den Typen der ganzen Datei, '1' nur mit int
+    target = pd.DataFrame({'article_number': [f"{i % 5}.0" for i in range(20)],
+                           'ean': [str(i % 5) for i in range(20)]})
+
+    loop = run_deterministic_matching(None, target, ['article_number', 'ean'],
+                                      ['artno', 'batchsize1'], sample_mode=sample_mode,
+                                      pipeline=False)
+    pipeline = run_deterministic_matching(None, target, ['article_number', 'ean'],
+                                          ['artno', 'batchsize1'], sample_mode=sample_mode,
+                                          pipeline=True)
+
+    assert set(loop['Chunk']) == {1, 2}
+    exact = loop[(loop['TecDoc_Spalte'] == 'batchsize1') & (loop['Methode'] == 'Exakt')]
+    assert exact.set_index(['Chunk', 'CMD_Spalte'])['Matches'].to_dict() == \
+        {(1, 'article_number'): 5, (1, 'ean'): 0, (2, 'article_number'): 5, (2, 'ean'): 0}
+    pd.testing.assert_frame_equal(pipeline, loop)
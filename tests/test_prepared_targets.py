@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Tests für die einmal vorbereiteten Target-Indizes (PreparedTarget)
+"""
+
+import pandas as pd
+import pytest
+
+from src.matching.deterministic import DeterministicMatcher, run_deterministic_matching
+from src.matching.fuzzy import FuzzyMatcher, run_fuzzy_matching
+from src.matching.normalized import PreparedTarget
+from src.utils.core import Config
+from reference_matching import (ReferenceDeterministicMatcher, ReferenceFuzzyMatcher,
+                                match_counts, matching_values, reference_results)
+
+TECDOC = pd.DataFrame({'artno': [str(value) for value in matching_values(250, seed=5)],
+                       'batchsize1': [value if i % 7 else None
+                                      for i, value in enumerate(matching_values(250, seed=6))]})
+TARGET = pd.DataFrame({'article_number': matching_values(120, seed=7, offset=30),
+                       'ean': matching_values(120, seed=8)})
+COLUMNS = ['article_number', 'ean', 'fehlt']
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    monkeypatch.setattr(Config, 'CHUNK_SIZE', 80)
+
+@pytest.mark.parametrize('target_kind', ['csv', 'xml'])
+@pytest.mark.parametrize('key_encoding', ['strings', 'dictionary', 'packed', 'matrix'])
+def test_deterministic_loop_matches_reference(target_kind, key_encoding, monkeypatch):
+    monkeypatch.setattr(Config, 'KEY_ENCODING', key_encoding)
+    target = TARGET if target_kind == 'csv' else {col: TARGET[col].tolist() for col in TARGET}
+    result = run_deterministic_matching(TECDOC, target, COLUMNS, ['artno', 'batchsize1'],
+                                        sample_mode=False, pipeline=False)
+    expected = reference_results(ReferenceDeterministicMatcher(), TECDOC, target, COLUMNS,
+                                 ['artno', 'batchsize1'], 80)
+    pd.testing.assert_frame_equal(result, expected)
+
+def test_fuzzy_loop_matches_reference():
+    tecdoc, target = TECDOC.iloc[:100], TARGET.iloc[:60]
+    result = run_fuzzy_matching(tecdoc, target, COLUMNS, ['artno'], sample_mode=False, pipeline=False)
+    expected = reference_results(ReferenceFuzzyMatcher(), tecdoc, target, COLUMNS, ['artno'], 80)
+    pd.testing.assert_frame_equal(result, expected)
+
+@pytest.mark.parametrize('threshold', [0.0, 0.5, 0.8, 1.0])
+def test_levenshtein_length_pruning_is_exact(threshold):
+    tecdoc, target = matching_values(60, seed=9), matching_values(80, seed=10)
+    matcher = FuzzyMatcher(similarity_threshold=threshold)
+    prepared = PreparedTarget(target, 'x', matcher)
+    expected = ReferenceFuzzyMatcher(similarity_threshold=threshold).levenshtein_match(tecdoc, target)
+    assert matcher.levenshtein_match(tecdoc, prepared)[0] == expected[0]
+
+def test_prepare_target_builds_indexes_up_front():
+    target = PreparedTarget(matching_values(100, seed=11), 'x', DeterministicMatcher())
+    built = set(map(str, target._variants))
+    DeterministicMatcher().run_all_methods(matching_values(50, seed=12), target)
+    assert set(map(str, target._variants)) == built
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests für den Streaming-Profiler (src/utils/profiler.py)
+"""
+
+import gzip
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.utils.core import Config
+from src.utils.profiler import (HyperLogLog, count_csv_rows, count_xml_articles,
+                                profile_csv_columns, profile_datasets)
+from conftest import tecdoc_frame, xml_document
+
+# =============================================================================
+# ZÄHLUNG
+# =============================================================================
+
+@pytest.mark.parametrize('text,rows', [("a\n1\n2\n", 2), ("a\n1\n2", 2), ("a\n", 0), ("", 0)])
+def test_count_csv_rows(tmp_path, text, rows):
+    path = tmp_path / "a.csv"
+    path.write_text(text)
+    assert count_csv_rows(path, block_size=3) == rows
+
+    compressed = tmp_path / "a.csv.gz"
+    compressed.write_bytes(gzip.compress(text.encode()))
+    assert count_csv_rows(compressed, block_size=3) == rows
+
+def test_count_xml_articles_flat(tmp_path):
+    path = tmp_path / "a.xml"
+    path.write_text(xml_document(25))
+    info = count_xml_articles(path)
+    # Header ist ein direktes Kind, aber kein Artikel
+    assert info == {'articles': 25, 'children': 26, 'article_tag': 'Article',
+                    'first_article_id': 'A0'}
+
+def test_count_xml_articles_wrapped_and_fallback(tmp_path):
+    wrapped = tmp_path / "wrapped.xml"
+    wrapped.write_text(xml_document(25, wrapper='Articles'))
+    assert count_xml_articles(wrapped)['articles'] == 25
+    assert count_xml_articles(wrapped)['children'] == 2
+
+    other = tmp_path / "other.xml"
+    other.write_text('<Root><Teil ID="T1"/><Teil/><Teil/></Root>')
+    assert count_xml_articles(other) == {'articles': 3, 'children': 3, 'article_tag': 'Teil',
+                                         'first_article_id': 'T1'}
+
+# =============================================================================
+# SPALTENPROFILE
+# =============================================================================
+
+def test_hyperloglog_estimate():
+    hll = HyperLogLog()
+    hll.update(pd.Series([str(i) for i in range(50000)] * 2))
+    assert abs(hll.estimate() - 50000) / 50000 < 0.03
+
+    small = HyperLogLog()
+    small.update(pd.Series(['a', 'b', 'a']))
+    assert small.estimate() == 2
+
+def test_profile_csv_columns(tmp_path):
+    path = tmp_path / "a.csv"
+    path.write_text("artno;brand\n007;A\n;B\nABCDEFGH;\n007;A\n")
+    profile = profile_csv_columns(path, max_length=4).set_index('Spalte')
+
+    assert profile.loc['artno', 'Werte'] == 4
+    assert profile.loc['artno', 'Nullrate'] == 0.25
+    assert profile.loc['artno', 'Distinct_geschaetzt'] == 2
+    assert profile.loc['artno', 'Laengen_Histogramm'] == {3: 2, 4: 1}
+    assert profile.loc['brand', 'Laenge_Max'] == 1
+
+def test_profile_datasets(tecdoc_csv, monkeypatch):
+    monkeypatch.setattr(Config, 'XML_TARGET_TAGS', ['TradeNo'])
+    xml_dir = Config.INPUT_DIR / Config.CMD_XML_DIR
+    xml_dir.mkdir()
+    (xml_dir / "a.xml").write_text(xml_document(10))
+    (xml_dir / "b.xml").write_text(xml_document(5))
+
+    report = profile_datasets()
+    assert report['tecdoc']['rows'] == len(tecdoc_frame())
+    assert report['xml']['articles'] == 15
+    columns = report['tecdoc']['columns'].set_index('Spalte')
+    assert np.isclose(columns.loc['batchsize1', 'Nullrate'], tecdoc_frame()['batchsize1'].isna().mean())
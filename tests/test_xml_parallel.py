@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Tests für die parallele XML-Extraktion über Dateien und Byte-Bereiche
+"""
+
+import pytest
+
+from src.utils.core import Config, _parse_xml_values, extract_xml_values
+from src.utils.xml_stream import run_extract_tasks
+from conftest import xml_document
+
+TAGS = ['SupplierPtNo', 'TradeNo', 'Brand']
+
+@pytest.fixture
+def xml_dir(data_dirs, monkeypatch):
+    """Drei XML-Dateien im Standardverzeichnis, Ziel-Tags reduziert"""
+    monkeypatch.setattr(Config, 'XML_TARGET_TAGS', TAGS)
+    xml_dir = Config.INPUT_DIR / Config.CMD_XML_DIR
+    xml_dir.mkdir()
+    for i in range(3):
+        (xml_dir / f"f{i}.xml").write_text(xml_document(60, start=i * 50))
+    return xml_dir
+
+# =============================================================================
+# DATEIEN IM PROZESS-POOL
+# =============================================================================
+
+def test_parallel_matches_serial(xml_dir):
+    files = sorted(xml_dir.glob("*.xml"))
+    serial = _parse_xml_values(files, workers=1)
+    parallel = _parse_xml_values(files, workers=3)
+
+    assert parallel == serial
+    assert serial['TradeNo'][:2] == ['1000', '1001']
+    assert len(serial['TradeNo']) == 160
+
+def test_results_in_file_order(xml_dir):
+    files = sorted(xml_dir.glob("*.xml"))
+    results = run_extract_tasks(files, TAGS, workers=3)
+    assert [name for name, _, _, _ in results] == [str(path) for path in files]
+
+def test_broken_file_does_not_abort_batch(xml_dir):
+    broken = xml_dir / "kaputt.xml"
+    broken.write_text("<ArticleMasterData><Article>")
+    files = sorted(xml_dir.glob("*.xml"))
+
+    results = run_extract_tasks(files, TAGS, workers=2)
+    errors = {name for name, _, _, error in results if error}
+    assert errors == {str(broken)}
+    assert _parse_xml_values(files, workers=2) == _parse_xml_values(files, workers=1)
+
+def test_extract_xml_values_all_cores(xml_dir):
+    assert extract_xml_values(use_cache=False, workers=0) == extract_xml_values(use_cache=False, workers=1)
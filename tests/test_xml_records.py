@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Tests für die XML-Artikeltabelle und den Artikel-Join
+"""
+
+import pandas as pd
+import pytest
+
+from src.matching.deterministic import (DeterministicMatcher, join_xml_articles,
+                                        run_deterministic_matching)
+from src.utils import xml_stream
+from src.utils.core import Config, extract_xml_records
+from conftest import xml_document
+
+TAGS = ['SupplierPtNo', 'TradeNo', 'Brand']
+
+@pytest.fixture
+def xml_dir(data_dirs, monkeypatch):
+    monkeypatch.setattr(Config, 'XML_TARGET_TAGS', TAGS)
+    xml_dir = Config.INPUT_DIR / Config.CMD_XML_DIR
+    xml_dir.mkdir()
+    (xml_dir / "a.xml").write_text(xml_document(30))
+    # Artikel ohne ID-Attribut und ohne TradeNo
+    (xml_dir / "b.xml").write_text(
+        '<ArticleMasterData><Article><SupplierPtNo>sp-9</SupplierPtNo></Article>'
+        '<Article ID="X2"><SupplierPtNo>SP 1</SupplierPtNo><TradeNo>7</TradeNo></Article>'
+        '</ArticleMasterData>')
+    return xml_dir
+
+# =============================================================================
+# ARTIKELTABELLE
+# =============================================================================
+
+def test_one_row_per_article(xml_dir):
+    records = extract_xml_records(use_cache=False)
+
+    assert len(records) == 32
+    assert list(records.columns) == ['article_id', 'source_file'] + TAGS
+    assert records['article_id'].tolist()[:2] == ['A0', 'A1']
+    assert records['article_id'].tolist()[-2:] == ['b.xml:0', 'X2']
+    assert records['TradeNo'].isna().tolist()[-2:] == [True, False]
+    assert records['SupplierPtNo'].iloc[3] == 'SP3'
+
+def test_records_cached(xml_dir):
+    first = extract_xml_records(use_cache=True)
+    second = extract_xml_records(use_cache=True)
+    pd.testing.assert_frame_equal(first, second)
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_records_independent_of_workers(xml_dir, workers, monkeypatch):
+    monkeypatch.setattr(Config, 'XML_SHARD_MIN_BYTES', 0)
+    expected = extract_xml_records(use_cache=False, workers=1)
+    pd.testing.assert_frame_equal(extract_xml_records(use_cache=False, workers=workers), expected)
+
+def test_single_article_file(xml_dir):
+    # Header und Artikel gleich häufig: keine Wrapper-Ebene, nicht <Brand> als Artikel
+    (xml_dir / "c.xml").write_text(xml_document(1, start=7))
+    records = extract_xml_records(use_cache=False)
+
+    single = records[records['source_file'] == 'c.xml']
+    assert single['article_id'].tolist() == ['A7']
+    assert single[TAGS].iloc[0].tolist() == ['SP7', '1007', 'B2']
+
+def test_header_heavy_file(xml_dir):
+    header = "".join(f"<Field>{i}</Field>" for i in range(50))
+    document = xml_document(3, wrapper='Articles').replace(
+        '<Header><Brand>Kopf</Brand></Header>', f'<Header><Brand>Kopf</Brand>{header}</Header>')
+    (xml_dir / "c.xml").write_text(document)
+
+    assert xml_stream._article_level(xml_dir / "c.xml") == ('Article', 3)
+    records = extract_xml_records(use_cache=False)
+    assert records.loc[records['source_file'] == 'c.xml', 'article_id'].tolist() == ['A0', 'A1', 'A2']
+
+def test_article_level_without_configured_tags(tmp_path):
+    path = tmp_path / "catalog.xml"
+    path.write_text('<Catalog><Meta><Field>1</Field><Field>2</Field></Meta>'
+                    '<Part><Spec>a</Spec><Spec>b</Spec></Part></Catalog>')
+    assert xml_stream._article_level(path) == ('Part', 2)
+
+    path.write_text('<Catalog><Parts><Part>a</Part><Part>b</Part></Parts></Catalog>')
+    assert xml_stream._article_level(path) == ('Part', 3)
+
+# =============================================================================
+# ARTIKEL-JOIN
+# =============================================================================
+
+def test_join_points_at_articles(xml_dir):
+    records = extract_xml_records(use_cache=False)
+    tecdoc = pd.DataFrame({'artno': ['sp3', 'SP-9', 'SP1', None], 'brandno': ['B3', 'B0', 'B1', 'B1']})
+
+    exact = join_xml_articles(tecdoc, records)
+    assert sorted(map(tuple, exact[['TecDoc_Index', 'article_id']].values.tolist())) == [
+        (0, 'A3'), (1, 'b.xml:0'), (2, 'A1')]
+
+    normalized = join_xml_articles(tecdoc, records, normalize=True)
+    assert sorted(map(tuple, normalized[['TecDoc_Index', 'article_id']].values.tolist())) == [
+        (0, 'A3'), (1, 'A9'), (1, 'b.xml:0'), (2, 'A1'), (2, 'X2')]
+
+    blocked = join_xml_articles(tecdoc, records, block_on={'brandno': 'Brand'}, normalize=True)
+    assert sorted(map(tuple, blocked[['TecDoc_Index', 'article_id']].values.tolist())) == [
+        (0, 'A3'), (2, 'A1')]
+
+def test_join_without_matching_columns():
+    empty = join_xml_articles(pd.DataFrame({'x': [1]}), pd.DataFrame({'article_id': []}))
+    assert empty.empty and 'article_id' in empty.columns
+
+def test_records_as_matching_target(xml_dir):
+    records = extract_xml_records(use_cache=False)
+    tecdoc = pd.DataFrame({'artno': ['SP1', 'SP2', 'sp-9']})
+    results = run_deterministic_matching(tecdoc, records, ['SupplierPtNo'], ['artno'],
+                                         sample_mode=False, pipeline=False)
+    expected = DeterministicMatcher().run_all_methods(tecdoc['artno'].tolist(),
+                                                      records['SupplierPtNo'].dropna().tolist())
+    assert results.set_index('Methode')['Matches'].to_dict() == {
+        method: result[0] for method, result in expected.items()}
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests für das Byte-Range-Sharding großer XML-Dateien
+"""
+
+import pytest
+
+from src.utils.core import Config, _parse_xml_records, _parse_xml_values
+from src.utils.xml_stream import _ShardReader, collect_tag_values, plan_shards, run_extract_tasks
+from conftest import xml_document
+
+TAGS = ['SupplierPtNo', 'TradeNo', 'Brand']
+
+@pytest.fixture
+def shard_all(monkeypatch):
+    """Jede Datei gilt als groß genug zum Sharding"""
+    monkeypatch.setattr(Config, 'XML_SHARD_MIN_BYTES', 0)
+    monkeypatch.setattr(Config, 'XML_TARGET_TAGS', TAGS)
+
+# =============================================================================
+# PLANUNG
+# =============================================================================
+
+def test_shards_cover_file_at_article_starts(tmp_path):
+    path = tmp_path / "big.xml"
+    path.write_text(xml_document(200))
+    data = path.read_bytes()
+
+    shards = plan_shards(path, 4)
+    assert len(shards) == 4
+    assert shards[0][0] == 0 and shards[-1][1] == len(data)
+    for (_, end, _, _), (start, _, _, _) in zip(shards, shards[1:]):
+        assert end == start
+        assert data[start:start + 9] == b'<Article '
+
+def test_each_shard_is_well_formed(tmp_path):
+    path = tmp_path / "ns.xml"
+    path.write_text(xml_document(120).replace('<ArticleMasterData>',
+                                              '<ArticleMasterData xmlns="urn:cmd">'))
+    tags = ['{urn:cmd}TradeNo']
+
+    shards = plan_shards(path, 3)
+    assert len(shards) == 3
+    values = []
+    for shard in shards:
+        reader = _ShardReader(path, *shard)
+        try:
+            values.extend(collect_tag_values(reader, tags)['{urn:cmd}TradeNo'])
+        finally:
+            reader.close()
+    assert values == list(collect_tag_values(path, tags)['{urn:cmd}TradeNo'])
+
+def test_wrapped_articles_stay_one_range(tmp_path):
+    path = tmp_path / "wrapped.xml"
+    path.write_text(xml_document(200, wrapper='Articles'))
+    assert plan_shards(path, 4) == [(0, path.stat().st_size, b'', b'')]
+
+# =============================================================================
+# EXTRAKTION
+# =============================================================================
+
+def test_sharded_values_and_records_match_serial(tmp_path, shard_all):
+    files = [tmp_path / "a.xml", tmp_path / "b.xml"]
+    files[0].write_text(xml_document(300))
+    files[1].write_text(xml_document(50, start=300))
+
+    assert _parse_xml_values(files, workers=3) == _parse_xml_values(files, workers=1)
+    sharded = _parse_xml_records(files, workers=3)
+    serial = _parse_xml_records(files, workers=1)
+    assert len(sharded) == 350
+    assert sharded.astype(str).equals(serial.astype(str))
+
+def test_missing_file_reported_per_file(tmp_path, shard_all):
+    existing = tmp_path / "a.xml"
+    existing.write_text(xml_document(30))
+    missing = tmp_path / "fehlt.xml"
+
+    results = run_extract_tasks([existing, missing], TAGS, workers=2)
+    errors = {name: error for name, _, _, error in results}
+    assert errors[str(existing)] is None
+    assert errors[str(missing)]
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Tests für die Streaming-XML-Extraktion (src/utils/xml_stream.py)
+"""
+
+import pytest
+
+from src.utils import xml_stream
+from src.utils.xml_stream import (LXML_AVAILABLE, collect_article_records,
+                                  collect_tag_values, iter_tag_values)
+from conftest import xml_document
+
+PARSERS = ['etree'] + (['lxml'] if LXML_AVAILABLE else [])
+TAGS = ['SupplierPtNo', 'TradeNo', 'Brand', 'Price']
+
+# =============================================================================
+# SPEICHER
+# =============================================================================
+
+def _track_root(monkeypatch):
+    """_iterparse so umhüllen, dass das Root-Element sichtbar bleibt"""
+    roots = []
+    original = xml_stream._iterparse
+
+    def tracking(source, parser=None):
+        for event, elem in original(source, parser):
+            if not roots:
+                roots.append(elem)
+            yield event, elem
+
+    monkeypatch.setattr(xml_stream, '_iterparse', tracking)
+    return roots
+
+@pytest.mark.parametrize('parser', PARSERS)
+@pytest.mark.parametrize('wrapper', [None, 'Articles'])
+def test_finished_elements_are_released(tmp_path, monkeypatch, parser, wrapper):
+    path = tmp_path / "nested.xml"
+    path.write_text(xml_document(500, wrapper=wrapper))
+    roots = _track_root(monkeypatch)
+
+    for _ in iter_tag_values(path, TAGS, parser):
+        pass
+
+    # Je Ebene höchstens ein (leeres) Element, unabhängig von der Artikelzahl
+    assert sum(1 for _ in roots[0].iter()) <= 4
+
+@pytest.mark.parametrize('parser', PARSERS)
+def test_records_release_under_wrapper(tmp_path, monkeypatch, parser):
+    path = tmp_path / "nested.xml"
+    path.write_text(xml_document(500, wrapper='Articles'))
+    roots = _track_root(monkeypatch)
+
+    columns = collect_article_records(path, TAGS, 'Article', parser)
+
+    assert len(columns['article_id']) == 500
+    assert sum(1 for _ in roots[0].iter()) <= 4
+
+# =============================================================================
+# WERTE UND ARTIKEL
+# =============================================================================
+
+@pytest.mark.parametrize('parser', PARSERS)
+def test_values_match_flat_and_wrapped(tmp_path, parser):
+    flat, wrapped = tmp_path / "flat.xml", tmp_path / "wrapped.xml"
+    flat.write_text(xml_document(100))
+    wrapped.write_text(xml_document(100, wrapper='Articles'))
+
+    values = collect_tag_values(flat, TAGS, parser)
+    assert values == collect_tag_values(wrapped, TAGS, parser)
+    assert list(values['Brand']) == ['Kopf', 'B0', 'B1', 'B2', 'B3', 'B4']
+    assert list(values['Price']) == ['0.5', '9', '1.5', '2.5']
+    assert len(values['TradeNo']) == 100
+
+@pytest.mark.parametrize('parser', PARSERS)
+def test_article_level_below_wrapper(tmp_path, parser):
+    path = tmp_path / "wrapped.xml"
+    path.write_text(xml_document(20, wrapper='Articles'))
+
+    assert xml_stream._article_level(path, parser) == ('Article', 3)
+    columns = collect_article_records(path, TAGS, 'Article', parser)
+    assert columns['article_id'][:2] == ['A0', 'A1']
+    assert columns['Brand'][:2] == ['B0', 'B1']
+    # Erster Wert je Tag und Artikel
+    assert columns['Price'][:2] == ['0.5', '1.5']